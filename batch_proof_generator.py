@@ -5,22 +5,92 @@ Batch generate proofs for multiple date ranges
 Useful for showing growth over time or comparing different periods
 """
 
-import sys
 import os
-from datetime import datetime, timedelta
-
-def run_command(cmd):
-    """Execute a shell command"""
-    import subprocess
-    result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-    return result.returncode == 0
-
-def generate_weekly_proofs(package_name, num_weeks=4):
-    """Generate proofs for the last N weeks"""
-    print(f"Generating proofs for last {num_weeks} weeks...\n")
-
-    end_date = datetime.now().date()
+import sys
+import time
+from datetime import date, datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from instrumentation import profile_from_argv, span
+from npm_api import (fetch_batch_series, get_scheduler, parse_package_names, parse_period, prefetch_packages,
+                     valid_periods)
+from generate_proof import save_pdf_proof, save_proof
+
+MAX_WORKERS = 16
+
+def generate_range_proof(package_name, start_date, end_date, index, pdf_pool=None):
+    """Total one period from the batch series and write its proof; raises on failure
+
+    With a pdf_pool the proof is rendered as a PDF, with a daily chart, in
+    one of the pool's worker processes.
+    """
+    with span('range_proof', package=package_name, start=start_date, end=end_date):
+        return _generate_range_proof(package_name, start_date, end_date, index, pdf_pool)
+
+def _generate_range_proof(package_name, start_date, end_date, index, pdf_pool):
+    start, end = parse_period(start_date, end_date)
+
+    data = {
+        'downloads': index.total(start.toordinal(), end.toordinal()),
+        'start': start_date,
+        'end': end_date,
+        'package': package_name
+    }
+    if pdf_pool is None:
+        return save_proof(package_name, start_date, end_date, data)
+
+    daily_data = [
+        {'downloads': downloads, 'day': date.fromordinal(ordinal).isoformat()}
+        for ordinal, downloads in index.series(start.toordinal(), end.toordinal())
+    ]
+    # Worker processes are not profiled; this span is the wait for one
+    with span('pdf_worker', days=len(daily_data)):
+        return pdf_pool.submit(save_pdf_proof, package_name, start_date, end_date, data, daily_data).result()
+
+def run_batch(package_name, ranges, max_workers=MAX_WORKERS, pdf_pool=None):
+    """Generate proofs for (label, start, end) ranges from a single range fetch
+
+    The daily series for the union of all ranges is fetched once and every
+    period is totalled locally, so a batch costs one API call. Proofs are
+    rendered on a bounded thread pool and reported per range, in order;
+    PDFs are handed on to pdf_pool so they render on every CPU core.
+    """
     proofs_generated = []
+    failures = []
+
+    with span('batch_series', package=package_name, ranges=len(ranges)):
+        index, error = fetch_batch_series(package_name, ranges)
+    if error:
+        for label, start_date, end_date in ranges:
+            failures.append((label, start_date, end_date, error))
+            print(f"{label}: {start_date} to {end_date}")
+            print(f"  ✗ Failed to generate proof: {error}")
+            print()
+        return proofs_generated, failures
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(generate_range_proof, package_name, start_date, end_date, index, pdf_pool)
+            for _, start_date, end_date in ranges
+        ]
+
+        for (label, start_date, end_date), future in zip(ranges, futures):
+            print(f"{label}: {start_date} to {end_date}")
+            try:
+                proof_file = future.result()
+                proofs_generated.append(proof_file)
+                print(f"  ✓ Generated {proof_file}")
+            except Exception as e:
+                failures.append((label, start_date, end_date, str(e)))
+                print(f"  ✗ Failed to generate proof: {str(e)}")
+            print()
+
+    return proofs_generated, failures
+
+def weekly_ranges(num_weeks=4):
+    """(label, start, end) for the last N weeks, newest first"""
+    end_date = datetime.now().date()
+    ranges = []
 
     for i in range(num_weeks):
         week_end = end_date - timedelta(days=i*7)
@@ -28,28 +98,14 @@ def generate_weekly_proofs(package_name, num_weeks=4):
 
         start_str = week_start.strftime('%Y-%m-%d')
         end_str = week_end.strftime('%Y-%m-%d')
+        ranges.append((f"Week {i+1}", start_str, end_str))
 
-        print(f"Week {i+1}: {start_str} to {end_str}")
-
-        # Generate HTML proof
-        cmd = f"python3 generate_proof.py {package_name} {start_str} {end_str}"
-        if run_command(cmd):
-            html_file = f"npm_downloads_proof_{package_name}_{start_str}_to_{end_str}.html"
-            proofs_generated.append(html_file)
-            print(f"  ✓ Generated {html_file}")
-        else:
-            print(f"  ✗ Failed to generate proof")
-
-        print()
-
-    return proofs_generated
-
-def generate_monthly_proofs(package_name, num_months=3):
-    """Generate proofs for the last N months"""
-    print(f"Generating proofs for last {num_months} months...\n")
+    return ranges
 
+def monthly_ranges(num_months=3):
+    """(label, start, end) for the last N calendar months, newest first"""
     today = datetime.now().date()
-    proofs_generated = []
+    ranges = []
 
     for i in range(num_months):
         # Calculate month boundaries
@@ -59,12 +115,8 @@ def generate_monthly_proofs(package_name, num_months=3):
             month_end = today
         else:
             # Previous months
-            year = today.year
-            month = today.month - i
-
-            if month <= 0:
-                month += 12
-                year -= 1
+            year, month = divmod(today.year * 12 + today.month - 1 - i, 12)
+            month += 1
 
             month_start = datetime(year, month, 1).date()
 
@@ -78,51 +130,49 @@ def generate_monthly_proofs(package_name, num_months=3):
 
         start_str = month_start.strftime('%Y-%m-%d')
         end_str = month_end.strftime('%Y-%m-%d')
+        ranges.append((f"Month {i+1}", start_str, end_str))
 
-        print(f"Month {i+1}: {start_str} to {end_str}")
+    return ranges
 
-        # Generate HTML proof
-        cmd = f"python3 generate_proof.py {package_name} {start_str} {end_str}"
-        if run_command(cmd):
-            html_file = f"npm_downloads_proof_{package_name}_{start_str}_to_{end_str}.html"
-            proofs_generated.append(html_file)
-            print(f"  ✓ Generated {html_file}")
-        else:
-            print(f"  ✗ Failed to generate proof")
+def generate_weekly_proofs(package_name, num_weeks=4, pdf_pool=None):
+    """Generate proofs for the last N weeks"""
+    print(f"Generating proofs for last {num_weeks} weeks...\n")
 
-        print()
+    return run_batch(package_name, weekly_ranges(num_weeks), pdf_pool=pdf_pool)
 
-    return proofs_generated
+def generate_monthly_proofs(package_name, num_months=3, pdf_pool=None):
+    """Generate proofs for the last N months"""
+    print(f"Generating proofs for last {num_months} months...\n")
 
-def generate_custom_range_proofs(package_name, ranges):
+    return run_batch(package_name, monthly_ranges(num_months), pdf_pool=pdf_pool)
+
+def generate_custom_range_proofs(package_name, ranges, pdf_pool=None):
     """Generate proofs for custom date ranges"""
     print(f"Generating proofs for {len(ranges)} custom ranges...\n")
 
-    proofs_generated = []
-
-    for i, (start_date, end_date, label) in enumerate(ranges, 1):
-        print(f"{label}: {start_date} to {end_date}")
+    return run_batch(package_name, [(label, start, end) for start, end, label in ranges], pdf_pool=pdf_pool)
 
-        # Generate HTML proof
-        cmd = f"python3 generate_proof.py {package_name} {start_date} {end_date}"
-        if run_command(cmd):
-            html_file = f"npm_downloads_proof_{package_name}_{start_date}_to_{end_date}.html"
-            proofs_generated.append(html_file)
-            print(f"  ✓ Generated {html_file}")
-        else:
-            print(f"  ✗ Failed to generate proof")
-
-        print()
-
-    return proofs_generated
+def prefetch_batch(package_names, ranges):
+    """Fill the daily store for every package over the union of the valid ranges"""
+    valid = valid_periods(ranges)
+    if valid:
+        prefetch_packages(package_names,
+                          min(start for start, _ in valid).isoformat(),
+                          max(end for _, end in valid).isoformat())
 
 def main():
-    if len(sys.argv) < 3:
+    profile_from_argv()
+    args = sys.argv[1:]
+    pdf = '--pdf' in args
+    if pdf:
+        args.remove('--pdf')
+
+    if len(args) < 2:
         print("Batch Proof Generator - Generate multiple proofs at once")
         print("\nUsage:")
-        print("  python batch_proof_generator.py <package-name> weekly [num-weeks]")
-        print("  python batch_proof_generator.py <package-name> monthly [num-months]")
-        print("  python batch_proof_generator.py <package-name> custom <start1> <end1> <start2> <end2> ...")
+        print("  python batch_proof_generator.py <package-name>[,<package-name>...] weekly [num-weeks] [--pdf] [--profile]")
+        print("  python batch_proof_generator.py <package-name>[,<package-name>...] monthly [num-months] [--pdf] [--profile]")
+        print("  python batch_proof_generator.py <package-name>[,<package-name>...] custom <start1> <end1> <start2> <end2> ... [--pdf] [--profile]")
         print("\nExamples:")
         print("  # Generate proofs for last 4 weeks")
         print("  python batch_proof_generator.py mcp-server-kubernetes weekly 4")
@@ -130,38 +180,62 @@ def main():
         print("  python batch_proof_generator.py mcp-server-kubernetes monthly 3")
         print("\n  # Generate proofs for custom ranges")
         print("  python batch_proof_generator.py mcp-server-kubernetes custom 2025-11-01 2025-11-30 2025-12-01 2025-12-31")
+        print("\n  # Several comma-separated packages are fetched with bulk requests")
+        print("  python batch_proof_generator.py mcp-server-kubernetes,express weekly 4")
+        print("\n  # Write PDFs directly, rendered on every CPU core")
+        print("  python batch_proof_generator.py mcp-server-kubernetes monthly 24 --pdf")
+        print("\n  # Time every stage, write a Chrome trace and print p50/p99 per stage")
+        print("  python batch_proof_generator.py mcp-server-kubernetes monthly 24 --profile")
         sys.exit(1)
 
-    package_name = sys.argv[1]
-    mode = sys.argv[2].lower()
+    package_names = parse_package_names(args[0])
+    mode = args[1].lower()
 
     proofs = []
+    failures = []
+    pdf_workers = os.cpu_count() or 1
+    pdf_pool = ProcessPoolExecutor(max_workers=pdf_workers) if pdf else None
+    started = time.perf_counter()
+
+    def run_for_packages(ranges, generate):
+        prefetch_batch(package_names, ranges)
+        for package_name in package_names:
+            package_proofs, package_failures = generate(package_name)
+            proofs.extend(package_proofs)
+            failures.extend(package_failures)
 
     if mode == 'weekly':
-        num_weeks = int(sys.argv[3]) if len(sys.argv) > 3 else 4
-        proofs = generate_weekly_proofs(package_name, num_weeks)
+        num_weeks = int(args[2]) if len(args) > 2 else 4
+        run_for_packages(weekly_ranges(num_weeks),
+                         lambda package_name: generate_weekly_proofs(package_name, num_weeks, pdf_pool))
 
     elif mode == 'monthly':
-        num_months = int(sys.argv[3]) if len(sys.argv) > 3 else 3
-        proofs = generate_monthly_proofs(package_name, num_months)
+        num_months = int(args[2]) if len(args) > 2 else 3
+        run_for_packages(monthly_ranges(num_months),
+                         lambda package_name: generate_monthly_proofs(package_name, num_months, pdf_pool))
 
     elif mode == 'custom':
-        if len(sys.argv) < 5 or (len(sys.argv) - 3) % 2 != 0:
+        if len(args) < 4 or (len(args) - 2) % 2 != 0:
             print("Error: Custom mode requires pairs of start and end dates")
             sys.exit(1)
 
         ranges = []
-        for i in range(3, len(sys.argv), 2):
-            start = sys.argv[i]
-            end = sys.argv[i + 1]
+        for i in range(2, len(args), 2):
+            start = args[i]
+            end = args[i + 1]
             ranges.append((start, end, f"Range {len(ranges) + 1}"))
 
-        proofs = generate_custom_range_proofs(package_name, ranges)
+        run_for_packages([(label, start, end) for start, end, label in ranges],
+                         lambda package_name: generate_custom_range_proofs(package_name, ranges, pdf_pool))
 
     else:
         print(f"Error: Unknown mode '{mode}'. Use 'weekly', 'monthly', or 'custom'")
         sys.exit(1)
 
+    elapsed = time.perf_counter() - started
+    if pdf_pool:
+        pdf_pool.shutdown()
+
     print("=" * 70)
     print(f"✓ Successfully generated {len(proofs)} proof documents")
     print("=" * 70)
@@ -169,10 +243,27 @@ def main():
     for proof in proofs:
         print(f"  - {proof}")
 
+    if pdf and proofs:
+        print(f"\n✓ {len(proofs)} PDF pages in {elapsed:.2f}s "
+              f"({len(proofs) / elapsed:.1f} pages/s, {pdf_workers} worker processes)")
+
+    if failures:
+        print(f"\n✗ Failed to generate {len(failures)} proofs:")
+        for label, start, end, error in failures:
+            print(f"  - {label} ({start} to {end}): {error}")
+
+    stats = get_scheduler().stats()
+    if stats['throttled'] or stats['retries']:
+        print(f"\n⚠ Rate limiting: {stats['throttled']} throttled responses, "
+              f"{stats['retries']} retries, {stats['failures']} gave up")
+
     print("\nNext steps:")
-    print("  1. Open each HTML file in your browser")
-    print("  2. Save as PDF (File > Print > Save as PDF)")
-    print("  3. Submit the PDFs as proof")
+    if pdf:
+        print("  1. Submit the PDFs as proof")
+    else:
+        print("  1. Open each HTML file in your browser")
+        print("  2. Save as PDF (File > Print > Save as PDF)")
+        print("  3. Submit the PDFs as proof")
 
 if __name__ == "__main__":
     main()
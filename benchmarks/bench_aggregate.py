@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark calculate_weekly_data / calculate_monthly_data on long synthetic series
+Compares the array-backed aggregators with the original per-entry loops and
+checks that both produce identical output
+"""
+
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_server import daily_series
+from daily_series import DailySeries
+from generate_stylish_proof import calculate_monthly_data, calculate_weekly_data
+
+def reference_weekly_data(daily_data):
+    """The original list-of-dicts weekly aggregation, kept as the reference"""
+    weekly = []
+    current_week = []
+    current_week_downloads = 0
+
+    def close_week():
+        start_date = datetime.strptime(current_week[0]['day'], '%Y-%m-%d')
+        end_date = datetime.strptime(current_week[-1]['day'], '%Y-%m-%d')
+        weekly.append({
+            'start': current_week[0]['day'],
+            'end': current_week[-1]['day'],
+            'downloads': current_week_downloads,
+            'label': f"{start_date.strftime('%b %d')} - {end_date.strftime('%b %d')}"
+        })
+
+    for entry in daily_data:
+        current_week.append(entry)
+        current_week_downloads += entry['downloads']
+        if len(current_week) == 7:
+            close_week()
+            current_week = []
+            current_week_downloads = 0
+
+    if current_week:
+        close_week()
+
+    return weekly
+
+def reference_monthly_data(daily_data):
+    """The original list-of-dicts monthly aggregation, kept as the reference"""
+    monthly = {}
+    for entry in daily_data:
+        month_key = entry['day'][:7]
+        if month_key not in monthly:
+            monthly[month_key] = {
+                'month': month_key,
+                'downloads': 0,
+                'label': datetime.strptime(month_key, '%Y-%m').strftime('%b %Y')
+            }
+        monthly[month_key]['downloads'] += entry['downloads']
+    return list(monthly.values())
+
+def timed(fn, arg, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(arg)
+    return (time.perf_counter() - started) / repeat, result
+
+def main():
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    days = daily_series('fixture-package', f"{2026 - years}-01-01", '2025-12-31')
+    series = DailySeries.from_days(days)
+
+    print("=" * 70)
+    print(f"Aggregation over {years} years ({len(days):,} days), mean of {repeat} runs")
+    print("=" * 70)
+    print(f"{'Stage':<28} {'reference':>12} {'array':>12} {'from series':>12} {'speedup':>8}")
+    print("-" * 70)
+
+    for label, reference, current in [
+        ("calculate_weekly_data", reference_weekly_data, calculate_weekly_data),
+        ("calculate_monthly_data", reference_monthly_data, calculate_monthly_data),
+    ]:
+        before, expected = timed(reference, days, repeat)
+        after, result = timed(current, days, repeat)
+        prebuilt, prebuilt_result = timed(current, series, repeat)
+        assert result == expected and prebuilt_result == expected, f"{label} output differs"
+        print(f"{label:<28} {before * 1e3:>10.2f}ms {after * 1e3:>10.2f}ms "
+              f"{prebuilt * 1e3:>10.2f}ms {before / after:>7.1f}x")
+
+    print("-" * 70)
+    print("Outputs identical to the reference implementation")
+
+if __name__ == "__main__":
+    main()
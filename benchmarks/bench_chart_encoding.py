@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark the embedded chart data of a stylish proof
+Compares JSON lists of {'day', 'downloads'} dicts with the compact encoding
+(start date plus delta-encoded offsets and counts) for size and Python time
+"""
+
+import os
+import sys
+import json
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_server import daily_series
+from generate_stylish_proof import (as_series, calculate_monthly_data, calculate_weekly_data, chart_json,
+                                    encode_daily_chart, encode_monthly_chart, encode_weekly_chart)
+
+def dict_lists(days):
+    """The previous embedding: every series as a JSON list of dicts"""
+    return (json.dumps(days) + json.dumps(calculate_weekly_data(days)) +
+            json.dumps(calculate_monthly_data(days)))
+
+def compact(days):
+    series = as_series(days)
+    return (chart_json(encode_daily_chart(series, 0)) +
+            chart_json(encode_weekly_chart(series.weekly_totals(), 0)) +
+            chart_json(encode_monthly_chart(series.monthly_totals(), 0)))
+
+def timed(fn, days, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        out = fn(days)
+    return (time.perf_counter() - started) / repeat, out
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    print("=" * 78)
+    print(f"Embedded chart data, every point plotted (mean of {repeat} encodes)")
+    print("=" * 78)
+    print(f"{'Window':<8} {'days':>6} {'dict lists':>12} {'compact':>10} {'size':>7} "
+          f"{'dict lists':>12} {'compact':>10} {'time':>7}")
+    print("-" * 78)
+
+    for years in (1, 2, 3, 5, 10):
+        days = daily_series('fixture-package', f"{2026 - years}-01-01", '2025-12-31')
+        before_time, before = timed(dict_lists, days, repeat)
+        after_time, after = timed(compact, days, repeat)
+        print(f"{years}y{'':<6} {len(days):>6} {len(before):>11,}B {len(after):>9,}B "
+              f"{len(before) / len(after):>6.1f}x {before_time * 1e3:>10.2f}ms {after_time * 1e3:>8.2f}ms "
+              f"{before_time / after_time:>6.1f}x")
+
+    print("-" * 78)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark the shared keep-alive client against one urlopen per request
+Runs against the local stub server so the numbers only reflect connection handling
+"""
+
+import os
+import sys
+import json
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import npm_api
+from rate_limit import RequestScheduler
+from stub_server import StubServer
+
+def bench(label, fetch, urls):
+    start = time.perf_counter()
+    for url in urls:
+        fetch(url)
+    elapsed = time.perf_counter() - start
+    rate = len(urls) / elapsed
+    print(f"{label:<28} {len(urls):>6} requests {elapsed:>8.3f}s {rate:>10,.0f} req/s")
+    return rate
+
+def fetch_urlopen(url):
+    with urllib.request.urlopen(url) as response:
+        return json.loads(response.read().decode())
+
+def main():
+    num_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    server = StubServer().start()
+    urls = [
+        f"{server.url}/downloads/point/2025-11-{(i % 28) + 1:02d}:2025-12-03/package-{i % 50}"
+        for i in range(num_requests)
+    ]
+
+    print("=" * 70)
+    print(f"HTTP client benchmark against {server.url}")
+    print("=" * 70)
+
+    before = bench("urlopen (new connection)", fetch_urlopen, urls)
+    # No token bucket here: the benchmark measures connection handling only
+    client = npm_api.HttpClient(scheduler=RequestScheduler(rate=None))
+    after = bench("npm_api (keep-alive pool)", client.get_json, urls)
+    client.close()
+
+    print("-" * 70)
+    print(f"Speedup: {after / before:.2f}x")
+
+    server.stop()
+
+if __name__ == "__main__":
+    main()
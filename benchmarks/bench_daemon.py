@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark per-invocation latency of the CLI scripts with and without proof_daemon.py
+Each invocation is a fresh `python3 <script>` process, as cron or CI would
+run it. Without a daemon the script imports everything and fetches over a new
+connection. With the daemon running, the script forwards the job over the
+Unix socket and exits.
+"""
+
+import os
+import sys
+import time
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from stub_server import StubServer
+
+START_DATE = '2025-01-01'
+END_DATE = '2025-06-30'
+SCRIPTS = ('fetch_npm_downloads.py', 'generate_json_proof.py', 'generate_proof.py')
+
+def percentile(latencies, fraction):
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def run_invocations(script, env, workdir, runs, same_package):
+    """Wall time of `runs` separate invocations of a script"""
+    latencies = []
+    for i in range(runs):
+        package_name = 'daemon-package' if same_package else f"{script.split('.')[0]}-package-{i}"
+        started = time.perf_counter()
+        subprocess.run([sys.executable, os.path.join(ROOT, script), package_name, START_DATE, END_DATE],
+                       cwd=workdir, env=env, stdout=subprocess.DEVNULL, check=True)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+def wait_for_socket(path, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(path):
+        if time.monotonic() > deadline:
+            raise RuntimeError("proof daemon did not start")
+        time.sleep(0.05)
+
+def bench_mode(label, stub, runs, daemon):
+    """Run every script both against fresh packages and against one already stored"""
+    with tempfile.TemporaryDirectory() as workdir:
+        cache_dir = os.path.join(workdir, 'cache')
+        env = dict(os.environ, NPM_API_BASE=stub.url, GITHUB_API_BASE=stub.url, NPM_PROOF_CACHE_DIR=cache_dir,
+                   NPM_PROOF_DAEMON='1' if daemon else '0')
+        env.pop('NPM_PROOF_DAEMON_SOCKET', None)
+        process = None
+        if daemon:
+            process = subprocess.Popen([sys.executable, os.path.join(ROOT, 'proof_daemon.py'), '--quiet'],
+                                       env=env, stdout=subprocess.DEVNULL)
+            wait_for_socket(os.path.join(cache_dir, 'daemon.sock'))
+        try:
+            for script in SCRIPTS:
+                for same_package in (False, True):
+                    before = stub.requests
+                    latencies = run_invocations(script, env, workdir, runs, same_package)
+                    kind = 'stored' if same_package else 'new'
+                    print(f"{label:<10} {script:<26} {kind:<7} p50 {percentile(latencies, 0.5) * 1000:>8.1f} ms  "
+                          f"p99 {percentile(latencies, 0.99) * 1000:>8.1f} ms  {stub.requests - before:>4} upstream")
+        finally:
+            if process:
+                subprocess.run([sys.executable, os.path.join(ROOT, 'proof_daemon.py'), 'stop'], env=env,
+                               stdout=subprocess.DEVNULL)
+                process.wait(timeout=10)
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.02
+
+    stub = StubServer(latency=latency).start()
+
+    print("=" * 100)
+    print(f"CLI invocation latency: {runs} runs per script, {latency * 1000:.0f} ms stub latency")
+    print("=" * 100)
+    bench_mode('in-process', stub, runs, daemon=False)
+    print("-" * 100)
+    bench_mode('daemon', stub, runs, daemon=True)
+
+    stub.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+
+"""
+Measure the effect of chart downsampling on stylish proof size and render time
+Renders the same multi-year series with every daily point and with the
+default --max-points cap, and checks that the peak day and totals survive
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_server import daily_series
+from downsample import MAX_CHART_POINTS, downsample
+from generate_stylish_proof import (as_series, calculate_weekly_growth, decode_points, encode_daily_chart,
+                                    generate_html_report)
+
+def render(days, start_date, end_date, max_points, repeat):
+    range_data = {'start': start_date, 'end': end_date, 'package': 'fixture-package', 'downloads': days}
+    data = {'downloads': sum(d['downloads'] for d in days), 'start': start_date, 'end': end_date,
+            'package': 'fixture-package'}
+    weekly_growth = calculate_weekly_growth(days)
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        html = generate_html_report('fixture-package', start_date, end_date, data, range_data, 1234,
+                                    weekly_growth, max_points)
+    return (time.perf_counter() - started) / repeat, html
+
+def main():
+    max_points = int(sys.argv[1]) if len(sys.argv) > 1 else MAX_CHART_POINTS
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    print("=" * 78)
+    print(f"Chart downsampling: every point vs --max-points {max_points} (mean of {repeat} renders)")
+    print("=" * 78)
+    print(f"{'Window':<8} {'days':>6} {'points':>12} {'HTML bytes':>22} {'render':>20}")
+    print("-" * 78)
+
+    for years in (1, 2, 3, 5):
+        start_date, end_date = f"{2026 - years}-01-01", '2025-12-31'
+        days = daily_series('fixture-package', start_date, end_date)
+
+        full_time, full_html = render(days, start_date, end_date, 0, repeat)
+        capped_time, capped_html = render(days, start_date, end_date, max_points, repeat)
+
+        kept = downsample(days, max_points)
+        peak = max(days, key=lambda d: d['downloads'])
+        assert peak in kept, "peak day was dropped"
+        assert f"{sum(d['downloads'] for d in days):,}" in capped_html, "total changed"
+        offsets, _ = decode_points(encode_daily_chart(as_series(days), max_points))
+        assert offsets[-1] == len(days) - 1, "last day was dropped"
+
+        print(f"{years}y{'':<6} {len(days):>6} {len(days):>5} -> {len(kept):>4} "
+              f"{len(full_html):>9,} -> {len(capped_html):>9,} "
+              f"{full_time * 1e3:>7.2f} -> {capped_time * 1e3:>6.2f}ms")
+
+    print("-" * 78)
+    print("Totals, the peak day and the last day are identical in both renders.")
+    print("Browser paint time scales with the number of plotted points per view.")
+
+if __name__ == "__main__":
+    main()
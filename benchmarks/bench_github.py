@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark GitHub star fetches against an anonymous quota of 60 requests an hour
+Compares plain requests with the disk metadata cache and conditional
+(If-None-Match) revalidation, over two simulated hours of batch runs.
+"""
+
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from stub_server import StubServer
+
+def main():
+    num_repos = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    quota = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+
+    stub = StubServer(github_quota=quota).start()
+    workdir = tempfile.TemporaryDirectory()
+    os.environ['GITHUB_API_BASE'] = stub.url
+    os.environ['NPM_PROOF_CACHE_DIR'] = workdir.name
+    os.environ.pop('GITHUB_TOKEN', None)
+    os.environ.pop('GH_TOKEN', None)
+
+    import npm_api
+    from response_cache import get_metadata_cache
+
+    # No token bucket: only the stub's quota limits the run
+    npm_api.get_scheduler().rate = None
+    repos = [f"https://github.com/bench-owner/repo-{i}" for i in range(num_repos)]
+
+    def plain_stars(github_url):
+        try:
+            return npm_api.get_json(f"{stub.url}/repos/{github_url.split('/', 3)[3]}").get('stargazers_count')
+        except npm_api.ApiError:
+            return None
+
+    def run(label, fetch):
+        before_requests, before_304 = stub.requests, stub.not_modified
+        stars = [fetch(url) for url in repos]
+        found = sum(1 for s in stars if s is not None)
+        print(f"{label:<42} {found:>5}/{num_repos} stars  {stub.requests - before_requests:>5} requests  "
+              f"{stub.not_modified - before_304:>5} x 304")
+
+    print("=" * 90)
+    print(f"GitHub stars for {num_repos} repos, {quota} anonymous requests per hour")
+    print("=" * 90)
+
+    for hour in (1, 2):
+        stub.reset_github_quota()
+        run(f"hour {hour}: plain requests", plain_stars)
+
+    print("-" * 90)
+    cache = get_metadata_cache()
+    for hour in (1, 2):
+        stub.reset_github_quota()
+        run(f"hour {hour}: metadata cache + If-None-Match", npm_api.fetch_github_stars)
+        # Later runs in the same hour are answered from disk
+        run(f"hour {hour}: rerun within {cache.ttl // 60} minutes", npm_api.fetch_github_stars)
+        # Age every entry past the TTL, as an hour going by would
+        cache.ttl = -1
+        run(f"hour {hour}: rerun after the TTL", npm_api.fetch_github_stars)
+        cache.ttl = 600
+
+    stub.stop()
+    workdir.cleanup()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark PDF proof rendering throughput
+Writes monthly proofs with daily charts from a synthetic series, first in this
+process and then on a process pool with one worker per CPU core
+"""
+
+import os
+import sys
+import calendar
+import time
+import tempfile
+from datetime import date
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_server import daily_series
+from generate_proof import save_pdf_proof
+
+def monthly_jobs(num_proofs):
+    """(package, start, end, data, daily_data) for consecutive months of fixture data"""
+    jobs = []
+    for i in range(num_proofs):
+        year, month = divmod(2020 * 12 + i, 12)
+        month += 1
+        start_date = date(year, month, 1).isoformat()
+        end_date = date(year, month, calendar.monthrange(year, month)[1]).isoformat()
+        days = daily_series('fixture-package', start_date, end_date)
+        data = {'downloads': sum(d['downloads'] for d in days), 'start': start_date, 'end': end_date,
+                'package': 'fixture-package'}
+        jobs.append(('fixture-package', start_date, end_date, data, days))
+    return jobs
+
+def main():
+    num_proofs = int(sys.argv[1]) if len(sys.argv) > 1 else 240
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    jobs = monthly_jobs(num_proofs)
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+
+        started = time.perf_counter()
+        for job in jobs:
+            save_pdf_proof(*job)
+        serial = time.perf_counter() - started
+        size = os.path.getsize(os.listdir(directory)[0])
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Start the workers before timing, as a long batch amortizes that
+            list(pool.map(abs, range(workers)))
+            started = time.perf_counter()
+            list(pool.map(save_pdf_proof, *zip(*jobs), chunksize=max(1, num_proofs // (workers * 4))))
+            parallel = time.perf_counter() - started
+
+    print("=" * 70)
+    print(f"PDF proofs: {num_proofs} monthly pages with daily charts, ~{size:,} bytes each")
+    print("=" * 70)
+    print(f"{'in process':<24} {serial:>8.2f} s {num_proofs / serial:>10.1f} pages/s")
+    print(f"{f'{workers} worker processes':<24} {parallel:>8.2f} s {num_proofs / parallel:>10.1f} pages/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark generate_stylish_proof.generate_html_report on fixture data
+Renders many reports from a synthetic daily series and reports per-report latency
+"""
+
+import os
+import sys
+import time
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_server import daily_series
+from generate_stylish_proof import calculate_weekly_growth, generate_html_report
+
+def main():
+    num_reports = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    start_date = sys.argv[2] if len(sys.argv) > 2 else '2025-01-01'
+    end_date = sys.argv[3] if len(sys.argv) > 3 else '2025-12-31'
+
+    days = daily_series('fixture-package', start_date, end_date)
+    range_data = {'start': start_date, 'end': end_date, 'package': 'fixture-package', 'downloads': days}
+    data = {'downloads': sum(d['downloads'] for d in days), 'start': start_date, 'end': end_date,
+            'package': 'fixture-package'}
+    weekly_growth = calculate_weekly_growth(days)
+
+    latencies = []
+    size = 0
+    for _ in range(num_reports):
+        started = time.perf_counter()
+        html = generate_html_report('fixture-package', start_date, end_date, data, range_data, 1234, weekly_growth)
+        latencies.append(time.perf_counter() - started)
+        size = len(html)
+
+    latencies.sort()
+    print("=" * 70)
+    print(f"generate_html_report: {num_reports:,} reports, {len(days)} days each, {size:,} bytes")
+    print("=" * 70)
+    print(f"{'mean':<8} {statistics.mean(latencies) * 1e6:>10.1f} µs")
+    print(f"{'p50':<8} {latencies[len(latencies) // 2] * 1e6:>10.1f} µs")
+    print(f"{'p99':<8} {latencies[int(len(latencies) * 0.99)] * 1e6:>10.1f} µs")
+    print(f"{'total':<8} {sum(latencies):>10.2f} s")
+
+if __name__ == "__main__":
+    main()
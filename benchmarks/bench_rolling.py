@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark the rolling-window engine against per-day slicing
+Computes 7/28/90-day totals and week, month and year-over-year growth for
+every day of many synthetic packages, both ways, and checks they agree.
+"""
+
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_server import daily_series
+from daily_series import DailySeries
+from rolling_windows import COMPARISONS, WINDOWS, RollingWindows
+
+def sliced(daily_data):
+    """Every rolling column the way calculate_weekly_growth did it: slice and sum per day"""
+    n = len(daily_data)
+    totals = {}
+    for window in WINDOWS:
+        totals[window] = [
+            sum(d['downloads'] for d in daily_data[i - window + 1:i + 1]) if i >= window - 1 else None
+            for i in range(n)
+        ]
+    growth = {}
+    for name, (window, lag) in COMPARISONS.items():
+        column = totals[window]
+        growth[name] = [
+            ((column[i] - column[i - lag]) / column[i - lag]) * 100 if i >= lag and column[i - lag] else None
+            for i in range(n)
+        ]
+    return totals, growth
+
+def main():
+    num_packages = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    years = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    end = date(2025, 12, 31)
+    start = end - timedelta(days=365 * years - 1)
+    packages = [
+        daily_series(f"package-{i}", start.isoformat(), end.isoformat()) for i in range(num_packages)
+    ]
+    days = sum(len(p) for p in packages)
+
+    print("=" * 70)
+    print(f"Rolling windows: {num_packages} packages x {years} years ({days:,} package-days)")
+    print("=" * 70)
+
+    started = time.perf_counter()
+    expected = [sliced(daily_data) for daily_data in packages]
+    slicing = time.perf_counter() - started
+    print(f"{'per-day slicing':<28} {slicing:>8.3f}s {days / slicing:>14,.0f} days/s")
+
+    started = time.perf_counter()
+    engine = [RollingWindows(DailySeries.from_days(daily_data)) for daily_data in packages]
+    rolling = time.perf_counter() - started
+    print(f"{'prefix-sum engine':<28} {rolling:>8.3f}s {days / rolling:>14,.0f} days/s")
+
+    for (totals, growth), result in zip(expected, engine):
+        assert all(result.totals[window] == totals[window] for window in WINDOWS)
+        assert result.growth == growth
+
+    print("-" * 70)
+    print(f"Speedup: {slicing / rolling:.1f}x (identical results)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark loading and aggregating years of daily counts for many packages
+Compares JSON range responses, the SQLite daily store and memory-mapped series
+files on startup time, resident memory and a monthly aggregation per package.
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_server import daily_series
+from daily_series import DailySeries
+from daily_store import DailyStore
+from series_store import SeriesStore, series_path, write_series
+from generate_stylish_proof import calculate_monthly_data
+
+def measure(label, load, aggregate):
+    """Time load(), trace the memory a second load() holds, then time aggregate()"""
+    started = time.perf_counter()
+    loaded = load()
+    load_time = time.perf_counter() - started
+
+    del loaded
+    tracemalloc.start()
+    loaded = load()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    aggregate(loaded)
+    aggregate_time = time.perf_counter() - started
+
+    print(f"{label:<22} load {load_time * 1000:>9.1f} ms  memory {memory / 1024 / 1024:>8.1f} MB  "
+          f"monthly totals {aggregate_time * 1000:>8.1f} ms")
+    return load_time
+
+def main():
+    num_packages = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    years = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    end = date(2025, 12, 31)
+    start = end - timedelta(days=365 * years - 1)
+    start_date, end_date = start.isoformat(), end.isoformat()
+    packages = [f"package-{i}" for i in range(num_packages)]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        json_dir = os.path.join(workdir, 'json')
+        series_dir = os.path.join(workdir, 'series')
+        os.makedirs(json_dir)
+
+        def no_fetch(*args):
+            raise RuntimeError("benchmark store must not fetch")
+
+        store = DailyStore(no_fetch, path=os.path.join(workdir, 'daily.sqlite3'))
+        for name in packages:
+            days = daily_series(name, start_date, end_date)
+            with open(os.path.join(json_dir, f"{name}.json"), 'w') as f:
+                json.dump({'start': start_date, 'end': end_date, 'package': name, 'downloads': days}, f)
+            store.store_days(name, days)
+            write_series(series_path(name, series_dir), start, [d['downloads'] for d in days])
+        store.close()
+
+        print("=" * 90)
+        print(f"{num_packages} packages x {years} years ({(end - start).days + 1:,} days each)")
+        print("=" * 90)
+
+        def load_json():
+            loaded = {}
+            for name in packages:
+                with open(os.path.join(json_dir, f"{name}.json")) as f:
+                    loaded[name] = json.load(f)['downloads']
+            return loaded
+
+        def load_sqlite():
+            sqlite_store = DailyStore(no_fetch, path=os.path.join(workdir, 'daily.sqlite3'))
+            return {name: sqlite_store._index(name) for name in packages}
+
+        def load_series():
+            series_store = SeriesStore(series_dir)
+            return {name: series_store.open(name) for name in packages}
+
+        start_ord, end_ord = start.toordinal(), end.toordinal()
+        baseline = measure("JSON range responses", load_json,
+                           lambda loaded: [calculate_monthly_data(days) for days in loaded.values()])
+        measure("SQLite daily store", load_sqlite,
+                lambda loaded: [calculate_monthly_data(DailySeries(date.fromordinal(index.base), index.counts))
+                                for index in loaded.values()])
+        mapped = measure("mmap series files", load_series,
+                         lambda loaded: [calculate_monthly_data(f.view(start_ord, end_ord)) for f in loaded.values()])
+
+        print("-" * 90)
+        print(f"Startup speedup over JSON: {baseline / mapped:.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark proof_server.py against the local stub of the NPM and GitHub APIs
+Measures p50/p99 request latency for cold renders, LRU hits and bursts of
+identical requests, next to the cost of one generate_stylish_proof.py process
+per proof.
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+import subprocess
+import http.client
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from stub_server import StubServer
+
+START_DATE = '2025-01-01'
+END_DATE = '2025-12-31'
+
+def percentile(latencies, fraction):
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def report(label, latencies, elapsed, upstream):
+    print(f"{label:<26} {len(latencies):>5} req  p50 {percentile(latencies, 0.5) * 1000:>8.2f} ms  "
+          f"p99 {percentile(latencies, 0.99) * 1000:>8.2f} ms  {len(latencies) / elapsed:>8,.0f} req/s  "
+          f"{upstream:>5} upstream")
+
+def run_clients(base_url, paths, concurrency):
+    """GET every path from `concurrency` keep-alive clients; returns (latencies, elapsed)"""
+    host = urlsplit(base_url).netloc
+    latencies = []
+    lock = threading.Lock()
+    queue = list(reversed(paths))
+
+    def client():
+        conn = http.client.HTTPConnection(host)
+        while True:
+            with lock:
+                if not queue:
+                    break
+                path = queue.pop()
+            started = time.perf_counter()
+            conn.request('GET', path)
+            response = conn.getresponse()
+            response.read()
+            elapsed = time.perf_counter() - started
+            if response.status != 200:
+                raise RuntimeError(f"{path}: HTTP {response.status}")
+            with lock:
+                latencies.append(elapsed)
+        conn.close()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, time.perf_counter() - started
+
+def bench_processes(stub_url, runs):
+    """Latency of one generate_stylish_proof.py process per proof"""
+    env = dict(os.environ, NPM_API_BASE=stub_url, GITHUB_API_BASE=stub_url, NPM_PROOF_CACHE='0')
+    script = os.path.join(ROOT, 'generate_stylish_proof.py')
+    latencies = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for i in range(runs):
+            started = time.perf_counter()
+            subprocess.run([sys.executable, script, f"process-package-{i}", START_DATE, END_DATE],
+                           cwd=workdir, env=env, stdout=subprocess.DEVNULL, check=True)
+            latencies.append(time.perf_counter() - started)
+    return latencies, sum(latencies)
+
+def main():
+    num_packages = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    latency = float(sys.argv[3]) if len(sys.argv) > 3 else 0.02
+
+    stub = StubServer(latency=latency).start()
+    # Point the API client at the stub and keep every fetch in memory
+    os.environ['NPM_API_BASE'] = stub.url
+    os.environ['GITHUB_API_BASE'] = stub.url
+    os.environ['NPM_PROOF_CACHE'] = '0'
+
+    from npm_api import get_scheduler
+    from proof_server import ProofServer
+
+    # No token bucket: the benchmark measures the server, not npm's rate limit
+    get_scheduler().rate = None
+
+    server = ProofServer(port=0, quiet=True).start()
+    paths = [f"/proof/package-{i}/{START_DATE}/{END_DATE}" for i in range(num_packages)]
+
+    print("=" * 100)
+    print(f"Proof server benchmark: {num_packages} packages, {concurrency} clients, "
+          f"{latency * 1000:.0f} ms stub latency, {START_DATE} to {END_DATE}")
+    print("=" * 100)
+
+    before = stub.requests
+    latencies, elapsed = run_clients(server.url, paths, concurrency)
+    report("cold (render + fetch)", latencies, elapsed, stub.requests - before)
+
+    before = stub.requests
+    latencies, elapsed = run_clients(server.url, paths * 5, concurrency)
+    report("warm (LRU hits)", latencies, elapsed, stub.requests - before)
+
+    before = stub.requests
+    latencies, elapsed = run_clients(server.url, [p + '?format=json' for p in paths], concurrency)
+    report("json (store hits)", latencies, elapsed, stub.requests - before)
+
+    burst_paths = []
+    for i in range(20):
+        burst_paths.extend([f"/proof/burst-package-{i}/{START_DATE}/{END_DATE}"] * concurrency)
+    before = stub.requests
+    latencies, elapsed = run_clients(server.url, burst_paths, concurrency)
+    report(f"burst ({concurrency} identical)", latencies, elapsed, stub.requests - before)
+
+    runs = 5
+    before = stub.requests
+    latencies, elapsed = bench_processes(stub.url, runs)
+    report("process per proof", latencies, elapsed, stub.requests - before)
+
+    stats = server.service.stats()
+    print("-" * 100)
+    print(f"LRU: {stats['pages']} pages, {stats['bytes'] / 1024 / 1024:.1f} MB, {stats['hits']} hits, "
+          f"{stats['misses']} misses; {stats['shared_flights']} requests joined an in-flight render")
+
+    server.stop()
+    stub.stop()
+
+if __name__ == "__main__":
+    main()
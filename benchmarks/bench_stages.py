@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+
+"""
+Stage-level benchmark of the stylish proof pipeline
+Serves synthetic multi-year series from the local stub and times each stage
+of building a proof separately, per package:
+  fetch    /downloads/range over HTTP, 540-day chunks, retries included
+  decode   json.loads of the response bodies
+  weekly   calculate_weekly_data
+  monthly  calculate_monthly_data
+  render   generate_html_report
+  hash     generate_verification_hash
+  write    writing the report file
+Results go to a JSON file so runs can be compared with --compare.
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import tempfile
+import subprocess
+from datetime import date, datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import npm_api
+from rate_limit import RequestScheduler
+from generate_stylish_proof import (calculate_monthly_data, calculate_weekly_data, calculate_weekly_growth,
+                                    generate_html_report, generate_verification_hash)
+from stub_server import StubServer
+from fixtures import FixtureCache, package_names
+
+STAGES = ('fetch', 'decode', 'weekly', 'monthly', 'render', 'hash', 'write')
+END_DATE = '2025-12-31'
+
+def summarize(durations):
+    """Summary statistics of one stage, in milliseconds"""
+    ordered = sorted(durations)
+    n = len(ordered)
+    if not n:
+        return {'count': 0}
+    return {
+        'count': n,
+        'total_s': round(sum(ordered), 6),
+        'mean_ms': round(sum(ordered) / n * 1000, 4),
+        'p50_ms': round(ordered[n // 2] * 1000, 4),
+        'p99_ms': round(ordered[min(n - 1, int(n * 0.99))] * 1000, 4),
+        'min_ms': round(ordered[0] * 1000, 4),
+        'max_ms': round(ordered[-1] * 1000, 4)
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_package(client, package_name, start_date, end_date, workdir, timings):
+    """Build one proof stage by stage, appending each stage's duration to timings"""
+    started = time.perf_counter()
+    bodies = []
+    for chunk_start, chunk_end in npm_api.split_period(start_date, end_date):
+        status, reason, _, body = client.get(npm_api.range_url(package_name, chunk_start, chunk_end))
+        if status >= 400:
+            raise npm_api.ApiError(status, reason)
+        bodies.append(body)
+    timings['fetch'].append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    daily_data = []
+    for body in bodies:
+        daily_data.extend(json.loads(body)['downloads'])
+    timings['decode'].append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    calculate_weekly_data(daily_data)
+    timings['weekly'].append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    calculate_monthly_data(daily_data)
+    timings['monthly'].append(time.perf_counter() - started)
+
+    downloads = sum(d['downloads'] for d in daily_data)
+    data = {'downloads': downloads, 'start': start_date, 'end': end_date, 'package': package_name}
+    range_data = dict(data, downloads=daily_data)
+    started = time.perf_counter()
+    html = generate_html_report(package_name, start_date, end_date, data, range_data, 1234,
+                                calculate_weekly_growth(daily_data))
+    timings['render'].append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    generate_verification_hash(package_name, start_date, end_date, downloads,
+                               datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC'))
+    timings['hash'].append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with open(os.path.join(workdir, f"stylish_proof_{package_name}.html"), 'w', encoding='utf-8') as f:
+        f.write(html)
+    timings['write'].append(time.perf_counter() - started)
+
+def print_results(results):
+    print(f"{'stage':<10} {'count':>6} {'mean ms':>10} {'p50 ms':>10} {'p99 ms':>10} {'total s':>10}")
+    print("-" * 70)
+    for stage in STAGES:
+        s = results['stages'][stage]
+        if s['count']:
+            print(f"{stage:<10} {s['count']:>6} {s['mean_ms']:>10.3f} {s['p50_ms']:>10.3f} "
+                  f"{s['p99_ms']:>10.3f} {s['total_s']:>10.3f}")
+
+def print_comparison(baseline, results):
+    print(f"{'stage':<10} {'base p50':>10} {'p50':>10} {'change':>9}   {'base p99':>10} {'p99':>10} {'change':>9}")
+    print("-" * 80)
+    for stage in STAGES:
+        before = baseline['stages'].get(stage, {})
+        after = results['stages'][stage]
+        if not before.get('count') or not after['count']:
+            continue
+        cells = []
+        for key in ('p50_ms', 'p99_ms'):
+            change = (after[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+            cells.append(f"{before[key]:>10.3f} {after[key]:>10.3f} {change:>+8.1f}%")
+        print(f"{stage:<10} {cells[0]}   {cells[1]}")
+    print(f"\nBaseline: {baseline.get('git_commit')} at {baseline.get('timestamp')}")
+
+def main():
+    args = sys.argv[1:]
+    options = {'--latency': 0.0, '--error-rate': 0.0, '--output': None, '--compare': None}
+    for flag in options:
+        if flag in args:
+            index = args.index(flag)
+            options[flag] = args[index + 1]
+            del args[index:index + 2]
+
+    num_packages = int(args[0]) if len(args) > 0 else 50
+    years = float(args[1]) if len(args) > 1 else 5
+    latency = float(options['--latency'])
+    error_rate = float(options['--error-rate'])
+    output = options['--output'] or f"bench_stages_{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+
+    end = date.fromisoformat(END_DATE)
+    start_date = (end - timedelta(days=round(365.25 * years) - 1)).isoformat()
+
+    names = package_names(num_packages)
+    fixtures = FixtureCache(start_date, END_DATE)
+    fixtures.warm(names)
+    stub = StubServer(latency=latency, error_rate=error_rate, series=fixtures).start()
+    npm_api.NPM_API_BASE = stub.url
+
+    # No token bucket or disk cache: the fetch stage measures the transport, retries included
+    client = npm_api.HttpClient(scheduler=RequestScheduler(rate=None))
+
+    print("=" * 70)
+    print(f"Stage benchmark: {num_packages} packages, {start_date} to {END_DATE}, "
+          f"{latency * 1000:.0f} ms latency, {error_rate:.0%} errors")
+    print("=" * 70)
+
+    timings = {stage: [] for stage in STAGES}
+    failures = 0
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory() as workdir:
+        for package_name in names:
+            try:
+                run_package(client, package_name, start_date, END_DATE, workdir, timings)
+            except npm_api.ApiError as e:
+                failures += 1
+                print(f"✗ {package_name}: {e}")
+    elapsed = time.perf_counter() - started
+
+    scheduler_stats = client.scheduler.stats()
+    results = {
+        'benchmark': 'stages',
+        'format_version': 1,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'config': {
+            'packages': num_packages,
+            'start_date': start_date,
+            'end_date': END_DATE,
+            'days': (end - date.fromisoformat(start_date)).days + 1,
+            'latency_s': latency,
+            'error_rate': error_rate
+        },
+        'elapsed_s': round(elapsed, 3),
+        'failures': failures,
+        'upstream': {
+            'requests': stub.requests,
+            'errors': stub.errors,
+            'retries': scheduler_stats['retries']
+        },
+        'stages': {stage: summarize(durations) for stage, durations in timings.items()}
+    }
+
+    client.close()
+    stub.stop()
+
+    print_results(results)
+    print("-" * 70)
+    print(f"{elapsed:.2f}s total, {stub.requests} upstream requests, {stub.errors} injected errors, "
+          f"{scheduler_stats['retries']} retries, {failures} failed packages")
+
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n✓ Results written to {output}")
+
+    if options['--compare']:
+        with open(options['--compare']) as f:
+            baseline = json.load(f)
+        print()
+        print_comparison(baseline, results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark server-side SVG charts in the stylish proof
+Renders a multi-year series with Chart.js data and with inline SVG charts,
+with the default point cap and with every point plotted
+"""
+
+import os
+import sys
+import time
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_server import daily_series
+from downsample import MAX_CHART_POINTS
+from generate_stylish_proof import calculate_weekly_growth, generate_html_report
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    start_date = sys.argv[2] if len(sys.argv) > 2 else '2023-01-01'
+    end_date = sys.argv[3] if len(sys.argv) > 3 else '2025-12-31'
+
+    days = daily_series('fixture-package', start_date, end_date)
+    range_data = {'start': start_date, 'end': end_date, 'package': 'fixture-package', 'downloads': days}
+    data = {'downloads': sum(d['downloads'] for d in days), 'start': start_date, 'end': end_date,
+            'package': 'fixture-package'}
+    weekly_growth = calculate_weekly_growth(days)
+
+    print("=" * 74)
+    print(f"generate_html_report over {len(days)} days ({start_date} to {end_date}), {repeat} renders")
+    print("=" * 74)
+    print(f"{'Charts':<10} {'max points':>10} {'HTML bytes':>12} {'p50':>10} {'p99':>10} {'external':>10}")
+    print("-" * 74)
+
+    for svg_charts in (False, True):
+        for max_points in (MAX_CHART_POINTS, 0):
+            latencies = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                html = generate_html_report('fixture-package', start_date, end_date, data, range_data, 1234,
+                                            weekly_growth, max_points, svg_charts)
+                latencies.append(time.perf_counter() - started)
+            latencies.sort()
+            external = html.count('src="http') + html.count('<link href="http')
+            print(f"{'SVG' if svg_charts else 'Chart.js':<10} {max_points or 'all':>10} {len(html):>12,} "
+                  f"{statistics.median(latencies) * 1e3:>8.2f}ms "
+                  f"{latencies[int(len(latencies) * 0.99)] * 1e3:>8.2f}ms {external:>10}")
+
+    print("-" * 74)
+    print("Chart.js pages also need the chart.js bundle and Inter from two CDNs before drawing.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark verify_proofs.py on thousands of JSON proofs
+Writes proofs for random closed periods of many packages, with a few whose
+totals or signatures were altered, then re-verifies the directory against
+the local stub twice: with an empty store, and with the days already stored.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import tempfile
+import subprocess
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from stub_server import StubServer, synthetic_count
+from generate_json_proof import generate_proof
+
+FIRST_DAY = date(2024, 1, 1)
+LAST_DAY = date(2025, 6, 30)
+
+def write_proofs(directory, num_proofs, num_packages, tampered):
+    """Write proof files; returns how many were given a wrong total and a broken signature"""
+    rng = random.Random(7)
+    span_days = (LAST_DAY - FIRST_DAY).days
+    wrong_totals = broken_signatures = 0
+    for i in range(num_proofs):
+        package_name = f"verify-package-{i % num_packages}"
+        start = FIRST_DAY + timedelta(days=rng.randrange(span_days))
+        end = min(LAST_DAY, start + timedelta(days=rng.randrange(1, 120)))
+        downloads = sum(synthetic_count(package_name, (start + timedelta(days=d)).isoformat())
+                        for d in range((end - start).days + 1))
+        if i < tampered:
+            # A consistent, correctly signed proof with the wrong number
+            downloads += 1
+            wrong_totals += 1
+        data = {'downloads': downloads, 'start': start.isoformat(), 'end': end.isoformat(), 'package': package_name}
+        proof = generate_proof(package_name, start.isoformat(), end.isoformat(), data)
+        if tampered <= i < 2 * tampered:
+            # Edited after signing
+            proof['statistics']['total_downloads'] += 1000
+            broken_signatures += 1
+        with open(os.path.join(directory, f"proof-{i:06d}.json"), 'w', encoding='utf-8') as f:
+            json.dump(proof, f, indent=2)
+    return wrong_totals, broken_signatures
+
+def run_verify(directory, env):
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, os.path.join(ROOT, 'verify_proofs.py'), directory],
+                            env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    summary = [line for line in result.stdout.splitlines() if line.startswith(('Read', 'Checked', '✓'))]
+    return elapsed, result.returncode, summary
+
+def main():
+    num_proofs = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    num_packages = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    latency = float(sys.argv[3]) if len(sys.argv) > 3 else 0.02
+
+    stub = StubServer(latency=latency).start()
+    with tempfile.TemporaryDirectory() as workdir:
+        proofs_dir = os.path.join(workdir, 'proofs')
+        os.makedirs(proofs_dir)
+        wrong_totals, broken_signatures = write_proofs(proofs_dir, num_proofs, num_packages, 5)
+
+        env = dict(os.environ, NPM_API_BASE=stub.url, NPM_PROOF_CACHE_DIR=os.path.join(workdir, 'cache'),
+                   NPM_PROOF_RATE_LIMIT='1000')
+
+        print("=" * 80)
+        print(f"verify_proofs.py: {num_proofs} proofs, {num_packages} packages, "
+              f"{latency * 1000:.0f} ms stub latency ({wrong_totals} wrong totals, "
+              f"{broken_signatures} broken signatures planted)")
+        print("=" * 80)
+        for label in ('empty store', 'days stored'):
+            before = stub.requests
+            elapsed, status, summary = run_verify(proofs_dir, env)
+            print(f"{label:<12} {elapsed:>7.2f}s  {stub.requests - before:>5} upstream requests  exit {status}")
+            for line in summary:
+                print(f"    {line}")
+
+    stub.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+"""
+Synthetic multi-year download series for benchmarks
+Each package gets a deterministic, realistic-looking history: a base level,
+compound growth, a weekday/weekend cycle, a December dip, noise and release
+spikes. Run as a script to write /downloads/range fixture files.
+"""
+
+import os
+import sys
+import json
+import math
+import zlib
+import random
+from datetime import date, timedelta
+
+# Relative traffic per weekday, Monday first
+WEEKDAY_FACTORS = (1.0, 1.05, 1.05, 1.0, 0.9, 0.55, 0.5)
+SPIKE_PROBABILITY = 0.01
+
+def package_profile(package_name):
+    """(base daily downloads, yearly growth) for a package, fixed by its name"""
+    seed = zlib.crc32(package_name.encode())
+    base = 50 * 10 ** ((seed % 1000) / 300)
+    growth = (seed >> 10) % 60 / 100
+    return base, growth
+
+def synthetic_series(package_name, start_date, end_date, origin='2015-01-01'):
+    """Daily {'downloads', 'day'} entries shaped like a /downloads/range response
+
+    Counts depend only on the package and the day, so overlapping windows
+    agree, as they do against the real API.
+    """
+    base, growth = package_profile(package_name)
+    origin_ordinal = date.fromisoformat(origin).toordinal()
+    start = date.fromisoformat(start_date)
+    end = date.fromisoformat(end_date)
+
+    days = []
+    current = start
+    while current <= end:
+        rng = random.Random(zlib.crc32(f"{package_name}|{current.toordinal()}".encode()))
+        years = (current.toordinal() - origin_ordinal) / 365.25
+        level = base * (1 + growth) ** max(years, 0)
+        level *= WEEKDAY_FACTORS[current.weekday()]
+        if current.month == 12 and current.day >= 20:
+            level *= 0.6
+        level *= 1 + 0.1 * math.sin(2 * math.pi * current.timetuple().tm_yday / 365.25)
+        level *= rng.lognormvariate(0, 0.15)
+        if rng.random() < SPIKE_PROBABILITY:
+            level *= rng.uniform(3, 10)
+        days.append({'downloads': int(level), 'day': current.isoformat()})
+        current += timedelta(days=1)
+    return days
+
+class FixtureCache:
+    """synthetic_series generated once per package over a fixed window, then sliced
+
+    Lets the stub answer requests without spending time generating data.
+    """
+
+    def __init__(self, start_date, end_date):
+        self.start = date.fromisoformat(start_date).toordinal()
+        self.start_date = start_date
+        self.end_date = end_date
+        self._series = {}
+
+    def warm(self, names):
+        for name in names:
+            self(name, self.start_date, self.end_date)
+
+    def __call__(self, package_name, start_date, end_date):
+        days = self._series.get(package_name)
+        if days is None:
+            days = self._series[package_name] = synthetic_series(package_name, self.start_date, self.end_date)
+        lo = date.fromisoformat(start_date).toordinal() - self.start
+        hi = date.fromisoformat(end_date).toordinal() - self.start + 1
+        if lo < 0 or hi > len(days):
+            return synthetic_series(package_name, start_date, end_date)
+        return days[lo:hi]
+
+def package_names(count):
+    return [f"fixture-package-{i}" for i in range(count)]
+
+def write_fixtures(directory, count, years, end_date='2025-12-31'):
+    """Write one /downloads/range response per package; returns the file paths"""
+    end = date.fromisoformat(end_date)
+    start_date = (end - timedelta(days=round(365.25 * years) - 1)).isoformat()
+    os.makedirs(directory, exist_ok=True)
+
+    paths = []
+    for name in package_names(count):
+        payload = {
+            'start': start_date,
+            'end': end_date,
+            'package': name,
+            'downloads': synthetic_series(name, start_date, end_date)
+        }
+        path = os.path.join(directory, f"{name}.json")
+        with open(path, 'w') as f:
+            json.dump(payload, f)
+        paths.append(path)
+    return paths
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python benchmarks/fixtures.py <output-dir> [packages] [years]")
+        print("\nExample:")
+        print("  python benchmarks/fixtures.py /tmp/fixtures 300 5")
+        sys.exit(1)
+
+    directory = sys.argv[1]
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    years = float(sys.argv[3]) if len(sys.argv) > 3 else 5
+    paths = write_fixtures(directory, count, years)
+    size = sum(os.path.getsize(path) for path in paths)
+    print(f"✓ Wrote {len(paths)} fixture series ({years:g} years each, {size / 1024 / 1024:.1f} MB) to {directory}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+
+"""
+Local stub of the NPM downloads API and the GitHub repos endpoint
+Serves deterministic synthetic data so benchmarks never touch the network, with
+configurable latency and rates of 429 and 503 responses. The repos endpoint
+sends ETags, answers matching If-None-Match with 304, and can enforce GitHub's
+hourly quota for unauthenticated callers.
+"""
+
+import sys
+import json
+import time
+import zlib
+import hashlib
+import random
+import threading
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+def synthetic_count(package_name, day):
+    """Deterministic daily download count for a package and ISO day"""
+    return zlib.crc32(f"{package_name}|{day}".encode()) % 5000
+
+def daily_series(package_name, start_date, end_date):
+    """Build the /downloads/range 'downloads' list for a period"""
+    start = date.fromisoformat(start_date)
+    end = date.fromisoformat(end_date)
+    days = []
+    current = start
+    while current <= end:
+        day = current.isoformat()
+        days.append({'downloads': synthetic_count(package_name, day), 'day': day})
+        current += timedelta(days=1)
+    return days
+
+def downloads_payload(endpoint, package_name, start_date, end_date, series=daily_series):
+    """Response body for /downloads/point or /downloads/range"""
+    days = series(package_name, start_date, end_date)
+    payload = {'start': start_date, 'end': end_date, 'package': package_name}
+    if endpoint == 'point':
+        payload['downloads'] = sum(d['downloads'] for d in days)
+    else:
+        payload['downloads'] = days
+    return payload
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_repo(self, owner, repo):
+        """Repo metadata the way GitHub serves it: ETag, 304s and a quota for anonymous callers"""
+        payload = {
+            'full_name': f"{owner}/{repo}",
+            'stargazers_count': zlib.crc32(repo.encode()) % 2000
+        }
+        etag = '"' + hashlib.sha256(json.dumps(payload).encode()).hexdigest()[:20] + '"'
+        if self.headers.get('If-None-Match') == etag:
+            # Conditional hits are free, as on GitHub
+            self.server.count_not_modified()
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        quota = self.server.github_quota
+        if quota is not None and not self.headers.get('Authorization'):
+            remaining = self.server.use_github_quota()
+            if remaining < 0:
+                self._send_json(403, {'message': 'API rate limit exceeded'}, {
+                    'X-RateLimit-Limit': str(quota),
+                    'X-RateLimit-Remaining': '0',
+                    'X-RateLimit-Reset': str(int(time.time()) + 3600)
+                })
+                return
+
+        self._send_json(200, payload, {'ETag': etag})
+
+    def do_GET(self):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.server.count_request()
+
+        if self.server.throttle_rate and random.random() < self.server.throttle_rate:
+            self.server.count_throttle()
+            self._send_json(429, {'error': 'rate limited'}, {'Retry-After': str(self.server.retry_after)})
+            return
+
+        if self.server.error_rate and random.random() < self.server.error_rate:
+            self.server.count_error()
+            self._send_json(503, {'error': 'service unavailable'})
+            return
+
+        series = self.server.series
+
+        parts = self.path.strip('/').split('/')
+
+        if len(parts) >= 4 and parts[0] == 'downloads' and parts[1] in ('point', 'range'):
+            endpoint, period, packages = parts[1], parts[2], '/'.join(parts[3:])
+            start_date, end_date = period.split(':')
+            names = packages.split(',')
+            if len(names) > 1:
+                # Bulk queries answer with one entry per package
+                self._send_json(200, {
+                    name: downloads_payload(endpoint, name, start_date, end_date, series) for name in names
+                })
+            else:
+                self._send_json(200, downloads_payload(endpoint, packages, start_date, end_date, series))
+        elif len(parts) == 3 and parts[0] == 'repos':
+            self._send_repo(parts[1], parts[2])
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=0, latency=0.0, throttle_rate=0.0, retry_after=0, error_rate=0.0,
+                 series=daily_series, github_quota=None):
+        """series(package, start, end) builds the daily counts the download endpoints serve
+
+        github_quota limits unauthenticated repo requests, like GitHub's 60 an hour.
+        """
+        super().__init__(('127.0.0.1', port), StubHandler)
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self.series = series
+        self.requests = 0
+        self.throttles = 0
+        self.errors = 0
+        self.github_quota = github_quota
+        self.github_used = 0
+        self.not_modified = 0
+        self._count_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def count_request(self):
+        with self._count_lock:
+            self.requests += 1
+
+    def count_throttle(self):
+        with self._count_lock:
+            self.throttles += 1
+
+    def count_error(self):
+        with self._count_lock:
+            self.errors += 1
+
+    def count_not_modified(self):
+        with self._count_lock:
+            self.not_modified += 1
+
+    def use_github_quota(self):
+        """Spend one unauthenticated repo request; returns the quota left (negative once exceeded)"""
+        with self._count_lock:
+            self.github_used += 1
+            return self.github_quota - self.github_used
+
+    def reset_github_quota(self):
+        """Start a new rate-limit hour"""
+        with self._count_lock:
+            self.github_used = 0
+
+    def start(self):
+        """Serve from a background thread"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+def main():
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+    throttle_rate = float(sys.argv[3]) if len(sys.argv) > 3 else 0.0
+    error_rate = float(sys.argv[4]) if len(sys.argv) > 4 else 0.0
+    server = StubServer(port, latency, throttle_rate, error_rate=error_rate)
+    print(f"Stub NPM/GitHub API listening on {server.url}")
+    print(f"Use it with: NPM_API_BASE={server.url} GITHUB_API_BASE={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+"""
+Thin client for the proof daemon (proof_daemon.py)
+Scripts call forward() before their heavy imports. If a daemon is listening,
+the job runs there, its output is streamed back, and the script exits with
+the job's status. If no daemon is listening, or it is busy, was started
+with a different environment or does not answer, forward() returns and the
+script runs in-process as usual. Only the standard library is imported here,
+so checking for the daemon costs next to nothing.
+"""
+
+import os
+import sys
+import json
+import socket
+import hashlib
+
+# Same default directory as response_cache.CACHE_DIR
+CACHE_DIR = os.environ.get(
+    'NPM_PROOF_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'npm-download-proof')
+)
+SOCKET_PATH = os.environ.get('NPM_PROOF_DAEMON_SOCKET', os.path.join(CACHE_DIR, 'daemon.sock'))
+DAEMON_ENABLED = os.environ.get('NPM_PROOF_DAEMON', '1') != '0'
+# Seconds to wait for the daemon to accept a job, then for each piece of its output
+ACCEPT_TIMEOUT = 5
+JOB_TIMEOUT = float(os.environ.get('NPM_PROOF_DAEMON_TIMEOUT', '600'))
+
+# Variables the scripts read when they are imported; a job only runs on a
+# daemon whose values match, so a stub run never writes real proofs or back
+JOB_ENVIRONMENT = ('HOME', 'NPM_API_BASE', 'GITHUB_API_BASE', 'GITHUB_TOKEN', 'GH_TOKEN')
+# NPM_PROOF_* variables that only concern the daemon connection itself
+CLIENT_ONLY = ('NPM_PROOF_DAEMON', 'NPM_PROOF_DAEMON_SOCKET', 'NPM_PROOF_DAEMON_TIMEOUT')
+
+def environment_fingerprint(environ=os.environ):
+    """Digest of the variables that change what a job does (tokens are never sent as is)"""
+    relevant = sorted(
+        (name, value) for name, value in environ.items()
+        if name in JOB_ENVIRONMENT or (name.startswith('NPM_PROOF_') and name not in CLIENT_ONLY)
+    )
+    return hashlib.sha256(json.dumps(relevant).encode()).hexdigest()
+
+def connect(path=SOCKET_PATH):
+    """A socket connected to the daemon, or None if none is listening"""
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+def send_message(sock, message):
+    sock.sendall(json.dumps(message).encode() + b'\n')
+
+def messages(sock):
+    """Newline-delimited JSON messages until the other side closes the connection"""
+    with sock.makefile('rb') as stream:
+        for line in stream:
+            yield json.loads(line)
+
+def forward(script, argv=None):
+    """Run a script's job on the daemon and exit with its status
+
+    Returns without doing anything when the daemon is disabled
+    (NPM_PROOF_DAEMON=0) or not running, or when --profile is given, since
+    profiling measures the local process. It also returns if the daemon is
+    busy or runs with a different environment, or goes away or does not
+    accept the job within ACCEPT_TIMEOUT.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if not DAEMON_ENABLED or '--profile' in argv:
+        return
+
+    sock = connect()
+    if sock is None:
+        return
+
+    started = False
+    with sock:
+        try:
+            sock.settimeout(ACCEPT_TIMEOUT)
+            send_message(sock, {'script': script, 'argv': argv, 'cwd': os.getcwd(),
+                                'environment': environment_fingerprint()})
+            for message in messages(sock):
+                if 'busy' in message or 'environment' in message:
+                    return
+                if 'started' in message:
+                    started = True
+                    sock.settimeout(JOB_TIMEOUT)
+                elif 'out' in message:
+                    sys.stdout.write(message['out'])
+                elif 'err' in message:
+                    sys.stderr.write(message['err'])
+                elif 'exit' in message:
+                    sys.stdout.flush()
+                    sys.exit(message['exit'])
+        except (OSError, ValueError):
+            pass
+
+    if not started:
+        return
+    print("✗ The proof daemon stopped answering before the job finished", file=sys.stderr)
+    sys.exit(1)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+"""
+Compact daily download series for fast aggregation
+Counts live in a contiguous integer array addressed by offset from a base
+date, so weekly, monthly and yearly totals are segmented reductions over
+prefix sums instead of per-entry date parsing.
+"""
+
+from array import array
+from datetime import date
+from itertools import accumulate
+
+# %b abbreviations in the C locale, which is what the scripts run under
+MONTH_ABBREVIATIONS = ('', 'Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+                       'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+def week_label(start, end):
+    """Format a week label as "Dec 29 - Jan 04" """
+    return (f"{MONTH_ABBREVIATIONS[start.month]} {start.day:02d} - "
+            f"{MONTH_ABBREVIATIONS[end.month]} {end.day:02d}")
+
+class DailySeries:
+    """Daily counts starting at a base date
+
+    `counts` is any sequence of ints (array, list or memoryview). A series
+    built from days with holes keeps the day of every entry in `ordinals`.
+    """
+
+    def __init__(self, base, counts, ordinals=None):
+        self.base = base
+        self.counts = counts
+        self.ordinals = ordinals
+        self._prefix = None
+
+    @classmethod
+    def from_days(cls, daily_data):
+        """Build a series from a list of {'day', 'downloads'} entries"""
+        counts = array('q', [d['downloads'] for d in daily_data])
+        if not daily_data:
+            return cls(None, counts)
+
+        days = [d['day'] for d in daily_data]
+        first = date.fromisoformat(days[0])
+        last = date.fromisoformat(days[-1])
+
+        # Strictly increasing days spanning exactly len(days) dates have no holes
+        increasing = all(a < b for a, b in zip(days, days[1:]))
+        if increasing and last.toordinal() - first.toordinal() == len(days) - 1:
+            return cls(first, counts)
+
+        return cls(first, counts, [date.fromisoformat(day).toordinal() for day in days])
+
+    def __len__(self):
+        return len(self.counts)
+
+    @property
+    def prefix(self):
+        """Prefix sums: prefix[i] is the total of the first i entries"""
+        if self._prefix is None:
+            self._prefix = list(accumulate(self.counts, initial=0))
+        return self._prefix
+
+    def total(self, lo=0, hi=None):
+        """Total of entries [lo, hi)"""
+        hi = len(self.counts) if hi is None else hi
+        return self.prefix[hi] - self.prefix[lo]
+
+    def day(self, index):
+        """Date of the entry at index"""
+        if self.ordinals is not None:
+            return date.fromordinal(self.ordinals[index])
+        return date.fromordinal(self.base.toordinal() + index)
+
+    def dense(self):
+        """The series with one entry per calendar day, days missing from it counted as 0"""
+        if self.ordinals is None:
+            return self
+        first = min(self.ordinals)
+        counts = array('q', bytes(8 * (max(self.ordinals) - first + 1)))
+        for ordinal, count in zip(self.ordinals, self.counts):
+            counts[ordinal - first] += count
+        return DailySeries(date.fromordinal(first), counts)
+
+    def weekly_totals(self):
+        """Consecutive 7-entry chunks as (start, end, downloads); the last may be partial"""
+        prefix = self.prefix
+        n = len(self.counts)
+        return [
+            (self.day(lo), self.day(min(lo + 7, n) - 1), prefix[min(lo + 7, n)] - prefix[lo])
+            for lo in range(0, n, 7)
+        ]
+
+    def _calendar_segments(self, key):
+        """Split the entries into runs sharing key(date), in order of first appearance"""
+        n = len(self.counts)
+        if n == 0:
+            return []
+
+        if self.ordinals is not None:
+            # Irregular series: group entry by entry, keyed like a dict would be
+            groups = {}
+            for index, ordinal in enumerate(self.ordinals):
+                groups.setdefault(key(date.fromordinal(ordinal)), []).append(index)
+            return [(k, indexes) for k, indexes in groups.items()]
+
+        segments = []
+        base_ordinal = self.base.toordinal()
+        lo = 0
+        while lo < n:
+            current = date.fromordinal(base_ordinal + lo)
+            segment_key = key(current)
+            next_start = segment_start_after(current, segment_key)
+            hi = min(n, next_start.toordinal() - base_ordinal)
+            segments.append((segment_key, (lo, hi)))
+            lo = hi
+        return segments
+
+    def _segment_totals(self, key):
+        prefix = self.prefix
+        totals = []
+        for segment_key, span in self._calendar_segments(key):
+            if isinstance(span, tuple):
+                lo, hi = span
+                totals.append((segment_key, prefix[hi] - prefix[lo]))
+            else:
+                totals.append((segment_key, sum(self.counts[i] for i in span)))
+        return totals
+
+    def monthly_totals(self):
+        """Calendar-month totals as ((year, month), downloads)"""
+        return self._segment_totals(lambda d: (d.year, d.month))
+
+    def yearly_totals(self):
+        """Calendar-year totals as (year, downloads)"""
+        return self._segment_totals(lambda d: d.year)
+
+def segment_start_after(current, segment_key):
+    """First date of the calendar segment after the one containing current"""
+    if isinstance(segment_key, tuple):
+        year, month = segment_key
+        return date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return date(current.year + 1, 1, 1)
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+
+"""
+Local per-package store of daily download counts
+Closed days are kept in SQLite and indexed in memory with prefix sums, so the
+total for any start:end window is O(1) and the API is only asked for the days
+the store does not have yet. The latest fetch of each package's unsettled days
+is kept too, with its fetch time, and reused for CURRENT_DAY_TTL.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from datetime import date, timedelta
+
+from instrumentation import count, span
+from response_cache import CACHE_ENABLED, CURRENT_DAY_TTL, SETTLE_DAYS, base_directory, utc_today
+
+# Days from a stub or any other NPM_API_BASE are stored apart from npm's
+STORE_PATH = os.environ.get('NPM_PROOF_STORE', os.path.join(base_directory(), 'daily.sqlite3'))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily (
+    package TEXT NOT NULL,
+    day TEXT NOT NULL,
+    downloads INTEGER NOT NULL,
+    PRIMARY KEY (package, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS unsettled (
+    package TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    cover_start INTEGER NOT NULL,
+    cover_end INTEGER NOT NULL,
+    counts TEXT NOT NULL
+)
+"""
+
+def default_path():
+    """Store location, in memory when the on-disk cache is disabled"""
+    return STORE_PATH if CACHE_ENABLED else ':memory:'
+
+def last_closed_day():
+    """Latest day whose counts can no longer change"""
+    return utc_today() - timedelta(days=SETTLE_DAYS + 1)
+
+def covers_recent(entry, start_ord, end_ord):
+    """True if a (fetched_at, start, end, counts) unsettled fetch is fresh and covers [start, end]"""
+    fetched_at, cover_start, cover_end, _ = entry
+    return time.time() - fetched_at <= CURRENT_DAY_TTL and cover_start <= start_ord and end_ord <= cover_end
+
+class PackageIndex:
+    """Prefix sums over the stored days of one package"""
+
+    def __init__(self, rows):
+        # rows: sorted (day, downloads) pairs
+        self.base = date.fromisoformat(rows[0][0]).toordinal() if rows else 0
+        size = date.fromisoformat(rows[-1][0]).toordinal() - self.base + 1 if rows else 0
+
+        present = [0] * size
+        counts = [0] * size
+        for day, downloads in rows:
+            offset = date.fromisoformat(day).toordinal() - self.base
+            present[offset] = 1
+            counts[offset] = downloads
+
+        self.counts = counts
+        self.present = present
+        self.sum_prefix = [0] * (size + 1)
+        self.present_prefix = [0] * (size + 1)
+        for i in range(size):
+            self.sum_prefix[i + 1] = self.sum_prefix[i] + counts[i]
+            self.present_prefix[i + 1] = self.present_prefix[i] + present[i]
+
+    def _clip(self, start_ord, end_ord):
+        lo = max(start_ord - self.base, 0)
+        hi = min(end_ord - self.base, len(self.counts) - 1)
+        return lo, hi
+
+    def total(self, start_ord, end_ord):
+        """Sum of stored counts in [start, end]"""
+        lo, hi = self._clip(start_ord, end_ord)
+        if lo > hi:
+            return 0
+        return self.sum_prefix[hi + 1] - self.sum_prefix[lo]
+
+    def stored(self, start_ord, end_ord):
+        """Number of stored days in [start, end]"""
+        lo, hi = self._clip(start_ord, end_ord)
+        if lo > hi:
+            return 0
+        return self.present_prefix[hi + 1] - self.present_prefix[lo]
+
+    def is_complete(self, start_ord, end_ord):
+        """True if every day in [start, end] is stored"""
+        lo, hi = self._clip(start_ord, end_ord)
+        expected = end_ord - start_ord + 1
+        if lo > hi:
+            return expected <= 0
+        return self.present_prefix[hi + 1] - self.present_prefix[lo] == expected
+
+    def gaps(self, start_ord, end_ord):
+        """Contiguous runs of days in [start, end] that are not stored"""
+        gaps = []
+        gap_start = None
+        for ordinal in range(start_ord, end_ord + 1):
+            offset = ordinal - self.base
+            stored = 0 <= offset < len(self.present) and self.present[offset]
+            if not stored and gap_start is None:
+                gap_start = ordinal
+            elif stored and gap_start is not None:
+                gaps.append((gap_start, ordinal - 1))
+                gap_start = None
+        if gap_start is not None:
+            gaps.append((gap_start, end_ord))
+        return gaps
+
+    def series(self, start_ord, end_ord):
+        """Stored days in [start, end] as (ordinal, downloads) pairs"""
+        lo, hi = self._clip(start_ord, end_ord)
+        return [(self.base + i, self.counts[i]) for i in range(lo, hi + 1) if self.present[i]]
+
+class DailyStore:
+    """SQLite-backed store of closed daily counts per package"""
+
+    def __init__(self, fetch_range, fetch_bulk_range=None, path=None):
+        """fetch_range(package, start, end) must return a /downloads/range response;
+        fetch_bulk_range(packages, start, end) returns {package: response}"""
+        self.fetch_range = fetch_range
+        self.fetch_bulk_range = fetch_bulk_range
+        self.path = path or default_path()
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        self._db.commit()
+        self._indexes = {}
+        # package -> (fetched_at, covered start, covered end, {ordinal: downloads})
+        self._recent = {}
+        self._lock = threading.RLock()
+        # package -> [(start, end, done event)] of range fetches in flight
+        self._fetching = {}
+
+    def _index(self, package_name):
+        with self._lock:
+            index = self._indexes.get(package_name)
+            if index is None:
+                rows = self._db.execute(
+                    "SELECT day, downloads FROM daily WHERE package = ? ORDER BY day",
+                    (package_name,)
+                ).fetchall()
+                index = PackageIndex(rows)
+                self._indexes[package_name] = index
+            return index
+
+    def first_day(self, package_name):
+        """Earliest stored day of a package as an ISO date, or None if nothing is stored"""
+        index = self._index(package_name)
+        if not index.counts:
+            return None
+        return date.fromordinal(index.base).isoformat()
+
+    def last_day(self, package_name):
+        """Latest stored day of a package as an ISO date, or None if nothing is stored"""
+        index = self._index(package_name)
+        if not index.counts:
+            return None
+        return date.fromordinal(index.base + len(index.counts) - 1).isoformat()
+
+    def stored_days(self, package_name, start_date, end_date):
+        """Number of days in [start, end] that are stored"""
+        return self._index(package_name).stored(date.fromisoformat(start_date).toordinal(),
+                                                date.fromisoformat(end_date).toordinal())
+
+    def store_days(self, package_name, days):
+        """Persist the closed days of a range response and refresh the index"""
+        self.store_many({package_name: days})
+
+    def store_many(self, days_by_package):
+        """Persist closed days for several packages in one transaction"""
+        cutoff = last_closed_day().isoformat()
+        rows = [
+            (package_name, d['day'], d['downloads'])
+            for package_name, days in days_by_package.items()
+            for d in days if d['day'] <= cutoff
+        ]
+        if not rows:
+            return
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO daily (package, day, downloads) VALUES (?, ?, ?)", rows
+            )
+            self._db.commit()
+            for package_name in days_by_package:
+                self._indexes.pop(package_name, None)
+
+    def _remember_unsettled(self, package_name, start_ord, end_ord, days):
+        """Keep freshly fetched unsettled days, in memory and on disk, for a short TTL"""
+        closed_ord = last_closed_day().toordinal()
+        cover_start = max(start_ord, closed_ord + 1)
+        if cover_start > end_ord:
+            return
+
+        counts = {}
+        for d in days:
+            ordinal = date.fromisoformat(d['day']).toordinal()
+            if ordinal > closed_ord:
+                counts[ordinal] = d['downloads']
+
+        entry = (time.time(), cover_start, end_ord, counts)
+        with self._lock:
+            self._recent[package_name] = entry
+            self._db.execute(
+                "INSERT OR REPLACE INTO unsettled (package, fetched_at, cover_start, cover_end, counts) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (package_name, entry[0], cover_start, end_ord, json.dumps(counts))
+            )
+            self._db.commit()
+
+    def _load_unsettled(self, package_name):
+        """The unsettled days another process fetched last, or None"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT fetched_at, cover_start, cover_end, counts FROM unsettled WHERE package = ?",
+                (package_name,)
+            ).fetchone()
+            if row is None:
+                return None
+            fetched_at, cover_start, cover_end, counts = row
+            entry = (fetched_at, cover_start, cover_end, {int(k): v for k, v in json.loads(counts).items()})
+            self._recent[package_name] = entry
+            return entry
+
+    def _recent_days(self, package_name, start_ord, end_ord):
+        """Unsettled days in [start, end] if a fresh fetch already covered them"""
+        with self._lock:
+            entry = self._recent.get(package_name)
+        if entry is None or not covers_recent(entry, start_ord, end_ord):
+            entry = self._load_unsettled(package_name)
+            if entry is None or not covers_recent(entry, start_ord, end_ord):
+                return None
+
+        counts = entry[3]
+        return [
+            {'downloads': counts[ordinal], 'day': date.fromordinal(ordinal).isoformat()}
+            for ordinal in range(start_ord, end_ord + 1) if ordinal in counts
+        ]
+
+    def _absorb(self, package_name, start_ord, end_ord, days):
+        """Record a range response that covered [start, end]"""
+        self.store_days(package_name, days)
+        self._remember_unsettled(package_name, start_ord, end_ord, days)
+
+    def _plan(self, package_name, start_ord, end_ord):
+        """Requests needed to cover [start, end], plus unsettled days already in memory"""
+        closed_ord = last_closed_day().toordinal()
+        index = self._index(package_name)
+
+        requests = []
+        closed_end = min(end_ord, closed_ord)
+        if start_ord <= closed_end and not index.is_complete(start_ord, closed_end):
+            requests.extend(index.gaps(start_ord, closed_end))
+
+        unsettled = []
+        if end_ord > closed_ord:
+            tail_start = max(start_ord, closed_ord + 1)
+            recent = self._recent_days(package_name, tail_start, end_ord)
+            if recent is not None:
+                unsettled = recent
+            elif requests and requests[-1][1] == tail_start - 1:
+                # Merge the unsettled tail into an adjacent gap so it costs no extra request
+                requests[-1] = (requests[-1][0], end_ord)
+            else:
+                requests.append((tail_start, end_ord))
+
+        return requests, unsettled
+
+    def _fill(self, package_name, start_ord, end_ord):
+        """Fetch the days the store is missing; returns (error, unsettled days)
+
+        A fill whose gaps overlap a fetch already in flight for the package
+        waits for it and plans again, instead of requesting the same days
+        twice. Fills of disjoint ranges fetch concurrently.
+        """
+        closed_ord = last_closed_day().toordinal()
+        while True:
+            with self._lock:
+                requests, unsettled = self._plan(package_name, start_ord, end_ord)
+                in_flight = self._fetching.get(package_name, [])
+                waits = [
+                    done for fetch_start, fetch_end, done in in_flight
+                    if any(fetch_start <= gap_end and gap_start <= fetch_end for gap_start, gap_end in requests)
+                ]
+                if not waits:
+                    own = [(gap_start, gap_end, threading.Event()) for gap_start, gap_end in requests]
+                    if own:
+                        self._fetching.setdefault(package_name, []).extend(own)
+                    break
+            count('store_shared_fetches')
+            for done in waits:
+                done.wait()
+
+        if requests:
+            count('store_gap_requests', len(requests))
+        else:
+            count('store_hits')
+
+        try:
+            for gap_start, gap_end, _ in own:
+                data = self.fetch_range(
+                    package_name,
+                    date.fromordinal(gap_start).isoformat(),
+                    date.fromordinal(gap_end).isoformat()
+                )
+                if 'downloads' not in data:
+                    return data, None
+                self._absorb(package_name, gap_start, gap_end, data['downloads'])
+                unsettled.extend(d for d in data['downloads'] if date.fromisoformat(d['day']).toordinal() > closed_ord)
+        finally:
+            if own:
+                with self._lock:
+                    in_flight = self._fetching[package_name]
+                    for entry in own:
+                        in_flight.remove(entry)
+                        entry[2].set()
+                    if not in_flight:
+                        del self._fetching[package_name]
+
+        return None, unsettled
+
+    def prefetch_many(self, package_names, start_date, end_date):
+        """Fill the store for many packages at once through bulk requests
+
+        Only packages missing days in the window are requested. Returns
+        {package: error response} for packages the bulk fetch could not cover.
+        """
+        if self.fetch_bulk_range is None:
+            return {}
+
+        start_ord = date.fromisoformat(start_date).toordinal()
+        end_ord = date.fromisoformat(end_date).toordinal()
+        needed = [p for p in package_names if self._plan(p, start_ord, end_ord)[0]]
+        if not needed:
+            return {}
+
+        with span('bulk_prefetch', packages=len(needed)):
+            responses = self.fetch_bulk_range(needed, start_date, end_date)
+
+        errors = {}
+        fetched = {}
+        for package_name in needed:
+            data = responses.get(package_name)
+            if data and 'downloads' in data:
+                fetched[package_name] = data['downloads']
+                self._remember_unsettled(package_name, start_ord, end_ord, data['downloads'])
+            else:
+                errors[package_name] = data or {'error': f"package {package_name} not found"}
+
+        self.store_many(fetched)
+        return errors
+
+    def range_data(self, package_name, start_date, end_date):
+        """Daily counts for a window, shaped like a /downloads/range response"""
+        start_ord = date.fromisoformat(start_date).toordinal()
+        end_ord = date.fromisoformat(end_date).toordinal()
+        if start_ord > end_ord:
+            return self.fetch_range(package_name, start_date, end_date)
+
+        error, unsettled = self._fill(package_name, start_ord, end_ord)
+        if error is not None:
+            return error
+
+        downloads = [
+            {'downloads': count, 'day': date.fromordinal(ordinal).isoformat()}
+            for ordinal, count in self._index(package_name).series(start_ord, end_ord)
+        ]
+        downloads.extend({'downloads': d['downloads'], 'day': d['day']} for d in unsettled)
+
+        return {'start': start_date, 'end': end_date, 'package': package_name, 'downloads': downloads}
+
+    def point_data(self, package_name, start_date, end_date):
+        """Total downloads for a window, shaped like a /downloads/point response"""
+        start_ord = date.fromisoformat(start_date).toordinal()
+        end_ord = date.fromisoformat(end_date).toordinal()
+        if start_ord > end_ord:
+            return self.fetch_range(package_name, start_date, end_date)
+
+        error, unsettled = self._fill(package_name, start_ord, end_ord)
+        if error is not None:
+            return error
+
+        total = self._index(package_name).total(start_ord, end_ord)
+        total += sum(d['downloads'] for d in unsettled)
+
+        return {'downloads': total, 'start': start_date, 'end': end_date, 'package': package_name}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+"""
+Downsampling of chart series before they are embedded in a proof
+Largest-Triangle-Three-Buckets keeps the visual shape of a long series with a
+fixed number of points. Only the plotted points are reduced; totals are always
+computed from the full data.
+"""
+
+import os
+
+# Points plotted per chart view; 0 disables downsampling
+MAX_CHART_POINTS = int(os.environ.get('NPM_PROOF_MAX_CHART_POINTS', '365'))
+
+def lttb_indexes(values, threshold):
+    """Indexes of the points LTTB keeps out of values, in order
+
+    The first and last points are always kept, and so is the largest value,
+    so a spike never disappears from the chart.
+    """
+    n = len(values)
+    if threshold <= 0 or n <= threshold:
+        return list(range(n))
+    if threshold < 3:
+        return [0, n - 1][:threshold]
+
+    peak = max(range(n), key=values.__getitem__)
+    bucket_size = (n - 2) / (threshold - 2)
+
+    kept = [0]
+    previous = 0
+    for bucket in range(threshold - 2):
+        lo = int(bucket * bucket_size) + 1
+        hi = int((bucket + 1) * bucket_size) + 1
+
+        if lo <= peak < hi:
+            chosen = peak
+        else:
+            # Average of the next bucket is the third corner of the triangle
+            next_lo = hi
+            next_hi = min(int((bucket + 2) * bucket_size) + 1, n)
+            avg_x = (next_lo + next_hi - 1) / 2
+            avg_y = sum(values[next_lo:next_hi]) / (next_hi - next_lo)
+
+            # Twice the triangle area, expanded to a*y + b*x + c
+            prev_y = values[previous]
+            a = previous - avg_x
+            b = avg_y - prev_y
+            c = -a * prev_y - previous * b
+            chosen = lo
+            best_area = -1.0
+            for i in range(lo, hi):
+                area = abs(a * values[i] + b * i + c)
+                if area > best_area:
+                    best_area = area
+                    chosen = i
+
+        kept.append(chosen)
+        previous = chosen
+
+    kept.append(n - 1)
+    return kept
+
+def downsample(entries, max_points=MAX_CHART_POINTS, key='downloads'):
+    """Reduce a list of chart entries to at most max_points with LTTB"""
+    if not max_points or len(entries) <= max_points:
+        return entries
+    values = [entry[key] for entry in entries]
+    return [entries[i] for i in lttb_indexes(values, max_points)]
@@ -6,33 +6,39 @@ API: https://api.npmjs.org/downloads/point/{period}/{package}
 """
 
 import sys
-import json
-import urllib.request
 from datetime import datetime
 
+from daemon_client import forward
+
+if __name__ == "__main__":
+    # Hand the job to a running proof daemon before paying for the imports below
+    forward('fetch_npm_downloads')
+
+from instrumentation import profile_from_argv, span
+from npm_api import ApiError, get_store, point_url
+
 def fetch_downloads(package_name, start_date, end_date):
     """Fetch download statistics from npm registry"""
-    period = f"{start_date}:{end_date}"
-    url = f"https://api.npmjs.org/downloads/point/{period}/{package_name}"
+    url = point_url(package_name, start_date, end_date)
 
     print(f"Fetching downloads for {package_name} from {start_date} to {end_date}...")
     print(f"URL: {url}\n")
 
     try:
-        with urllib.request.urlopen(url) as response:
-            data = json.loads(response.read().decode())
-
-            if 'downloads' in data:
-                print("✓ Success!")
-                print(f"Package: {data['package']}")
-                print(f"Period: {data['start']} to {data['end']}")
-                print(f"Total Downloads: {data['downloads']:,}")
-                return data
-            else:
-                print("Response:", data)
-                return None
-
-    except urllib.error.HTTPError as e:
+        with span('fetch_summary', package=package_name):
+            data = get_store().point_data(package_name, start_date, end_date)
+
+        if 'downloads' in data:
+            print("✓ Success!")
+            print(f"Package: {data['package']}")
+            print(f"Period: {data['start']} to {data['end']}")
+            print(f"Total Downloads: {data['downloads']:,}")
+            return data
+        else:
+            print("Response:", data)
+            return None
+
+    except ApiError as e:
         print(f"HTTP Error {e.code}: {e.reason}")
         return None
     except Exception as e:
@@ -47,17 +53,19 @@ def validate_date(date_string):
     except ValueError:
         return False
 
-def main():
-    if len(sys.argv) < 4:
-        print("Usage: python fetch_npm_downloads.py <package-name> <start-date> <end-date>")
+def main(argv=None):
+    argv = sys.argv if argv is None else argv
+    profile_from_argv(argv)
+    if len(argv) < 4:
+        print("Usage: python fetch_npm_downloads.py <package-name> <start-date> <end-date> [--profile]")
         print("Date format: YYYY-MM-DD")
         print("\nExample:")
         print("  python fetch_npm_downloads.py mcp-server-kubernetes 2025-11-27 2025-12-03")
         sys.exit(1)
 
-    package_name = sys.argv[1]
-    start_date = sys.argv[2]
-    end_date = sys.argv[3]
+    package_name = argv[1]
+    start_date = argv[2]
+    end_date = argv[3]
 
     # Validate dates
     if not validate_date(start_date) or not validate_date(end_date):
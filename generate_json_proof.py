@@ -7,21 +7,17 @@ Creates a machine-readable proof that can be verified programmatically
 
 import sys
 import json
-import urllib.request
 from datetime import datetime
 import hashlib
 
-def fetch_downloads(package_name, start_date, end_date):
-    """Fetch download statistics from npm registry"""
-    period = f"{start_date}:{end_date}"
-    url = f"https://api.npmjs.org/downloads/point/{period}/{package_name}"
+from daemon_client import forward
 
-    try:
-        with urllib.request.urlopen(url) as response:
-            data = json.loads(response.read().decode())
-            return data if 'downloads' in data else None
-    except Exception as e:
-        return None
+if __name__ == "__main__":
+    # Hand the job to a running proof daemon before paying for the imports below
+    forward('generate_json_proof')
+
+from instrumentation import profile_from_argv, span
+from npm_api import fetch_downloads, filename_part, parse_package_names, prefetch_packages
 
 def generate_proof(package_name, start_date, end_date, data):
     """Generate JSON proof document"""
@@ -70,33 +66,26 @@ def generate_proof(package_name, start_date, end_date, data):
 
     return proof
 
-def main():
-    if len(sys.argv) < 4:
-        print("Usage: python generate_json_proof.py <package-name> <start-date> <end-date>")
-        print("\nExample:")
-        print("  python generate_json_proof.py mcp-server-kubernetes 2025-11-27 2025-12-03")
-        sys.exit(1)
-
-    package_name = sys.argv[1]
-    start_date = sys.argv[2]
-    end_date = sys.argv[3]
-
+def generate_package_proof(package_name, start_date, end_date):
+    """Fetch one package's statistics and save its JSON proof; returns the filename or None"""
     print(f"Fetching download statistics for {package_name}...")
 
-    data = fetch_downloads(package_name, start_date, end_date)
+    with span('fetch_summary', package=package_name):
+        data = fetch_downloads(package_name, start_date, end_date)
 
     if not data:
         print("❌ Failed to fetch download statistics.")
-        sys.exit(1)
+        return None
 
     print(f"✓ Successfully fetched data: {data['downloads']:,} downloads\n")
 
     # Generate proof
-    proof = generate_proof(package_name, start_date, end_date, data)
+    with span('render'):
+        proof = generate_proof(package_name, start_date, end_date, data)
 
     # Save to file
-    output_filename = f"npm_downloads_proof_{package_name}_{start_date}_to_{end_date}.json"
-    with open(output_filename, 'w', encoding='utf-8') as f:
+    output_filename = f"npm_downloads_proof_{filename_part(package_name)}_{start_date}_to_{end_date}.json"
+    with span('write'), open(output_filename, 'w', encoding='utf-8') as f:
         json.dump(proof, f, indent=2)
 
     print(f"✓ JSON proof generated: {output_filename}")
@@ -107,6 +96,41 @@ def main():
     print(f"  Signature Hash: {proof['verification']['signature_hash'][:32]}...")
     print(f"\nVerification URL:")
     print(f"  {proof['verification']['api_url']}")
+    return output_filename
+
+def main(argv=None):
+    argv = sys.argv if argv is None else argv
+    profile_from_argv(argv)
+    if len(argv) < 4:
+        print("Usage: python generate_json_proof.py <package-name>[,<package-name>...] <start-date> <end-date> [--profile]")
+        print("\nExample:")
+        print("  python generate_json_proof.py mcp-server-kubernetes 2025-11-27 2025-12-03")
+        print("  python generate_json_proof.py mcp-server-kubernetes,express 2025-11-27 2025-12-03")
+        sys.exit(1)
+
+    package_names = parse_package_names(argv[1])
+    start_date = argv[2]
+    end_date = argv[3]
+
+    prefetch_packages(package_names, start_date, end_date)
+
+    failed = []
+    for package_name in package_names:
+        try:
+            with span('proof', package=package_name):
+                generated = generate_package_proof(package_name, start_date, end_date)
+        except OSError as e:
+            print(f"❌ Could not write the proof: {e}")
+            generated = None
+        if not generated:
+            failed.append(package_name)
+        if len(package_names) > 1:
+            print()
+
+    if failed:
+        if len(package_names) > 1:
+            print(f"✗ Failed for {len(failed)} packages: {', '.join(failed)}")
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
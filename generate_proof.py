@@ -6,38 +6,52 @@ Creates an HTML report that can be saved as PDF for submission
 """
 
 import sys
-import json
-import urllib.request
 from datetime import datetime
 import hashlib
 
-def fetch_downloads(package_name, start_date, end_date):
-    """Fetch download statistics from npm registry"""
-    period = f"{start_date}:{end_date}"
-    url = f"https://api.npmjs.org/downloads/point/{period}/{package_name}"
-
-    try:
-        with urllib.request.urlopen(url) as response:
-            data = json.loads(response.read().decode())
-            return data if 'downloads' in data else None
-    except Exception as e:
-        print(f"Error fetching data: {str(e)}")
-        return None
+from daemon_client import forward
+
+if __name__ == "__main__":
+    # Hand the job to a running proof daemon before paying for the imports below
+    forward('generate_proof')
+
+from instrumentation import profile_from_argv, span
+from npm_api import fetch_downloads, fetch_range_data, filename_part, parse_package_names, prefetch_packages
+from pdf_proof import render_proof_pdf
 
 def generate_verification_hash(package_name, start_date, end_date, downloads, timestamp):
     """Generate a verification hash for the report"""
     data_string = f"{package_name}|{start_date}|{end_date}|{downloads}|{timestamp}"
     return hashlib.sha256(data_string.encode()).hexdigest()[:16]
 
+def report_fields(package_name, start_date, end_date, data):
+    """Values shown in every proof format, including the verification hash"""
+    downloads = data['downloads']
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')
+    return {
+        'package_name': package_name,
+        'start_date': start_date,
+        'end_date': end_date,
+        'data_start': data['start'],
+        'data_end': data['end'],
+        'downloads': downloads,
+        'timestamp': timestamp,
+        'verification_hash': generate_verification_hash(package_name, start_date, end_date, downloads, timestamp),
+        'verification_url': f"https://api.npmjs.org/downloads/point/{start_date}:{end_date}/{package_name}",
+        'npm_package_url': f"https://www.npmjs.com/package/{package_name}",
+        'github_repo': f"https://github.com/Flux159/{package_name}"  # Adjust if needed
+    }
+
 def generate_html_report(package_name, start_date, end_date, data):
     """Generate HTML proof document"""
 
-    downloads = data['downloads']
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')
-    verification_hash = generate_verification_hash(package_name, start_date, end_date, downloads, timestamp)
-    verification_url = f"https://api.npmjs.org/downloads/point/{start_date}:{end_date}/{package_name}"
-    npm_package_url = f"https://www.npmjs.com/package/{package_name}"
-    github_repo = f"https://github.com/Flux159/{package_name}"  # Adjust if needed
+    fields = report_fields(package_name, start_date, end_date, data)
+    downloads = fields['downloads']
+    timestamp = fields['timestamp']
+    verification_hash = fields['verification_hash']
+    verification_url = fields['verification_url']
+    npm_package_url = fields['npm_package_url']
+    github_repo = fields['github_repo']
 
     html = f"""<!DOCTYPE html>
 <html lang="en">
@@ -282,25 +296,43 @@ def generate_html_report(package_name, start_date, end_date, data):
 
     return html
 
-def main():
-    if len(sys.argv) < 4:
-        print("Usage: python generate_proof.py <package-name> <start-date> <end-date>")
-        print("\nExample:")
-        print("  python generate_proof.py mcp-server-kubernetes 2025-11-27 2025-12-03")
-        print("\nThis will generate an HTML file that can be:")
-        print("  - Opened in a browser and saved as PDF (File > Print > Save as PDF)")
-        print("  - Submitted as proof of download statistics")
-        print("  - Verified by anyone using the API URL in the report")
-        sys.exit(1)
+def proof_filename(package_name, start_date, end_date, extension='html'):
+    """Name of the proof file for a package and period"""
+    return f"npm_downloads_proof_{filename_part(package_name)}_{start_date}_to_{end_date}.{extension}"
+
+def save_proof(package_name, start_date, end_date, data):
+    """Render the HTML proof for fetched data and save it; returns the filename"""
+    with span('render'):
+        html_content = generate_html_report(package_name, start_date, end_date, data)
+
+    output_filename = proof_filename(package_name, start_date, end_date)
+    with span('write', bytes=len(html_content)), open(output_filename, 'w', encoding='utf-8') as f:
+        f.write(html_content)
+
+    return output_filename
+
+def save_pdf_proof(package_name, start_date, end_date, data, daily_data=None):
+    """Render the PDF proof for fetched data and save it; returns the filename
+
+    daily_data ({'day', 'downloads'} entries) adds a daily chart. Runs
+    without shared state, so batches can call it from worker processes.
+    """
+    with span('render_pdf', days=len(daily_data or ())):
+        pdf_content = render_proof_pdf(report_fields(package_name, start_date, end_date, data), daily_data)
 
-    package_name = sys.argv[1]
-    start_date = sys.argv[2]
-    end_date = sys.argv[3]
+    output_filename = proof_filename(package_name, start_date, end_date, 'pdf')
+    with span('write', bytes=len(pdf_content)), open(output_filename, 'wb') as f:
+        f.write(pdf_content)
 
+    return output_filename
+
+def generate_package_proof(package_name, start_date, end_date, pdf=False):
+    """Fetch one package's statistics and save its proof; returns the filename or None"""
     print(f"Fetching download statistics for {package_name}...")
     print(f"Period: {start_date} to {end_date}\n")
 
-    data = fetch_downloads(package_name, start_date, end_date)
+    with span('fetch_summary', package=package_name):
+        data = fetch_downloads(package_name, start_date, end_date)
 
     if not data:
         print("❌ Failed to fetch download statistics.")
@@ -308,28 +340,84 @@ def main():
         print("  - Package name is correct")
         print("  - Dates are in YYYY-MM-DD format")
         print("  - You have internet connection")
-        sys.exit(1)
+        return None
 
     print(f"✓ Successfully fetched data: {data['downloads']:,} downloads\n")
 
-    # Generate HTML report
-    html_content = generate_html_report(package_name, start_date, end_date, data)
-
-    # Save to file
-    output_filename = f"npm_downloads_proof_{package_name}_{start_date}_to_{end_date}.html"
-    with open(output_filename, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    if pdf:
+        # Daily counts for the chart come from the store the total was just answered from
+        with span('fetch_range', package=package_name):
+            range_data = fetch_range_data(package_name, start_date, end_date)
+        daily_data = range_data['downloads'] if range_data else None
+        output_filename = save_pdf_proof(package_name, start_date, end_date, data, daily_data)
+    else:
+        # Generate and save HTML report
+        output_filename = save_proof(package_name, start_date, end_date, data)
 
     print(f"✓ Proof document generated: {output_filename}")
+    return output_filename
+
+def main(argv=None):
+    argv = sys.argv if argv is None else argv
+    profile_from_argv(argv)
+    args = argv[1:]
+    pdf = '--pdf' in args
+    if pdf:
+        args.remove('--pdf')
+
+    if len(args) < 3:
+        print("Usage: python generate_proof.py <package-name>[,<package-name>...] <start-date> <end-date> [--pdf] [--profile]")
+        print("\nExample:")
+        print("  python generate_proof.py mcp-server-kubernetes 2025-11-27 2025-12-03")
+        print("\nThis will generate an HTML file that can be:")
+        print("  - Opened in a browser and saved as PDF (File > Print > Save as PDF)")
+        print("  - Submitted as proof of download statistics")
+        print("  - Verified by anyone using the API URL in the report")
+        print("\nSeveral comma-separated packages are fetched with bulk requests,")
+        print("one proof per package.")
+        print("\n--pdf writes the proof straight to a PDF with a daily downloads chart,")
+        print("without a browser.")
+        print("\n--profile times each stage and writes a Chrome trace (chrome://tracing).")
+        sys.exit(1)
+
+    package_names = parse_package_names(args[0])
+    start_date = args[1]
+    end_date = args[2]
+
+    prefetch_packages(package_names, start_date, end_date)
+
+    failed = []
+    for package_name in package_names:
+        try:
+            with span('proof', package=package_name):
+                generated = generate_package_proof(package_name, start_date, end_date, pdf)
+        except OSError as e:
+            print(f"❌ Could not write the proof: {e}")
+            generated = None
+        if not generated:
+            failed.append(package_name)
+        if len(package_names) > 1:
+            print()
+
+    if len(failed) == len(package_names):
+        sys.exit(1)
+
     print("\nNext steps:")
-    print("  1. Open the HTML file in your web browser")
-    print("  2. Save as PDF (File > Print > Save as PDF)")
-    print("  3. Submit the PDF as proof of download statistics")
+    if pdf:
+        print("  1. Submit the PDF as proof of download statistics")
+    else:
+        print("  1. Open the HTML file in your web browser")
+        print("  2. Save as PDF (File > Print > Save as PDF)")
+        print("  3. Submit the PDF as proof of download statistics")
     print("\nThe report includes:")
     print("  ✓ Official download numbers")
     print("  ✓ Verification URL (anyone can confirm the data)")
     print("  ✓ Timestamp of report generation")
     print("  ✓ Verification hash")
 
+    if failed:
+        print(f"\n✗ Failed for {len(failed)} packages: {', '.join(failed)}")
+        sys.exit(1)
+
 if __name__ == "__main__":
     main()
@@ -5,126 +5,69 @@ Generate a beautifully designed, Apple-style proof document with interactive cha
 Clean white and light gray design
 """
 
+import os
+import re
 import sys
 import json
-import urllib.request
-from datetime import datetime, timedelta
+import time
+import threading
+from datetime import date, datetime, timedelta
+from concurrent.futures import Future, TimeoutError as FetchTimeout
 import hashlib
 
-def fetch_downloads(package_name, start_date, end_date):
-    """Fetch download statistics from npm registry"""
-    period = f"{start_date}:{end_date}"
-    url = f"https://api.npmjs.org/downloads/point/{period}/{package_name}"
-
-    try:
-        with urllib.request.urlopen(url) as response:
-            data = json.loads(response.read().decode())
-            return data if 'downloads' in data else None
-    except Exception as e:
-        print(f"Error fetching data: {str(e)}")
-        return None
-
-def fetch_github_stars(github_url):
-    """Fetch GitHub stars count"""
-    try:
-        # Extract owner and repo from URL
-        parts = github_url.replace('https://github.com/', '').split('/')
-        if len(parts) >= 2:
-            owner, repo = parts[0], parts[1]
-            api_url = f"https://api.github.com/repos/{owner}/{repo}"
-
-            req = urllib.request.Request(api_url)
-            req.add_header('Accept', 'application/vnd.github.v3+json')
-
-            with urllib.request.urlopen(req) as response:
-                repo_data = json.loads(response.read().decode())
-                return repo_data.get('stargazers_count', 0)
-    except Exception as e:
-        print(f"Could not fetch GitHub stars: {str(e)}")
-        return None
+from daily_series import MONTH_ABBREVIATIONS, DailySeries, week_label
+from downsample import MAX_CHART_POINTS, lttb_indexes
+from instrumentation import profile_from_argv, span
+from rolling_windows import COMPARISONS, SUMMARY_ROWS, RollingWindows
+from series_store import get_series_store
+from svg_chart import render_line_chart
+from npm_api import (fetch_downloads, fetch_range_data, fetch_github_stars, filename_part,
+                     parse_package_names, prefetch_packages)
 
 def calculate_weekly_growth(daily_data):
-    """Calculate this week vs previous week growth"""
+    """Calculate this week vs previous week growth
+
+    Weeks are the last 7 calendar days and the 7 before them, with days
+    missing from the data counted as 0. On a series with gaps this differs
+    from summing the last 7 entries, as this function did before it used
+    RollingWindows; on a complete series the results are the same.
+    """
     if not daily_data or len(daily_data) < 7:
         return None
 
-    # Get last 7 days and previous 7 days
-    last_week = daily_data[-7:]
-    prev_week = daily_data[-14:-7] if len(daily_data) >= 14 else None
-
-    last_week_total = sum(d['downloads'] for d in last_week)
-
-    if prev_week:
-        prev_week_total = sum(d['downloads'] for d in prev_week)
-        if prev_week_total > 0:
-            growth_rate = ((last_week_total - prev_week_total) / prev_week_total) * 100
-            return {
-                'last_week': last_week_total,
-                'prev_week': prev_week_total,
-                'growth_rate': growth_rate
-            }
-
-    return {'last_week': last_week_total}
+    rolling = RollingWindows(as_series(daily_data), windows=(7,),
+                             comparisons={'week_over_week': COMPARISONS['week_over_week']})
+    last = len(rolling) - 1
+    weekly_totals = rolling.totals[7]
+    if weekly_totals[last] is None:
+        return None
 
-def fetch_range_data(package_name, start_date, end_date):
-    """Fetch daily download data for charts"""
-    period = f"{start_date}:{end_date}"
-    url = f"https://api.npmjs.org/downloads/range/{period}/{package_name}"
+    weekly_growth = {'last_week': weekly_totals[last]}
+    growth_rate = rolling.growth['week_over_week'][last]
+    if growth_rate is not None:
+        weekly_growth['prev_week'] = weekly_totals[last - 7]
+        weekly_growth['growth_rate'] = growth_rate
+    return weekly_growth
 
-    try:
-        with urllib.request.urlopen(url) as response:
-            data = json.loads(response.read().decode())
-            return data if 'downloads' in data else None
-    except Exception as e:
-        return None
+def as_series(daily_data):
+    """Accept either a DailySeries or a list of {'day', 'downloads'} entries"""
+    if isinstance(daily_data, DailySeries):
+        return daily_data
+    return DailySeries.from_days(daily_data)
 
 def calculate_weekly_data(daily_data):
     """Aggregate daily data into weekly data"""
     if not daily_data:
         return []
 
+    # Consecutive 7-day chunks; any remaining days form a partial week
     weekly = []
-    current_week = []
-    current_week_downloads = 0
-
-    for entry in daily_data:
-        current_week.append(entry)
-        current_week_downloads += entry['downloads']
-
-        # If we have 7 days, create a week entry
-        if len(current_week) == 7:
-            week_start = current_week[0]['day']
-            week_end = current_week[-1]['day']
-
-            # Format label as "Dec 29 - Jan 4"
-            start_date = datetime.strptime(week_start, '%Y-%m-%d')
-            end_date = datetime.strptime(week_end, '%Y-%m-%d')
-            label = f"{start_date.strftime('%b %d')} - {end_date.strftime('%b %d')}"
-
-            weekly.append({
-                'start': week_start,
-                'end': week_end,
-                'downloads': current_week_downloads,
-                'label': label
-            })
-            current_week = []
-            current_week_downloads = 0
-
-    # Add remaining days as a partial week
-    if current_week:
-        week_start = current_week[0]['day']
-        week_end = current_week[-1]['day']
-
-        # Format label as "Dec 29 - Jan 4"
-        start_date = datetime.strptime(week_start, '%Y-%m-%d')
-        end_date = datetime.strptime(week_end, '%Y-%m-%d')
-        label = f"{start_date.strftime('%b %d')} - {end_date.strftime('%b %d')}"
-
+    for start, end, downloads in as_series(daily_data).weekly_totals():
         weekly.append({
-            'start': week_start,
-            'end': week_end,
-            'downloads': current_week_downloads,
-            'label': label
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'downloads': downloads,
+            'label': week_label(start, end)
         })
 
     return weekly
@@ -134,61 +77,146 @@ def calculate_monthly_data(daily_data):
     if not daily_data:
         return []
 
-    monthly = {}
-
-    for entry in daily_data:
-        month_key = entry['day'][:7]  # YYYY-MM
-        if month_key not in monthly:
-            monthly[month_key] = {
-                'month': month_key,
-                'downloads': 0,
-                'label': datetime.strptime(month_key, '%Y-%m').strftime('%b %Y')
-            }
-        monthly[month_key]['downloads'] += entry['downloads']
-
-    return list(monthly.values())
+    return [
+        {
+            'month': f"{year:04d}-{month:02d}",
+            'downloads': downloads,
+            'label': f"{MONTH_ABBREVIATIONS[month]} {year:04d}"
+        }
+        for (year, month), downloads in as_series(daily_data).monthly_totals()
+    ]
+
+def delta_encode(numbers):
+    """[a, b, c] -> [a, b - a, c - b]"""
+    encoded = []
+    previous = 0
+    for number in numbers:
+        encoded.append(number - previous)
+        previous = number
+    return encoded
+
+def encode_points(start, offsets, values):
+    """Compact chart data: a start plus delta-encoded offsets and values
+
+    Evenly spaced offsets collapse to a single `step`.
+    """
+    encoded = {'start': start}
+    steps = delta_encode(offsets)
+    if steps[:1] == [0] and len(set(steps[1:])) <= 1:
+        encoded['step'] = steps[1] if len(steps) > 1 else 1
+    else:
+        encoded['steps'] = steps
+    encoded['values'] = delta_encode(values)
+    return encoded
+
+def decode_points(encoded):
+    """Inverse of encode_points: (offsets, values), as the page's JavaScript expands them"""
+    offsets = []
+    values = []
+    offset = value = 0
+    for i, delta in enumerate(encoded['values']):
+        offset = offset + encoded['steps'][i] if 'steps' in encoded else i * encoded['step']
+        value += delta
+        offsets.append(offset)
+        values.append(value)
+    return offsets, values
+
+def expand_chart(view, encoded):
+    """Labels, download counts and offsets of an encoded chart view, as the page shows them"""
+    offsets, values = decode_points(encoded)
+    if view == 'monthly':
+        year, month = (int(part) for part in encoded['start'].split('-'))
+        labels = []
+        for offset in offsets:
+            y, m = divmod(year * 12 + month - 1 + offset, 12)
+            labels.append(f"{MONTH_ABBREVIATIONS[m + 1]} {y:04d}")
+        return labels, values, offsets
+
+    start = date.fromisoformat(encoded['start']) if offsets else None
+    if view == 'weekly':
+        labels = [
+            week_label(start + timedelta(days=offset), start + timedelta(days=offset + span))
+            for offset, span in zip(offsets, encoded['spans'])
+        ]
+    else:
+        labels = []
+        for offset in offsets:
+            day = start + timedelta(days=offset)
+            labels.append(f"{MONTH_ABBREVIATIONS[day.month]} {day.day}")
+    return labels, values, offsets
+
+def encode_daily_chart(series, max_points=MAX_CHART_POINTS):
+    """Downsampled daily points as day offsets from the first day"""
+    if not len(series):
+        return encode_points(None, [], [])
+    kept = lttb_indexes(series.counts, max_points)
+    if series.ordinals is None:
+        offsets = kept
+    else:
+        offsets = [series.ordinals[i] - series.ordinals[0] for i in kept]
+    return encode_points(series.day(0).isoformat(), offsets, [series.counts[i] for i in kept])
+
+def encode_weekly_chart(weekly_totals, max_points=MAX_CHART_POINTS):
+    """Downsampled weekly totals as start-day offsets plus the length of each week"""
+    if not weekly_totals:
+        return encode_points(None, [], [])
+    kept = [weekly_totals[i] for i in lttb_indexes([w[2] for w in weekly_totals], max_points)]
+    first = kept[0][0].toordinal()
+    encoded = encode_points(kept[0][0].isoformat(), [start.toordinal() - first for start, _, _ in kept],
+                            [downloads for _, _, downloads in kept])
+    encoded['spans'] = [(end - start).days for start, end, _ in kept]
+    return encoded
+
+def encode_monthly_chart(monthly_totals, max_points=MAX_CHART_POINTS):
+    """Downsampled monthly totals as month offsets from the first month"""
+    if not monthly_totals:
+        return encode_points(None, [], [])
+    kept = [monthly_totals[i] for i in lttb_indexes([m[1] for m in monthly_totals], max_points)]
+    (first_year, first_month), _ = kept[0]
+    return encode_points(f"{first_year:04d}-{first_month:02d}",
+                         [(year - first_year) * 12 + month - first_month for (year, month), _ in kept],
+                         [downloads for _, downloads in kept])
+
+def chart_json(encoded):
+    """Serialize chart data without whitespace"""
+    return json.dumps(encoded, separators=(',', ':'))
 
 def generate_verification_hash(package_name, start_date, end_date, downloads, timestamp):
     """Generate a verification hash for the report"""
     data_string = f"{package_name}|{start_date}|{end_date}|{downloads}|{timestamp}"
     return hashlib.sha256(data_string.encode()).hexdigest()[:16]
 
-def generate_html_report(package_name, start_date, end_date, data, range_data=None, github_stars=None, weekly_growth=None):
-    """Generate beautiful Apple-style HTML proof document"""
-
-    downloads = data['downloads']
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')
-    verification_hash = generate_verification_hash(package_name, start_date, end_date, downloads, timestamp)
-    verification_url = f"https://api.npmjs.org/downloads/point/{start_date}:{end_date}/{package_name}"
-    npm_package_url = f"https://www.npmjs.com/package/{package_name}"
-    github_repo = f"https://github.com/Flux159/{package_name}"
-
-    # Prepare chart data
-    daily_data = range_data.get('downloads', []) if range_data else []
-    weekly_data = calculate_weekly_data(daily_data)
-    monthly_data = calculate_monthly_data(daily_data)
-
-    # Convert to JSON for JavaScript
-    daily_json = json.dumps(daily_data)
-    weekly_json = json.dumps(weekly_data)
-    monthly_json = json.dumps(monthly_data)
-
-    html = f"""<!DOCTYPE html>
+def compile_template(template):
+    """Split a {{field}} template into its static segments and field names, once"""
+    parts = re.split(r'\{\{(\w+)\}\}', template)
+    return parts[0::2], parts[1::2]
+
+def render_template(compiled, fields):
+    """Join precompiled static segments with the dynamic field values"""
+    segments, names = compiled
+    out = [segments[0]]
+    for name, segment in zip(names, segments[1:]):
+        out.append(fields[name])
+        out.append(segment)
+    return ''.join(out)
+
+# The report shell is plain HTML/CSS/JS with {{field}} placeholders. It is split
+# into static segments at import time so rendering only joins strings.
+REPORT_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>NPM Download Statistics - {package_name}</title>
-    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">
-    <script src="https://cdn.jsdelivr.net/npm/chart.js@4.4.0/dist/chart.umd.min.js"></script>
+    <title>NPM Download Statistics - {{package_name}}</title>
+{{head_assets}}
     <style>
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
 
-        :root {{
+        :root {
             --primary-text: #1d1d1f;
             --secondary-text: #6e6e73;
             --background: #ffffff;
@@ -197,46 +225,46 @@ def generate_html_report(package_name, start_date, end_date, data, range_data=No
             --accent: #000000;
             --card-shadow: 0 2px 8px rgba(0, 0, 0, 0.04);
             --card-hover-shadow: 0 4px 16px rgba(0, 0, 0, 0.08);
-        }}
+        }
 
-        body {{
+        body {
             font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
             background: var(--surface);
             color: var(--primary-text);
             line-height: 1.6;
             min-height: 100vh;
             overflow-x: hidden;
-        }}
+        }
 
-        .hero {{
+        .hero {
             background: var(--background);
             border-bottom: 1px solid var(--border);
             padding: 80px 20px;
             text-align: center;
-        }}
+        }
 
-        .hero-content {{
+        .hero-content {
             max-width: 900px;
             margin: 0 auto;
             animation: fadeInUp 0.8s ease-out;
-        }}
+        }
 
-        .hero h1 {{
+        .hero h1 {
             font-size: 56px;
             font-weight: 600;
             margin-bottom: 16px;
             letter-spacing: -1px;
             color: var(--primary-text);
-        }}
+        }
 
-        .hero .subtitle {{
+        .hero .subtitle {
             font-size: 24px;
             font-weight: 400;
             color: var(--secondary-text);
             animation: fadeInUp 0.8s ease-out 0.2s both;
-        }}
+        }
 
-        .package-name {{
+        .package-name {
             display: inline-block;
             background: var(--surface);
             padding: 12px 28px;
@@ -246,33 +274,33 @@ def generate_html_report(package_name, start_date, end_date, data, range_data=No
             margin-top: 24px;
             color: var(--primary-text);
             animation: fadeInUp 0.8s ease-out 0.4s both;
-        }}
+        }
 
-        @keyframes fadeInUp {{
-            from {{
+        @keyframes fadeInUp {
+            from {
                 opacity: 0;
                 transform: translateY(30px);
-            }}
-            to {{
+            }
+            to {
                 opacity: 1;
                 transform: translateY(0);
-            }}
-        }}
+            }
+        }
 
-        .container {{
+        .container {
             max-width: 1200px;
             margin: 0 auto;
             padding: 60px 20px 80px;
-        }}
+        }
 
-        .stats-grid {{
+        .stats-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
             gap: 20px;
             margin-bottom: 40px;
-        }}
+        }
 
-        .stat-card {{
+        .stat-card {
             background: var(--background);
             border: 1px solid var(--border);
             border-radius: 16px;
@@ -280,68 +308,68 @@ def generate_html_report(package_name, start_date, end_date, data, range_data=No
             text-align: center;
             transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
             animation: fadeInUp 0.6s ease-out both;
-        }}
+        }
 
-        .stat-card:nth-child(1) {{ animation-delay: 0.1s; }}
-        .stat-card:nth-child(2) {{ animation-delay: 0.2s; }}
-        .stat-card:nth-child(3) {{ animation-delay: 0.3s; }}
+        .stat-card:nth-child(1) { animation-delay: 0.1s; }
+        .stat-card:nth-child(2) { animation-delay: 0.2s; }
+        .stat-card:nth-child(3) { animation-delay: 0.3s; }
 
-        .stat-card:hover {{
+        .stat-card:hover {
             transform: translateY(-4px);
             box-shadow: var(--card-hover-shadow);
-        }}
+        }
 
-        .stat-label {{
+        .stat-label {
             font-size: 13px;
             font-weight: 600;
             color: var(--secondary-text);
             text-transform: uppercase;
             letter-spacing: 1.2px;
             margin-bottom: 16px;
-        }}
+        }
 
-        .stat-value {{
+        .stat-value {
             font-size: 52px;
             font-weight: 600;
             color: var(--primary-text);
             line-height: 1;
             letter-spacing: -1px;
-        }}
+        }
 
-        .chart-section {{
+        .chart-section {
             background: var(--background);
             border: 1px solid var(--border);
             border-radius: 16px;
             padding: 48px 40px;
             margin-bottom: 24px;
             animation: fadeInUp 0.6s ease-out 0.4s both;
-        }}
+        }
 
-        .chart-header {{
+        .chart-header {
             display: flex;
             justify-content: space-between;
             align-items: center;
             margin-bottom: 40px;
             flex-wrap: wrap;
             gap: 20px;
-        }}
+        }
 
-        .chart-title {{
+        .chart-title {
             font-size: 32px;
             font-weight: 600;
             color: var(--primary-text);
             letter-spacing: -0.5px;
-        }}
+        }
 
-        .chart-tabs {{
+        .chart-tabs {
             display: flex;
             gap: 0;
             background: var(--surface);
             padding: 3px;
             border-radius: 10px;
-        }}
+        }
 
-        .chart-tab {{
+        .chart-tab {
             padding: 10px 24px;
             border: none;
             background: transparent;
@@ -351,100 +379,101 @@ def generate_html_report(package_name, start_date, end_date, data, range_data=No
             border-radius: 7px;
             cursor: pointer;
             transition: all 0.2s;
-        }}
+        }
 
-        .chart-tab:hover {{
+        .chart-tab:hover {
             color: var(--primary-text);
-        }}
+        }
 
-        .chart-tab.active {{
+        .chart-tab.active {
             background: var(--background);
             color: var(--primary-text);
             box-shadow: 0 1px 3px rgba(0, 0, 0, 0.1);
-        }}
+        }
 
-        .chart-container {{
+        .chart-container {
             position: relative;
             height: 380px;
             margin-bottom: 20px;
-        }}
+        }
 
-        .info-grid {{
+        .info-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
             gap: 24px;
             margin-bottom: 24px;
-        }}
+        }
 
-        .info-card {{
+        .info-card {
             background: var(--background);
             border: 1px solid var(--border);
             border-radius: 16px;
             padding: 36px;
             animation: fadeInUp 0.6s ease-out both;
-        }}
+        }
 
-        .info-card:nth-child(1) {{ animation-delay: 0.5s; }}
-        .info-card:nth-child(2) {{ animation-delay: 0.6s; }}
+        .info-card:nth-child(1) { animation-delay: 0.5s; }
+        .info-card:nth-child(2) { animation-delay: 0.6s; }
+        .info-card:nth-child(3) { animation-delay: 0.65s; }
 
-        .info-card h3 {{
+        .info-card h3 {
             font-size: 20px;
             font-weight: 600;
             color: var(--primary-text);
             margin-bottom: 24px;
-        }}
+        }
 
-        .info-row {{
+        .info-row {
             display: flex;
             justify-content: space-between;
             padding: 18px 0;
             border-bottom: 1px solid var(--surface);
             align-items: flex-start;
             gap: 20px;
-        }}
+        }
 
-        .info-row:last-child {{
+        .info-row:last-child {
             border-bottom: none;
-        }}
+        }
 
-        .info-label {{
+        .info-label {
             font-size: 14px;
             font-weight: 500;
             color: var(--secondary-text);
             flex-shrink: 0;
-        }}
+        }
 
-        .info-value {{
+        .info-value {
             font-size: 14px;
             font-weight: 500;
             color: var(--primary-text);
             font-family: 'SF Mono', 'Monaco', monospace;
             text-align: right;
             word-break: break-word;
-        }}
+        }
 
-        .verification-card {{
+        .verification-card {
             background: var(--background);
             border: 1px solid var(--border);
             border-radius: 16px;
             padding: 36px;
             animation: fadeInUp 0.6s ease-out 0.7s both;
-        }}
+        }
 
-        .verification-card h3 {{
+        .verification-card h3 {
             font-size: 20px;
             font-weight: 600;
             color: var(--primary-text);
             margin-bottom: 20px;
-        }}
+        }
 
-        .verification-card p {{
+        .verification-card p {
             color: var(--secondary-text);
             line-height: 1.8;
             margin-bottom: 24px;
-        }}
+        }
 
-        .badge {{
+        .badge {
             display: inline-block;
             padding: 6px 16px;
             background: var(--primary-text);
@@ -454,9 +483,9 @@ def generate_html_report(package_name, start_date, end_date, data, range_data=No
             font-weight: 600;
             text-transform: uppercase;
             letter-spacing: 0.8px;
-        }}
+        }
 
-        .link-button {{
+        .link-button {
             display: inline-flex;
             align-items: center;
             gap: 8px;
@@ -468,31 +497,31 @@ def generate_html_report(package_name, start_date, end_date, data, range_data=No
             font-weight: 500;
             font-size: 15px;
             transition: all 0.2s;
-        }}
+        }
 
-        .link-button:hover {{
+        .link-button:hover {
             transform: translateY(-2px);
             box-shadow: 0 8px 16px rgba(0, 0, 0, 0.12);
-        }}
+        }
 
-        .link-button.secondary {{
+        .link-button.secondary {
             background: var(--background);
             color: var(--primary-text);
             border: 1px solid var(--border);
-        }}
+        }
 
-        .link-button.secondary:hover {{
+        .link-button.secondary:hover {
             background: var(--surface);
-        }}
+        }
 
-        .links-section {{
+        .links-section {
             display: flex;
             flex-wrap: wrap;
             gap: 12px;
             margin-bottom: 24px;
-        }}
+        }
 
-        .api-endpoint {{
+        .api-endpoint {
             margin-top: 20px;
             padding: 20px;
             background: var(--surface);
@@ -502,63 +531,63 @@ def generate_html_report(package_name, start_date, end_date, data, range_data=No
             word-break: break-all;
             color: var(--secondary-text);
             line-height: 1.6;
-        }}
+        }
 
-        .api-endpoint strong {{
+        .api-endpoint strong {
             color: var(--primary-text);
             display: block;
             margin-bottom: 8px;
-        }}
+        }
 
-        .footer {{
+        .footer {
             text-align: center;
             padding: 60px 20px 40px;
             color: var(--secondary-text);
             font-size: 13px;
             border-top: 1px solid var(--border);
-        }}
+        }
 
-        .footer a {{
+        .footer a {
             color: var(--primary-text);
             text-decoration: none;
-        }}
+        }
 
-        .footer a:hover {{
+        .footer a:hover {
             text-decoration: underline;
-        }}
+        }
 
-        @media (max-width: 768px) {{
-            .hero h1 {{
+        @media (max-width: 768px) {
+            .hero h1 {
                 font-size: 40px;
-            }}
+            }
 
-            .hero .subtitle {{
+            .hero .subtitle {
                 font-size: 20px;
-            }}
+            }
 
-            .stat-value {{
+            .stat-value {
                 font-size: 42px;
-            }}
+            }
 
-            .chart-container {{
+            .chart-container {
                 height: 280px;
-            }}
+            }
 
-            .chart-title {{
+            .chart-title {
                 font-size: 24px;
-            }}
-        }}
+            }
+        }
 
-        @media print {{
-            body {{
+        @media print {
+            body {
                 background: white;
-            }}
+            }
 
-            .stat-card, .chart-section, .info-card, .verification-card {{
+            .stat-card, .chart-section, .info-card, .verification-card {
                 box-shadow: none;
                 page-break-inside: avoid;
-            }}
-        }}
+            }
+        }
     </style>
 </head>
 <body>
@@ -566,7 +595,7 @@ def generate_html_report(package_name, start_date, end_date, data, range_data=No
         <div class="hero-content">
             <h1>Download Statistics</h1>
             <p class="subtitle">Official NPM Registry Verification</p>
-            <div class="package-name">{package_name}</div>
+            <div class="package-name">{{package_name}}</div>
         </div>
     </div>
 
@@ -574,27 +603,27 @@ def generate_html_report(package_name, start_date, end_date, data, range_data=No
         <div class="stats-grid">
             <div class="stat-card">
                 <div class="stat-label">Total Downloads</div>
-                <div class="stat-value">{downloads:,}</div>
+                <div class="stat-value">{{downloads}}</div>
             </div>
-            {'<div class="stat-card"><div class="stat-label">This Week</div><div class="stat-value">' + f"{weekly_growth['last_week']:,}" + '</div>' + (f'<div style="font-size: 14px; color: {"#34c759" if weekly_growth.get("growth_rate", 0) > 0 else "#ff3b30"}; margin-top: 8px; font-weight: 500;">{weekly_growth["growth_rate"]:+.1f}% vs last week</div>' if 'growth_rate' in weekly_growth else '') + '</div>' if weekly_growth else ''}
-            {'<div class="stat-card"><div class="stat-label">GitHub Stars</div><div class="stat-value" style="font-size: 36px;">⭐ ' + f"{github_stars:,}" + '</div></div>' if github_stars else ''}
+            {{weekly_card}}
+            {{stars_card}}
             <div class="stat-card">
                 <div class="stat-label">Date Range</div>
-                <div class="stat-value" style="font-size: 22px;">{data['start']}<br/>to<br/>{data['end']}</div>
+                <div class="stat-value" style="font-size: 22px;">{{data_start}}<br/>to<br/>{{data_end}}</div>
             </div>
         </div>
 
-        <div class="chart-section" id="chartSection" style="display: {'block' if daily_data else 'none'};">
+        <div class="chart-section" id="chartSection" style="display: {{chart_display}};">
             <div class="chart-header">
                 <h2 class="chart-title">Download Trends</h2>
                 <div class="chart-tabs">
                     <button class="chart-tab active" onclick="showChart('daily', event)">Daily</button>
-                    <button class="chart-tab" onclick="showChart('weekly', event)" id="weeklyTab" style="display: {'inline-block' if len(weekly_data) > 1 else 'none'};">Weekly</button>
-                    <button class="chart-tab" onclick="showChart('monthly', event)" id="monthlyTab" style="display: {'inline-block' if len(monthly_data) > 1 else 'none'};">Monthly</button>
+                    <button class="chart-tab" onclick="showChart('weekly', event)" id="weeklyTab" style="display: {{weekly_tab_display}};">Weekly</button>
+                    <button class="chart-tab" onclick="showChart('monthly', event)" id="monthlyTab" style="display: {{monthly_tab_display}};">Monthly</button>
                 </div>
             </div>
             <div class="chart-container">
-                <canvas id="downloadChart"></canvas>
+                {{chart_body}}
             </div>
         </div>
 
@@ -603,19 +632,19 @@ def generate_html_report(package_name, start_date, end_date, data, range_data=No
                 <h3>Package Information</h3>
                 <div class="info-row">
                     <span class="info-label">Package Name</span>
-                    <span class="info-value">{package_name}</span>
+                    <span class="info-value">{{package_name}}</span>
                 </div>
                 <div class="info-row">
                     <span class="info-label">Date Range</span>
-                    <span class="info-value">{data['start']} to {data['end']}</span>
+                    <span class="info-value">{{data_start}} to {{data_end}}</span>
                 </div>
                 <div class="info-row">
                     <span class="info-label">Total Downloads</span>
-                    <span class="info-value">{downloads:,}</span>
+                    <span class="info-value">{{downloads}}</span>
                 </div>
                 <div class="info-row">
                     <span class="info-label">Report Generated</span>
-                    <span class="info-value">{timestamp}</span>
+                    <span class="info-value">{{timestamp}}</span>
                 </div>
             </div>
 
@@ -627,13 +656,14 @@ def generate_html_report(package_name, start_date, end_date, data, range_data=No
                 </div>
                 <div class="info-row">
                     <span class="info-label">Verification Hash</span>
-                    <span class="info-value">{verification_hash}</span>
+                    <span class="info-value">{{verification_hash}}</span>
                 </div>
                 <div class="info-row">
                     <span class="info-label">Status</span>
                     <span class="info-value"><span class="badge">VERIFIED</span></span>
                 </div>
             </div>
+            {{trends_card}}
         </div>
 
         <div class="verification-card">
@@ -643,82 +673,133 @@ def generate_html_report(package_name, start_date, end_date, data, range_data=No
                 verify these statistics by visiting the API endpoint below or checking the NPM package page.
             </p>
             <div class="links-section">
-                <a href="{npm_package_url}" class="link-button" target="_blank">
+                <a href="{{npm_package_url}}" class="link-button" target="_blank">
                     View on NPM
                 </a>
-                <a href="{github_repo}" class="link-button secondary" target="_blank">
+                <a href="{{github_repo}}" class="link-button secondary" target="_blank">
                     GitHub Repository
                 </a>
             </div>
             <div class="api-endpoint">
                 <strong>API Endpoint</strong>
-                {verification_url}
+                {{verification_url}}
             </div>
         </div>
     </div>
 
     <div class="footer">
         <p>
-            Generated on {timestamp}<br>
+            Generated on {{timestamp}}<br>
             Data source: <a href="https://api.npmjs.org" target="_blank">NPM Registry API</a>
         </p>
     </div>
 
-    <script>
-        const dailyData = {daily_json};
-        const weeklyData = {weekly_json};
-        const monthlyData = {monthly_json};
+{{chart_script}}
+</body>
+</html>"""
+
+REPORT_SEGMENTS = compile_template(REPORT_TEMPLATE)
+
+# Chart.js renders the charts in the browser from the compact chart data
+CHARTJS_ASSETS = """    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">
+    <script src="https://cdn.jsdelivr.net/npm/chart.js@4.4.0/dist/chart.umd.min.js"></script>"""
+
+CHARTJS_SCRIPT_TEMPLATE = """    <script>
+        // Each series is a start plus delta-encoded offsets and download counts
+        const encodedData = {
+            daily: {{daily_json}},
+            weekly: {{weekly_json}},
+            monthly: {{monthly_json}}
+        };
+        const expandedData = {};
+        const MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'];
 
         let currentChart = null;
         let currentView = 'daily';
 
-        function showChart(view, clickEvent) {{
+        function addDays(isoDay, days) {
+            const [year, month, day] = isoDay.split('-').map(Number);
+            return new Date(Date.UTC(year, month - 1, day + days));
+        }
+
+        function shortDay(date) {
+            return MONTHS[date.getUTCMonth()] + ' ' + String(date.getUTCDate()).padStart(2, '0');
+        }
+
+        // Tick label for a position on the x axis, in the view's offset units
+        function offsetLabel(view, offset) {
+            if (view === 'monthly') {
+                const [year, month] = encodedData.monthly.start.split('-').map(Number);
+                const date = new Date(Date.UTC(year, month - 1 + offset, 1));
+                return MONTHS[date.getUTCMonth()] + ' ' + date.getUTCFullYear();
+            }
+            const date = addDays(encodedData[view].start, offset);
+            return MONTHS[date.getUTCMonth()] + ' ' + date.getUTCDate();
+        }
+
+        function expandSeries(view) {
+            if (expandedData[view]) {
+                return expandedData[view];
+            }
+
+            const encoded = encodedData[view];
+            const points = [];
+            let offset = 0;
+            let downloads = 0;
+            encoded.values.forEach((delta, i) => {
+                offset = encoded.steps ? offset + encoded.steps[i] : i * encoded.step;
+                downloads += delta;
+
+                let label;
+                if (view === 'weekly') {
+                    const start = addDays(encoded.start, offset);
+                    const end = addDays(encoded.start, offset + encoded.spans[i]);
+                    label = shortDay(start) + ' - ' + shortDay(end);
+                } else {
+                    label = offsetLabel(view, offset);
+                }
+                points.push({ offset: offset, label: label, downloads: downloads });
+            });
+
+            expandedData[view] = points;
+            return points;
+        }
+
+        function showChart(view, clickEvent) {
             currentView = view;
 
             // Update tabs
-            document.querySelectorAll('.chart-tab').forEach(tab => {{
+            document.querySelectorAll('.chart-tab').forEach(tab => {
                 tab.classList.remove('active');
-            }});
+            });
 
             // If called from button click, update active state
-            if (clickEvent && clickEvent.target) {{
+            if (clickEvent && clickEvent.target) {
                 clickEvent.target.classList.add('active');
-            }} else {{
+            } else {
                 // If called programmatically, activate the corresponding tab
-                document.querySelectorAll('.chart-tab').forEach(tab => {{
-                    if (tab.onclick && tab.onclick.toString().includes(view)) {{
+                document.querySelectorAll('.chart-tab').forEach(tab => {
+                    if (tab.onclick && tab.onclick.toString().includes(view)) {
                         tab.classList.add('active');
-                    }}
-                }});
-            }}
-
-            let labels, data;
-
-            if (view === 'daily') {{
-                labels = dailyData.map(d => {{
-                    const date = new Date(d.day);
-                    return date.toLocaleDateString('en-US', {{ month: 'short', day: 'numeric' }});
-                }});
-                data = dailyData.map(d => d.downloads);
-            }} else if (view === 'weekly') {{
-                labels = weeklyData.map(d => d.label);
-                data = weeklyData.map(d => d.downloads);
-            }} else if (view === 'monthly') {{
-                labels = monthlyData.map(d => d.label);
-                data = monthlyData.map(d => d.downloads);
-            }}
-
-            if (currentChart) {{
+                    }
+                });
+            }
+
+            // Points sit at their offsets on a linear axis, so the gaps a
+            // downsampled series leaves between kept points stay to scale
+            const points = expandSeries(view);
+            const data = points.map(d => ({ x: d.offset, y: d.downloads }));
+
+            if (currentChart) {
                 currentChart.destroy();
-            }}
+            }
 
             const ctx = document.getElementById('downloadChart').getContext('2d');
 
-            currentChart = new Chart(ctx, {{
+            currentChart = new Chart(ctx, {
                 type: 'line',
-                data: {{
-                    labels: labels,
-                    datasets: [{{
+                data: {
+                    datasets: [{
                         label: 'Downloads',
                         data: data,
                         borderColor: '#1d1d1f',
@@ -734,158 +815,383 @@ def generate_html_report(package_name, start_date, end_date, data, range_data=No
                         pointHoverBackgroundColor: '#1d1d1f',
                         pointHoverBorderColor: '#fff',
                         pointHoverBorderWidth: 3
-                    }}]
-                }},
-                options: {{
+                    }]
+                },
+                options: {
                     responsive: true,
                     maintainAspectRatio: false,
-                    interaction: {{
+                    interaction: {
                         intersect: false,
-                        mode: 'index'
-                    }},
-                    plugins: {{
-                        legend: {{
+                        mode: 'nearest',
+                        axis: 'x'
+                    },
+                    plugins: {
+                        legend: {
                             display: false
-                        }},
-                        tooltip: {{
+                        },
+                        tooltip: {
                             backgroundColor: 'rgba(29, 29, 31, 0.95)',
                             padding: 14,
                             titleColor: '#fff',
-                            titleFont: {{
+                            titleFont: {
                                 size: 13,
                                 weight: '600'
-                            }},
+                            },
                             bodyColor: '#fff',
-                            bodyFont: {{
+                            bodyFont: {
                                 size: 14
-                            }},
+                            },
                             borderColor: 'rgba(255, 255, 255, 0.1)',
                             borderWidth: 1,
                             cornerRadius: 8,
                             displayColors: false,
-                            callbacks: {{
-                                label: function(context) {{
+                            callbacks: {
+                                title: function(items) {
+                                    return points[items[0].dataIndex].label;
+                                },
+                                label: function(context) {
                                     return 'Downloads: ' + context.parsed.y.toLocaleString();
-                                }}
-                            }}
-                        }}
-                    }},
-                    scales: {{
-                        y: {{
+                                }
+                            }
+                        }
+                    },
+                    scales: {
+                        y: {
                             beginAtZero: true,
-                            grid: {{
+                            grid: {
                                 color: 'rgba(0, 0, 0, 0.06)',
                                 drawBorder: false
-                            }},
-                            ticks: {{
-                                font: {{
+                            },
+                            ticks: {
+                                font: {
                                     size: 12,
                                     family: 'Inter'
-                                }},
+                                },
                                 color: '#6e6e73',
-                                callback: function(value) {{
+                                callback: function(value) {
                                     return value.toLocaleString();
-                                }}
-                            }}
-                        }},
-                        x: {{
-                            grid: {{
+                                }
+                            }
+                        },
+                        x: {
+                            type: 'linear',
+                            min: points.length ? points[0].offset : 0,
+                            max: points.length ? points[points.length - 1].offset : 0,
+                            grid: {
                                 display: false,
                                 drawBorder: false
-                            }},
-                            ticks: {{
-                                font: {{
+                            },
+                            ticks: {
+                                font: {
                                     size: 12,
                                     family: 'Inter'
-                                }},
+                                },
                                 color: '#6e6e73',
+                                precision: 0,
                                 maxRotation: 45,
-                                minRotation: 0
-                            }}
-                        }}
-                    }},
-                    animation: {{
+                                minRotation: 0,
+                                callback: function(value) {
+                                    return offsetLabel(view, value);
+                                }
+                            }
+                        }
+                    },
+                    animation: {
                         duration: 750,
                         easing: 'easeInOutQuart'
-                    }}
-                }}
-            }});
-        }}
+                    }
+                }
+            });
+        }
 
         // Initialize chart on load if data is available
-        window.addEventListener('load', () => {{
-            if (dailyData.length > 0) {{
+        window.addEventListener('load', () => {
+            if (encodedData.daily.values.length > 0) {
                 showChart('daily');
-            }}
-        }});
-    </script>
-</body>
-</html>"""
+            }
+        });
+    </script>"""
 
-    return html
+CHARTJS_SCRIPT_SEGMENTS = compile_template(CHARTJS_SCRIPT_TEMPLATE)
 
-def main():
-    if len(sys.argv) < 4:
-        print("Usage: python generate_stylish_proof.py <package-name> <start-date> <end-date>")
-        print("\nExample:")
-        print("  python generate_stylish_proof.py mcp-server-kubernetes 2025-11-27 2025-12-03")
-        print("\nThis generates a beautiful, Apple-style proof document with:")
-        print("  - Clean white and light gray design")
-        print("  - Smooth animations")
-        print("  - Interactive charts (daily/weekly/monthly)")
-        print("  - Professional appearance")
-        sys.exit(1)
+# With server-side SVG charts the page only has to switch between them
+SVG_SCRIPT = """    <script>
+        function showChart(view, clickEvent) {
+            document.querySelectorAll('.chart-tab').forEach(tab => {
+                tab.classList.remove('active');
+            });
+            if (clickEvent && clickEvent.target) {
+                clickEvent.target.classList.add('active');
+            }
+            ['daily', 'weekly', 'monthly'].forEach(name => {
+                const chart = document.getElementById('chart-' + name);
+                if (chart) {
+                    chart.style.display = name === view ? '' : 'none';
+                }
+            });
+        }
+    </script>"""
+
+WEEKLY_CARD_TEMPLATE = '<div class="stat-card"><div class="stat-label">This Week</div><div class="stat-value">{last_week:,}</div>'
+GROWTH_TEMPLATE = '<div style="font-size: 14px; color: {color}; margin-top: 8px; font-weight: 500;">{growth_rate:+.1f}% vs last week</div>'
+TRENDS_ROW_TEMPLATE = '<div class="info-row"><span class="info-label">{label}</span><span class="info-value">{value}</span></div>'
+CHANGE_TEMPLATE = '<span style="color: {color};">{rate:+.1f}%</span> {baseline}'
+
+def render_trends_card(latest):
+    """Info card with the rolling totals and growth rates of the last day, or ''"""
+    rows = []
+    for label, total_key, change_key, baseline in SUMMARY_ROWS:
+        total = latest[total_key] if total_key else None
+        rate = latest[change_key] if change_key else None
+        parts = []
+        if total is not None:
+            parts.append(f"{total:,}")
+        if rate is not None:
+            color = "#34c759" if rate > 0 else "#ff3b30"
+            parts.append(CHANGE_TEMPLATE.format(color=color, rate=rate, baseline=baseline))
+        if parts:
+            rows.append(TRENDS_ROW_TEMPLATE.format(label=label, value=' · '.join(parts)))
+    if not rows:
+        return ''
+    return (f'<div class="info-card"><h3>Rolling Trends to {latest["day"]}</h3>'
+            + ''.join(rows) + '</div>')
+
+STARS_CARD_TEMPLATE = '<div class="stat-card"><div class="stat-label">GitHub Stars</div><div class="stat-value" style="font-size: 36px;">⭐ {github_stars:,}</div></div>'
+
+def generate_html_report(package_name, start_date, end_date, data, range_data=None, github_stars=None, weekly_growth=None,
+                         max_points=MAX_CHART_POINTS, svg_charts=False):
+    """Generate beautiful Apple-style HTML proof document
+
+    Each chart view plots at most max_points points (0 plots everything);
+    weekly and monthly totals are aggregated from the full daily data.
+    With svg_charts the charts are rendered here as inline SVG and the page
+    loads nothing from the network.
+    """
 
-    package_name = sys.argv[1]
-    start_date = sys.argv[2]
-    end_date = sys.argv[3]
+    downloads = data['downloads']
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')
+    with span('hash'):
+        verification_hash = generate_verification_hash(package_name, start_date, end_date, downloads, timestamp)
+    verification_url = f"https://api.npmjs.org/downloads/point/{start_date}:{end_date}/{package_name}"
+    npm_package_url = f"https://www.npmjs.com/package/{package_name}"
+    github_repo = f"https://github.com/Flux159/{package_name}"
 
-    print(f"Fetching download statistics for {package_name}...")
-    print(f"Period: {start_date} to {end_date}\n")
+    # Prepare chart data
+    daily_data = range_data.get('downloads', []) if range_data else []
+    with span('aggregate', days=len(daily_data)):
+        series = as_series(daily_data)
+        weekly_totals = series.weekly_totals()
+        monthly_totals = series.monthly_totals()
+        latest_trends = RollingWindows(series).latest() if len(series) else None
+
+    # Stat cards that only appear when their data is available
+    weekly_card = ''
+    if weekly_growth:
+        weekly_card = WEEKLY_CARD_TEMPLATE.format(last_week=weekly_growth['last_week'])
+        if 'growth_rate' in weekly_growth:
+            color = "#34c759" if weekly_growth.get("growth_rate", 0) > 0 else "#ff3b30"
+            weekly_card += GROWTH_TEMPLATE.format(color=color, growth_rate=weekly_growth["growth_rate"])
+        weekly_card += '</div>'
+    stars_card = STARS_CARD_TEMPLATE.format(github_stars=github_stars) if github_stars else ''
+    trends_card = render_trends_card(latest_trends) if latest_trends else ''
+
+    with span('encode_charts'):
+        charts = {
+            'daily': encode_daily_chart(series, max_points),
+            'weekly': encode_weekly_chart(weekly_totals, max_points),
+            'monthly': encode_monthly_chart(monthly_totals, max_points)
+        }
+
+    with span('render', svg=svg_charts):
+        if svg_charts:
+            head_assets = ''
+            chart_body = ''.join(
+                render_line_chart(*expand_chart(view, encoded), element_id=f"chart-{view}", hidden=view != 'daily')
+                for view, encoded in charts.items() if encoded['values']
+            )
+            chart_script = SVG_SCRIPT
+        else:
+            head_assets = CHARTJS_ASSETS
+            chart_body = '<canvas id="downloadChart"></canvas>'
+            # Compact chart data, expanded by the page's JavaScript
+            chart_script = render_template(CHARTJS_SCRIPT_SEGMENTS, {
+                'daily_json': chart_json(charts['daily']),
+                'weekly_json': chart_json(charts['weekly']),
+                'monthly_json': chart_json(charts['monthly'])
+            })
 
-    # Fetch summary data
-    data = fetch_downloads(package_name, start_date, end_date)
+        return render_template(REPORT_SEGMENTS, {
+            'head_assets': head_assets,
+            'package_name': package_name,
+            'downloads': f"{downloads:,}",
+            'weekly_card': weekly_card,
+            'stars_card': stars_card,
+            'trends_card': trends_card,
+            'data_start': data['start'],
+            'data_end': data['end'],
+            'chart_display': 'block' if daily_data else 'none',
+            'weekly_tab_display': 'inline-block' if len(weekly_totals) > 1 else 'none',
+            'monthly_tab_display': 'inline-block' if len(monthly_totals) > 1 else 'none',
+            'timestamp': timestamp,
+            'verification_hash': verification_hash,
+            'npm_package_url': npm_package_url,
+            'github_repo': github_repo,
+            'verification_url': verification_url,
+            'chart_body': chart_body,
+            'chart_script': chart_script
+        })
 
-    if not data:
-        print("❌ Failed to fetch download statistics.")
-        sys.exit(1)
+# Seconds to wait for the npm download counts, and for GitHub stars, from the
+# moment the fetches start. A proof without stars is rendered rather than held up.
+FETCH_DEADLINE = 120
+STARS_DEADLINE = float(os.environ.get('NPM_PROOF_STARS_DEADLINE', '3'))
 
-    print(f"✓ Successfully fetched summary: {data['downloads']:,} downloads")
+def start_fetch(stage, fetch, *args):
+    """Run fetch(*args) on a daemon thread and return a Future for its result
 
-    # Fetch detailed range data for charts
-    print("Fetching detailed data for charts...")
-    range_data = fetch_range_data(package_name, start_date, end_date)
+    Daemon threads never hold up exit, so a fetch that misses its deadline is
+    simply abandoned.
+    """
+    future = Future()
 
-    if range_data:
-        print(f"✓ Successfully fetched {len(range_data.get('downloads', []))} days of data")
-    else:
-        print("⚠ Could not fetch detailed data, proceeding without charts")
+    def run():
+        try:
+            with span(stage):
+                future.set_result(fetch(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name=stage, daemon=True).start()
+    return future
+
+def wait_for(future, deadline):
+    """Result of a fetch, or None if it has not finished by deadline (a time.monotonic() value)"""
+    try:
+        return future.result(timeout=max(0.0, deadline - time.monotonic()))
+    except FetchTimeout:
+        return None
 
-    # Fetch GitHub stars
+def generate_package_proof(package_name, start_date, end_date, max_points=MAX_CHART_POINTS, svg_charts=False):
+    """Fetch one package's data and save its stylish proof; returns the filename or None
+
+    The npm summary, the daily series and the GitHub stars are fetched at the
+    same time, so a proof costs about as long as the slowest of them.
+    """
+    print(f"Fetching download statistics for {package_name}...")
+    print(f"Period: {start_date} to {end_date}\n")
+
+    started = time.monotonic()
     github_url = f"https://github.com/Flux159/{package_name}"
-    print("Fetching GitHub stars...")
-    github_stars = fetch_github_stars(github_url)
+    stars_future = start_fetch('fetch_stars', fetch_github_stars, github_url)
+
+    with span('series_file'):
+        series = get_series_store().series(package_name, start_date, end_date)
+    if series is not None:
+        # Closed days already in a local series file: read them in place
+        data = {'downloads': series.total(), 'start': start_date, 'end': end_date, 'package': package_name}
+        range_data = dict(data, downloads=series)
+        print(f"✓ Read {len(series)} days from the local series file: {data['downloads']:,} downloads")
+    else:
+        # Both come out of the daily store, which fetches the missing days once
+        summary_future = start_fetch('fetch_summary', fetch_downloads, package_name, start_date, end_date)
+        range_future = start_fetch('fetch_range', fetch_range_data, package_name, start_date, end_date)
+
+        data = wait_for(summary_future, started + FETCH_DEADLINE)
+        if not data:
+            if not summary_future.done():
+                print(f"❌ No download statistics after {FETCH_DEADLINE}s.")
+            else:
+                print("❌ Failed to fetch download statistics.")
+            return None
+
+        print(f"✓ Successfully fetched summary: {data['downloads']:,} downloads")
+
+        range_data = wait_for(range_future, started + FETCH_DEADLINE)
+        if range_data:
+            print(f"✓ Successfully fetched {len(range_data.get('downloads', []))} days of data")
+        else:
+            print("⚠ Could not fetch detailed data, proceeding without charts")
+
+    github_stars = wait_for(stars_future, started + STARS_DEADLINE)
     if github_stars:
         print(f"✓ GitHub Stars: {github_stars:,}")
+    elif not stars_future.done():
+        print(f"⚠ GitHub did not answer within {STARS_DEADLINE:g}s, leaving out stars")
 
     # Calculate weekly growth
     weekly_growth = None
     if range_data and 'downloads' in range_data:
-        weekly_growth = calculate_weekly_growth(range_data['downloads'])
+        with span('weekly_growth'):
+            weekly_growth = calculate_weekly_growth(range_data['downloads'])
         if weekly_growth and 'growth_rate' in weekly_growth:
             print(f"✓ Weekly Growth: {weekly_growth['growth_rate']:+.1f}%")
 
     print()
 
     # Generate HTML report
-    html_content = generate_html_report(package_name, start_date, end_date, data, range_data, github_stars, weekly_growth)
+    html_content = generate_html_report(package_name, start_date, end_date, data, range_data, github_stars, weekly_growth,
+                                        max_points, svg_charts)
 
     # Save to file
-    output_filename = f"stylish_proof_{package_name}_{start_date}_to_{end_date}.html"
-    with open(output_filename, 'w', encoding='utf-8') as f:
+    output_filename = f"stylish_proof_{filename_part(package_name)}_{start_date}_to_{end_date}.html"
+    with span('write', bytes=len(html_content)), open(output_filename, 'w', encoding='utf-8') as f:
         f.write(html_content)
 
     print(f"✓ Beautiful proof document generated: {output_filename}")
+    return output_filename
+
+def main():
+    profile_from_argv()
+    args = sys.argv[1:]
+    max_points = MAX_CHART_POINTS
+    if '--max-points' in args:
+        flag = args.index('--max-points')
+        max_points = int(args[flag + 1])
+        del args[flag:flag + 2]
+    svg_charts = '--svg' in args
+    if svg_charts:
+        args.remove('--svg')
+
+    if len(args) < 3:
+        print("Usage: python generate_stylish_proof.py <package-name>[,<package-name>...] <start-date> <end-date> [--max-points N] [--svg] [--profile]")
+        print("\nExample:")
+        print("  python generate_stylish_proof.py mcp-server-kubernetes 2025-11-27 2025-12-03")
+        print("\nThis generates a beautiful, Apple-style proof document with:")
+        print("  - Clean white and light gray design")
+        print("  - Smooth animations")
+        print("  - Interactive charts (daily/weekly/monthly)")
+        print("  - Professional appearance")
+        print("\nSeveral comma-separated packages are fetched with bulk requests,")
+        print("one proof per package.")
+        print(f"\nLong series are downsampled to --max-points chart points per view (default {MAX_CHART_POINTS},")
+        print("0 plots every day); totals always cover every day.")
+        print("\n--svg renders the charts as inline SVG: the proof is self-contained and")
+        print("opens or prints without loading Chart.js or web fonts.")
+        print("\n--profile times each stage and writes a Chrome trace (chrome://tracing).")
+        sys.exit(1)
+
+    package_names = parse_package_names(args[0])
+    start_date = args[1]
+    end_date = args[2]
+
+    prefetch_packages(package_names, start_date, end_date)
+
+    failed = []
+    for package_name in package_names:
+        try:
+            with span('proof', package=package_name):
+                generated = generate_package_proof(package_name, start_date, end_date, max_points, svg_charts)
+        except OSError as e:
+            print(f"❌ Could not write the proof: {e}")
+            generated = None
+        if not generated:
+            failed.append(package_name)
+        if len(package_names) > 1:
+            print()
+
+    if len(failed) == len(package_names):
+        sys.exit(1)
+
     print("\nFeatures:")
     print("  - Apple-style design with clean white and gray colors")
     print("  - Interactive charts showing download trends")
@@ -897,5 +1203,9 @@ def main():
     print("  2. Save as PDF (File > Print > Save as PDF)")
     print("  3. Submit as proof!")
 
+    if failed:
+        print(f"\n✗ Failed for {len(failed)} packages: {', '.join(failed)}")
+        sys.exit(1)
+
 if __name__ == "__main__":
     main()
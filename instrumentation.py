@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+
+"""
+Timing spans and counters shared by the command-line scripts
+Stages are wrapped in span() blocks and notable events counted with count().
+Nothing is recorded until profiling is enabled (the scripts' --profile flag).
+At exit the spans are written as a Chrome trace, which chrome://tracing or
+Perfetto can open, and a p50/p99 summary per stage is printed.
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import threading
+from datetime import datetime
+
+_enabled = False
+_events = []
+_counters = {}
+_threads = {}
+_lock = threading.Lock()
+_origin = time.perf_counter_ns()
+
+class Span:
+    """A timed stage; set() attaches details known only once it has run"""
+
+    __slots__ = ('name', 'args', 'start')
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.start = 0
+
+    def set(self, **args):
+        self.args.update(args)
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        thread = threading.current_thread()
+        with _lock:
+            _threads[thread.ident] = thread.name
+            _events.append((self.name, self.start, end, thread.ident, self.args))
+        return False
+
+class _NullSpan:
+    """Stand-in returned while profiling is off, so spans cost next to nothing"""
+
+    def set(self, **args):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+def enabled():
+    return _enabled
+
+def enable():
+    global _enabled
+    _enabled = True
+
+def span(name, **args):
+    """Context manager timing one stage, e.g. `with span('render'):`"""
+    if not _enabled:
+        return _NULL_SPAN
+    return Span(name, args)
+
+def count(name, amount=1):
+    """Add to a counter such as bytes received or cache hits"""
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+def counters():
+    with _lock:
+        return dict(_counters)
+
+def trace_events():
+    """Recorded spans as Chrome trace events, timestamps in microseconds"""
+    pid = os.getpid()
+    with _lock:
+        events = list(_events)
+        threads = dict(_threads)
+
+    trace = [
+        {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+        for tid, name in threads.items()
+    ]
+    for name, start, end, tid, args in events:
+        trace.append({
+            'name': name,
+            'cat': 'stage',
+            'ph': 'X',
+            'ts': (start - _origin) / 1000,
+            'dur': (end - start) / 1000,
+            'pid': pid,
+            'tid': tid,
+            'args': args
+        })
+    return trace
+
+def write_trace(path):
+    """Write the Chrome trace JSON; counters go in otherData"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'traceEvents': trace_events(),
+            'displayTimeUnit': 'ms',
+            'otherData': {'command': ' '.join(sys.argv), 'counters': counters()}
+        }, f)
+
+def stage_summary():
+    """{stage: (count, total ms, p50 ms, p99 ms)} over every recorded span"""
+    durations = {}
+    with _lock:
+        for name, start, end, _, _ in _events:
+            durations.setdefault(name, []).append((end - start) / 1e6)
+
+    summary = {}
+    for name, values in durations.items():
+        values.sort()
+        n = len(values)
+        summary[name] = (n, sum(values), values[n // 2], values[min(n - 1, int(n * 0.99))])
+    return summary
+
+def print_summary(trace_path=None):
+    print()
+    print("=" * 70)
+    print("PROFILE" + (f" (trace: {trace_path})" if trace_path else ""))
+    print("=" * 70)
+    print(f"{'Stage':<24} {'Count':>7} {'Total ms':>12} {'p50 ms':>10} {'p99 ms':>10}")
+    print("-" * 70)
+    for name, (n, total, p50, p99) in sorted(stage_summary().items(), key=lambda item: -item[1][1]):
+        print(f"{name:<24} {n:>7} {total:>12.2f} {p50:>10.3f} {p99:>10.3f}")
+    print("-" * 70)
+    for name, value in sorted(counters().items()):
+        print(f"{name:<24} {value:>16,}")
+
+def default_trace_path():
+    script = os.path.splitext(os.path.basename(sys.argv[0]))[0] or 'python'
+    return f"profile_{script}_{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+
+def profile_from_argv(argv=None):
+    """Consume a --profile flag from argv (sys.argv by default) and enable profiling
+
+    The trace is written and the summary printed when the script exits,
+    including through sys.exit(). Returns True if profiling was requested.
+    """
+    argv = sys.argv if argv is None else argv
+    if '--profile' not in argv:
+        return False
+    argv.remove('--profile')
+    enable()
+    atexit.register(finish)
+    return True
+
+def finish(trace_path=None):
+    """Write the trace and print the per-stage summary"""
+    trace_path = trace_path or default_trace_path()
+    write_trace(trace_path)
+    print_summary(trace_path)
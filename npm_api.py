@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+
+"""
+Shared client for the NPM Registry and GitHub APIs
+Keeps a pool of persistent HTTP/1.1 connections per host so repeated
+requests skip the TCP+TLS handshake
+"""
+
+import os
+import ssl
+import json
+import threading
+import http.client
+from datetime import date, timedelta
+from urllib.parse import quote, urlsplit
+from concurrent.futures import ThreadPoolExecutor
+
+from instrumentation import count, span
+from rate_limit import RequestScheduler
+from response_cache import NPM_API_BASE, get_cache, get_metadata_cache
+from daily_store import DailyStore, PackageIndex
+from series_store import get_series_store
+
+GITHUB_API_BASE = os.environ.get('GITHUB_API_BASE', 'https://api.github.com')
+# Optional: authenticated requests get 5,000 GitHub API calls an hour instead of 60
+GITHUB_TOKEN = os.environ.get('GITHUB_TOKEN') or os.environ.get('GH_TOKEN')
+
+USER_AGENT = 'npm-download-proof'
+DEFAULT_TIMEOUT = 30
+MAX_CONNECTIONS_PER_HOST = 8
+
+# npm rejects /downloads/range windows longer than about 18 months
+MAX_RANGE_DAYS = 540
+
+# Bulk (comma-separated) queries take at most 128 unscoped packages and 365 days
+MAX_BULK_PACKAGES = 128
+MAX_BULK_RANGE_DAYS = 365
+
+class ApiError(Exception):
+    """Raised when an API request returns a non-success status"""
+
+    def __init__(self, code, reason, url=None):
+        super().__init__(f"HTTP Error {code}: {reason}")
+        self.code = code
+        self.reason = reason
+        self.url = url
+
+class ConnectionPool:
+    """Pool of keep-alive connections to a single host"""
+
+    def __init__(self, scheme, host, port, maxsize=MAX_CONNECTIONS_PER_HOST, timeout=DEFAULT_TIMEOUT):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._idle = []
+        self._lock = threading.Lock()
+        self._ssl_context = ssl.create_default_context() if scheme == 'https' else None
+
+    def _new_connection(self):
+        if self.scheme == 'https':
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout,
+                                               context=self._ssl_context)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _checkout(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        return self._new_connection(), False
+
+    def _checkin(self, conn):
+        with self._lock:
+            if len(self._idle) < self.maxsize:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def request(self, method, path, headers=None):
+        """Send a request and return (status, reason, headers, body); header names are lowercase"""
+        conn, reused = self._checkout()
+        try:
+            conn.request(method, path, headers=headers or {})
+            response = conn.getresponse()
+            body = response.read()
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            if not reused:
+                raise
+            # The server closed an idle keep-alive connection; retry once on a fresh one
+            conn = self._new_connection()
+            try:
+                conn.request(method, path, headers=headers or {})
+                response = conn.getresponse()
+                body = response.read()
+            except Exception:
+                conn.close()
+                raise
+
+        if response.will_close:
+            conn.close()
+        else:
+            self._checkin(conn)
+
+        headers = {name.lower(): value for name, value in response.getheaders()}
+        return response.status, response.reason, headers, body
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+class HttpClient:
+    """HTTP client that keeps one connection pool per host
+
+    Requests go through a RequestScheduler, which rate-limits each host and
+    retries throttled or transient failures.
+    """
+
+    def __init__(self, maxsize=MAX_CONNECTIONS_PER_HOST, timeout=DEFAULT_TIMEOUT, scheduler=None):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.scheduler = scheduler or RequestScheduler()
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    def _pool_for(self, scheme, host, port):
+        key = (scheme, host, port)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(scheme, host, port, self.maxsize, self.timeout)
+                self._pools[key] = pool
+            return pool
+
+    def get(self, url, headers=None):
+        """GET a URL and return (status, reason, headers, body)"""
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+
+        request_headers = {'User-Agent': USER_AGENT, 'Accept': 'application/json'}
+        if headers:
+            request_headers.update(headers)
+
+        pool = self._pool_for(parts.scheme, parts.hostname, port)
+        with span('http', host=parts.hostname, path=path) as request_span:
+            response = self.scheduler.execute(parts.hostname,
+                                              lambda: pool.request('GET', path, request_headers))
+            request_span.set(status=response[0], bytes=len(response[3]))
+        count('http_requests')
+        count('bytes_received', len(response[3]))
+        return response
+
+    def get_json(self, url, headers=None):
+        """GET a URL and decode its JSON body, raising ApiError on failure"""
+        status, reason, _, body = self.get(url, headers)
+        if status >= 400:
+            raise ApiError(status, reason, url)
+        with span('json_decode', bytes=len(body)):
+            return json.loads(body.decode())
+
+    def close(self):
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.close()
+
+_client = HttpClient()
+
+def get_client():
+    """Return the process-wide shared client"""
+    return _client
+
+def get_scheduler():
+    """Return the shared client's scheduler, e.g. to read its counters"""
+    return _client.scheduler
+
+def get_json(url, headers=None):
+    """GET a URL through the shared client and decode its JSON body"""
+    return _client.get_json(url, headers)
+
+def point_url(package_name, start_date, end_date):
+    """Build the /downloads/point URL for a period"""
+    return f"{NPM_API_BASE}/downloads/point/{start_date}:{end_date}/{package_name}"
+
+def range_url(package_name, start_date, end_date):
+    """Build the /downloads/range URL for a period"""
+    return f"{NPM_API_BASE}/downloads/range/{start_date}:{end_date}/{package_name}"
+
+def get_downloads(endpoint, package_name, start_date, end_date):
+    """Fetch a /downloads/{endpoint} response, served from the disk cache when possible"""
+    cache = get_cache()
+    if cache:
+        data = cache.get(endpoint, package_name, start_date, end_date)
+        if data is not None:
+            return data
+
+    if endpoint == 'point':
+        url = point_url(package_name, start_date, end_date)
+    else:
+        url = range_url(package_name, start_date, end_date)
+
+    data = get_json(url)
+    if cache and 'downloads' in data:
+        cache.put(endpoint, package_name, start_date, end_date, data)
+    return data
+
+def split_period(start_date, end_date, max_days=MAX_RANGE_DAYS):
+    """Split a period into consecutive (start, end) chunks of at most max_days days"""
+    start = date.fromisoformat(start_date)
+    end = date.fromisoformat(end_date)
+    chunks = []
+    while start <= end:
+        chunk_end = min(start + timedelta(days=max_days - 1), end)
+        chunks.append((start.isoformat(), chunk_end.isoformat()))
+        start = chunk_end + timedelta(days=1)
+    return chunks
+
+def get_range(package_name, start_date, end_date):
+    """Fetch a /downloads/range response, chunking windows past the npm limit
+
+    Chunks are fetched concurrently and their daily arrays merged in order.
+    """
+    try:
+        chunks = split_period(start_date, end_date)
+    except ValueError:
+        chunks = []
+    if len(chunks) <= 1:
+        return get_downloads('range', package_name, start_date, end_date)
+
+    workers = min(len(chunks), MAX_CONNECTIONS_PER_HOST)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        responses = list(executor.map(
+            lambda chunk: get_downloads('range', package_name, chunk[0], chunk[1]), chunks
+        ))
+
+    by_day = {}
+    for response in responses:
+        if 'downloads' not in response:
+            return response
+        for entry in response['downloads']:
+            by_day[entry['day']] = entry
+
+    return {
+        'start': responses[0].get('start', start_date),
+        'end': responses[-1].get('end', end_date),
+        'package': responses[0].get('package', package_name),
+        'downloads': [by_day[day] for day in sorted(by_day)]
+    }
+
+def parse_package_names(argument):
+    """Split a comma-separated package argument into unique names, in order"""
+    names = []
+    for name in argument.split(','):
+        name = name.strip()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+def is_scoped(package_name):
+    """Scoped packages (@scope/name) cannot be used in bulk queries"""
+    return package_name.startswith('@')
+
+def filename_part(package_name):
+    """A package name usable inside a file name; the slash of a scoped name is quoted"""
+    return quote(package_name, safe='@')
+
+def get_bulk_range(package_names, start_date, end_date):
+    """Fetch /downloads/range for many packages; returns {package: response}
+
+    Unscoped packages are packed into comma-separated bulk requests of up to
+    128 names and 365 days each; scoped packages fall back to single requests.
+    All requests run concurrently and each package's chunks are merged by day.
+    """
+    unscoped = [p for p in package_names if not is_scoped(p)]
+    batches = [unscoped[i:i + MAX_BULK_PACKAGES] for i in range(0, len(unscoped), MAX_BULK_PACKAGES)]
+    chunks = split_period(start_date, end_date, MAX_BULK_RANGE_DAYS)
+
+    jobs = []
+    for batch in batches:
+        if len(batch) == 1:
+            # A single name is answered in the non-bulk shape
+            jobs.append(batch)
+        else:
+            jobs.extend((batch, chunk) for chunk in chunks)
+    jobs.extend([p] for p in package_names if is_scoped(p))
+
+    def run(job):
+        if isinstance(job, list):
+            package_name = job[0]
+            return {package_name: get_range(package_name, start_date, end_date)}
+        batch, (chunk_start, chunk_end) = job
+        url = range_url(','.join(batch), chunk_start, chunk_end)
+        return get_json(url)
+
+    def run_safely(job):
+        try:
+            return run(job)
+        except Exception as e:
+            names = job if isinstance(job, list) else job[0]
+            return {name: {'error': str(e)} for name in names}
+
+    workers = max(1, min(len(jobs), MAX_CONNECTIONS_PER_HOST))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        responses = list(executor.map(run_safely, jobs))
+
+    merged = {}
+    errors = {}
+    for response in responses:
+        for package_name, data in response.items():
+            if not data or 'downloads' not in data:
+                errors[package_name] = data or {'error': f"package {package_name} not found"}
+                continue
+            entry = merged.setdefault(package_name, {
+                'start': start_date, 'end': end_date, 'package': package_name, 'days': {}
+            })
+            for day in data['downloads']:
+                entry['days'][day['day']] = day
+
+    results = dict(errors)
+    for package_name, entry in merged.items():
+        if package_name in errors:
+            continue
+        days = entry.pop('days')
+        entry['downloads'] = [days[day] for day in sorted(days)]
+        results[package_name] = entry
+    return results
+
+def prefetch_packages(package_names, start_date, end_date):
+    """Warm the daily store for several packages with bulk requests
+
+    Failures are left for the per-package fetch to report.
+    """
+    if len(package_names) < 2:
+        return
+    try:
+        get_store().prefetch_many(package_names, start_date, end_date)
+    except Exception:
+        pass
+
+def fetch_downloads_bulk(package_names, start_date, end_date):
+    """Fetch download totals for many packages; returns {package: data or None}"""
+    prefetch_packages(package_names, start_date, end_date)
+    return {name: fetch_downloads(name, start_date, end_date) for name in package_names}
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store():
+    """Return the process-wide daily store, opening it on first use"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = DailyStore(get_range, get_bulk_range)
+        return _store
+
+def fetch_downloads(package_name, start_date, end_date):
+    """Fetch download statistics from npm registry"""
+    try:
+        data = get_store().point_data(package_name, start_date, end_date)
+        return data if 'downloads' in data else None
+    except Exception as e:
+        print(f"Error fetching data: {str(e)}")
+        return None
+
+def fetch_range_data(package_name, start_date, end_date):
+    """Fetch daily download data for charts"""
+    try:
+        data = get_store().range_data(package_name, start_date, end_date)
+        return data if 'downloads' in data else None
+    except Exception:
+        return None
+
+def parse_period(start_date, end_date):
+    """(start, end) dates of a period; raises ValueError naming what is wrong with it"""
+    try:
+        start = date.fromisoformat(start_date)
+        end = date.fromisoformat(end_date)
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid period {start_date} to {end_date} (dates must be YYYY-MM-DD)")
+    if start > end:
+        raise ValueError("start date is after end date")
+    return start, end
+
+def valid_periods(ranges):
+    """(start, end) dates of the (label, start, end) ranges that are valid periods"""
+    periods = []
+    for _, start_date, end_date in ranges:
+        try:
+            periods.append(parse_period(start_date, end_date))
+        except ValueError:
+            pass
+    return periods
+
+def fetch_batch_series(package_name, ranges):
+    """Fetch one daily series covering every range and index it for slicing
+
+    Returns (index, error); the index answers any period total with prefix sums.
+    Invalid ranges are left out, for the caller to report one by one. A
+    memory-mapped series file that covers every range is used as-is.
+    """
+    valid = valid_periods(ranges)
+    if not valid:
+        return None, None
+
+    union_start = min(start for start, _ in valid).isoformat()
+    union_end = max(end for _, end in valid).isoformat()
+
+    try:
+        series_file = get_series_store().open(package_name)
+    except (OSError, ValueError):
+        series_file = None
+    if series_file is not None and series_file.covers(date.fromisoformat(union_start).toordinal(),
+                                                      date.fromisoformat(union_end).toordinal()):
+        return series_file, None
+
+    try:
+        range_data = get_store().range_data(package_name, union_start, union_end)
+    except Exception as e:
+        return None, str(e)
+
+    if 'downloads' not in range_data:
+        return None, range_data.get('error', 'no download data returned')
+
+    return PackageIndex([(d['day'], d['downloads']) for d in range_data['downloads']]), None
+
+def fetch_github_repo(owner, repo):
+    """Fetch a repository's metadata, reusing the disk copy whenever GitHub allows
+
+    A recent copy is returned without a request. An older one is revalidated
+    with If-None-Match / If-Modified-Since; GitHub's 304 answer does not count
+    against the rate limit. If GitHub refuses (e.g. the hourly quota is used
+    up) the last known copy is returned rather than nothing.
+    """
+    api_url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}"
+    cache = get_metadata_cache()
+    entry = cache.get(api_url) if cache else None
+    if entry and cache.is_fresh(entry):
+        count('github_cache_hits')
+        return entry['data']
+
+    headers = {'Accept': 'application/vnd.github.v3+json'}
+    if GITHUB_TOKEN:
+        headers['Authorization'] = f"Bearer {GITHUB_TOKEN}"
+    if entry and entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry and entry.get('last_modified'):
+        headers['If-Modified-Since'] = entry['last_modified']
+
+    status, reason, response_headers, body = _client.get(api_url, headers)
+    if status == 304 and entry:
+        count('github_not_modified')
+        cache.renew(api_url, entry)
+        return entry['data']
+    if status >= 400:
+        if entry:
+            count('github_stale')
+            return entry['data']
+        raise ApiError(status, reason, api_url)
+
+    data = json.loads(body.decode())
+    if cache:
+        cache.put(api_url, data, response_headers.get('etag'), response_headers.get('last-modified'))
+    return data
+
+def fetch_github_stars(github_url):
+    """Fetch GitHub stars count"""
+    try:
+        # Extract owner and repo from URL
+        parts = github_url.replace('https://github.com/', '').split('/')
+        if len(parts) >= 2:
+            owner, repo = parts[0], parts[1]
+            repo_data = fetch_github_repo(owner, repo)
+            return repo_data.get('stargazers_count', 0)
+    except ApiError as e:
+        print(f"Could not fetch GitHub stars: {str(e)}")
+        if e.code == 403 and not GITHUB_TOKEN:
+            print("  GitHub allows 60 anonymous requests an hour; set GITHUB_TOKEN to raise the limit")
+        return None
+    except Exception as e:
+        print(f"Could not fetch GitHub stars: {str(e)}")
+        return None
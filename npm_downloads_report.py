@@ -5,22 +5,15 @@ Generate NPM package download reports with multiple date ranges
 """
 
 import sys
-import json
-import urllib.request
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 
-def fetch_downloads(package_name, start_date, end_date):
-    """Fetch download statistics from npm registry"""
-    period = f"{start_date}:{end_date}"
-    url = f"https://api.npmjs.org/downloads/point/{period}/{package_name}"
+from daily_series import DailySeries
+from instrumentation import profile_from_argv, span
+from npm_api import fetch_downloads, fetch_range_data, parse_package_names, prefetch_packages
+from rolling_windows import SUMMARY_DAYS, SUMMARY_ROWS, RollingWindows
 
-    try:
-        with urllib.request.urlopen(url) as response:
-            data = json.loads(response.read().decode())
-            return data if 'downloads' in data else None
-    except Exception as e:
-        print(f"Error fetching data: {str(e)}")
-        return None
+MAX_CONCURRENCY = 8
 
 def get_last_week():
     """Get last 7 days date range"""
@@ -40,15 +33,14 @@ def get_year_to_date():
     start = datetime(end.year, 1, 1).date()
     return str(start), str(end)
 
-def generate_report(package_name, custom_ranges=None):
-    """Generate comprehensive download report"""
-    print(f"=" * 70)
-    print(f"NPM Download Report for: {package_name}")
-    print(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"=" * 70)
-    print()
+def get_trend_window():
+    """Get the date range the rolling trends are computed from"""
+    end = datetime.now().date()
+    start = end - timedelta(days=SUMMARY_DAYS - 1)
+    return str(start), str(end)
 
-    # Default ranges
+def build_ranges(custom_ranges=None):
+    """Default report ranges followed by any custom ranges"""
     ranges = [
         ("Last 7 Days", get_last_week()),
         ("Last 30 Days", get_last_month()),
@@ -60,11 +52,62 @@ def generate_report(package_name, custom_ranges=None):
         for label, (start, end) in custom_ranges:
             ranges.append((label, (start, end)))
 
+    return ranges
+
+def fetch_all_ranges(package_name, ranges, max_concurrency=MAX_CONCURRENCY):
+    """Fetch every range concurrently; results come back in the order of ranges"""
+    def fetch_period(period):
+        with span('fetch_summary', package=package_name, start=period[0], end=period[1]):
+            return fetch_downloads(package_name, period[0], period[1])
+
+    workers = max(1, min(max_concurrency, len(ranges)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(fetch_period, [period for _, period in ranges]))
+
+def print_trends(package_name):
+    """Rolling totals and growth for the windows ending on the latest day"""
+    start_date, end_date = get_trend_window()
+    with span('fetch_range', package=package_name):
+        range_data = fetch_range_data(package_name, start_date, end_date)
+    if not range_data or not range_data['downloads']:
+        print("✗ Failed to fetch daily data for trends")
+        print()
+        return
+
+    with span('trends'):
+        latest = RollingWindows(DailySeries.from_days(range_data['downloads'])).latest()
+    print("=" * 70)
+    print(f"ROLLING TRENDS (windows ending {latest['day']})")
+    print("=" * 70)
+    print(f"{'Window':<20} {'Downloads':>15}   {'Change'}")
+    print("-" * 70)
+
+    for label, total_key, change_key, baseline in SUMMARY_ROWS:
+        total = latest[total_key] if total_key else None
+        rate = latest[change_key] if change_key else None
+        if total is None and rate is None:
+            continue
+        total_text = f"{total:,}" if total is not None else ''
+        change_text = f"{rate:+.1f}% {baseline}" if rate is not None else ''
+        print(f"{label:<20} {total_text:>15}   {change_text}".rstrip())
+
+    print("-" * 70)
+    print()
+
+def generate_report(package_name, custom_ranges=None, max_concurrency=MAX_CONCURRENCY, trends=False):
+    """Generate comprehensive download report"""
+    print(f"=" * 70)
+    print(f"NPM Download Report for: {package_name}")
+    print(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"=" * 70)
+    print()
+
+    ranges = build_ranges(custom_ranges)
+    fetched = fetch_all_ranges(package_name, ranges, max_concurrency)
     results = []
 
-    for label, (start_date, end_date) in ranges:
+    for (label, (start_date, end_date)), data in zip(ranges, fetched):
         print(f"{label} ({start_date} to {end_date}):")
-        data = fetch_downloads(package_name, start_date, end_date)
 
         if data:
             downloads = data['downloads']
@@ -91,29 +134,69 @@ def generate_report(package_name, custom_ranges=None):
         print(f"{'Note: Periods may overlap':<45} {'':>15}")
         print()
 
+    if trends:
+        print_trends(package_name)
+
+def generate_reports(package_names, custom_ranges=None, max_concurrency=MAX_CONCURRENCY, trends=False):
+    """Generate reports for several packages, fetched with bulk requests"""
+    periods = [period for _, period in build_ranges(custom_ranges) if period[0] <= period[1]]
+    if trends:
+        periods.append(get_trend_window())
+    if periods:
+        start = min(start for start, _ in periods)
+        end = max(end for _, end in periods)
+        prefetch_packages(package_names, start, end)
+
+    for package_name in package_names:
+        with span('report', package=package_name):
+            generate_report(package_name, custom_ranges, max_concurrency, trends)
+
+def usage():
+    print("Usage: python npm_downloads_report.py <package-name>[,<package-name>...] [start-date end-date label] [--concurrency N] [--trends] [--profile]")
+    print("\nExamples:")
+    print("  # Basic report with last 7 days, 30 days, and YTD")
+    print("  python npm_downloads_report.py mcp-server-kubernetes")
+    print("\n  # Report with custom date range")
+    print("  python npm_downloads_report.py mcp-server-kubernetes 2025-11-27 2025-12-03 \"Custom Week\"")
+    print("\n  # Reports for several packages, fetched with bulk requests")
+    print("  python npm_downloads_report.py mcp-server-kubernetes,express,react")
+    print("\n  # Add rolling 7/28/90-day totals with week, month and year-over-year growth")
+    print("  python npm_downloads_report.py mcp-server-kubernetes --trends")
+    print("\nAll ranges are fetched concurrently, at most --concurrency at a time (default 8).")
+    print("--profile times each stage and writes a Chrome trace (chrome://tracing).")
+    sys.exit(1)
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python npm_downloads_report.py <package-name> [start-date end-date label]")
-        print("\nExamples:")
-        print("  # Basic report with last 7 days, 30 days, and YTD")
-        print("  python npm_downloads_report.py mcp-server-kubernetes")
-        print("\n  # Report with custom date range")
-        print("  python npm_downloads_report.py mcp-server-kubernetes 2025-11-27 2025-12-03 \"Custom Week\"")
-        sys.exit(1)
-
-    package_name = sys.argv[1]
+    profile_from_argv()
+    args = sys.argv[1:]
+    max_concurrency = MAX_CONCURRENCY
+    if '--concurrency' in args:
+        flag = args.index('--concurrency')
+        value = args[flag + 1] if flag + 1 < len(args) else ''
+        if not value.isdigit() or int(value) < 1:
+            print(f"Error: --concurrency needs a positive whole number, got '{value}'\n")
+            usage()
+        max_concurrency = int(value)
+        del args[flag:flag + 2]
+    trends = '--trends' in args
+    if trends:
+        args.remove('--trends')
+    if not args:
+        usage()
+
+    package_names = parse_package_names(args[0])
     custom_ranges = []
 
     # Parse custom ranges (groups of 3 arguments: start, end, label)
-    i = 2
-    while i + 2 < len(sys.argv):
-        start_date = sys.argv[i]
-        end_date = sys.argv[i + 1]
-        label = sys.argv[i + 2]
+    i = 1
+    while i + 2 < len(args):
+        start_date = args[i]
+        end_date = args[i + 1]
+        label = args[i + 2]
         custom_ranges.append((label, (start_date, end_date)))
         i += 3
 
-    generate_report(package_name, custom_ranges if custom_ranges else None)
+    generate_reports(package_names, custom_ranges if custom_ranges else None, max_concurrency, trends)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+
+"""
+Pure-Python PDF rendering of download proofs
+Builds a single-page PDF with the standard Helvetica and Courier fonts, so no
+browser, font file or third-party library is involved. The daily chart is
+drawn as vector paths from the same layout as the SVG charts.
+"""
+
+import zlib
+
+from daily_series import MONTH_ABBREVIATIONS, DailySeries
+from downsample import MAX_CHART_POINTS, lttb_indexes
+from svg_chart import layout_chart
+
+# US Letter, in points
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+MARGIN = 40
+CONTENT_WIDTH = PAGE_WIDTH - 2 * MARGIN
+CHART_HEIGHT = 130
+
+FONTS = {'F1': 'Helvetica', 'F2': 'Helvetica-Bold', 'F3': 'Courier'}
+
+# Helvetica advance widths (1/1000 em) for ASCII 32..126, from the standard AFM
+HELVETICA_WIDTHS = [
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584
+]
+
+def text_width(text, size, font='F1'):
+    """Approximate width of text in points; exact for Helvetica digits and Courier"""
+    if font == 'F3':
+        return len(text) * 600 * size / 1000
+    total = 0
+    for char in text:
+        code = ord(char)
+        total += HELVETICA_WIDTHS[code - 32] if 32 <= code <= 126 else 556
+    scale = 1.05 if font == 'F2' else 1.0
+    return total * size * scale / 1000
+
+def wrap_text(text, width, size, font='F1'):
+    """Greedy word wrap of text into lines at most width points wide"""
+    lines = []
+    line = ''
+    for word in text.split():
+        candidate = f"{line} {word}" if line else word
+        if line and text_width(candidate, size, font) > width:
+            lines.append(line)
+            line = word
+        else:
+            line = candidate
+    if line:
+        lines.append(line)
+    return lines
+
+def rgb(color):
+    """'#cb3837' -> 'r g b' components for PDF color operators"""
+    return ' '.join(f"{int(color[i:i + 2], 16) / 255:.3f}" for i in (1, 3, 5))
+
+def pdf_string(text):
+    """Literal PDF string in WinAnsi encoding"""
+    raw = text.encode('cp1252', 'replace')
+    return '(' + raw.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)').decode('latin-1') + ')'
+
+class PdfPage:
+    """Drawing operations for one page, positioned in points from the top-left corner"""
+
+    def __init__(self, width=PAGE_WIDTH, height=PAGE_HEIGHT):
+        self.width = width
+        self.height = height
+        self.ops = []
+        self.links = []
+
+    def _y(self, y):
+        return self.height - y
+
+    def rect(self, x, y, width, height, fill=None, stroke=None, line_width=1):
+        if stroke:
+            self.ops.append(f"{line_width} w {rgb(stroke)} RG")
+        if fill:
+            self.ops.append(f"{rgb(fill)} rg")
+        paint = 'B' if fill and stroke else ('f' if fill else 'S')
+        self.ops.append(f"{x:.2f} {self._y(y + height):.2f} {width:.2f} {height:.2f} re {paint}")
+
+    def line(self, x1, y1, x2, y2, color, width=1):
+        self.ops.append(f"{width} w {rgb(color)} RG {x1:.2f} {self._y(y1):.2f} m {x2:.2f} {self._y(y2):.2f} l S")
+
+    def path(self, points, fill=None, stroke=None, line_width=1):
+        """Polyline through points; filled and closed when fill is given"""
+        if not points:
+            return
+        segments = [f"{points[0][0]:.2f} {self._y(points[0][1]):.2f} m"]
+        segments.extend(f"{x:.2f} {self._y(y):.2f} l" for x, y in points[1:])
+        if stroke:
+            self.ops.append(f"{line_width} w 1 j {rgb(stroke)} RG")
+        if fill:
+            self.ops.append(f"{rgb(fill)} rg")
+            segments.append('h f' if not stroke else 'h B')
+        else:
+            segments.append('S')
+        self.ops.append(' '.join(segments))
+
+    def text(self, x, y, text, size=10, font='F1', color='#333333', align='left'):
+        """Draw text with its baseline at y"""
+        if align != 'left':
+            width = text_width(text, size, font)
+            x -= width if align == 'right' else width / 2
+        self.ops.append(f"BT /{font} {size} Tf {rgb(color)} rg {x:.2f} {self._y(y):.2f} Td {pdf_string(text)} Tj ET")
+
+    def link(self, x, y, width, height, uri):
+        """Make a rectangle clickable, opening uri"""
+        self.links.append((x, self._y(y + height), x + width, self._y(y), uri))
+
+    def content(self):
+        return '\n'.join(self.ops).encode('latin-1')
+
+def build_pdf(page, title=''):
+    """Serialize one page as a complete PDF file"""
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(None)
+    pages = add(None)
+    page_ref = add(None)
+
+    stream = zlib.compress(page.content())
+    contents = add(b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    fonts = ' '.join(
+        f"/{name} {add(f'<< /Type /Font /Subtype /Type1 /BaseFont /{base} /Encoding /WinAnsiEncoding >>'.encode())} 0 R"
+        for name, base in FONTS.items()
+    )
+    annotations = ' '.join(
+        f"{add(f'<< /Type /Annot /Subtype /Link /Rect [{x1:.2f} {y1:.2f} {x2:.2f} {y2:.2f}] /Border [0 0 0] /A << /S /URI /URI {pdf_string(uri)} >> >>'.encode('latin-1'))} 0 R"
+        for x1, y1, x2, y2, uri in page.links
+    )
+    info = add(f"<< /Title {pdf_string(title)} /Producer (npm-download-proof) >>".encode('latin-1'))
+
+    objects[catalog - 1] = f"<< /Type /Catalog /Pages {pages} 0 R >>".encode()
+    objects[pages - 1] = f"<< /Type /Pages /Kids [{page_ref} 0 R] /Count 1 >>".encode()
+    objects[page_ref - 1] = (
+        f"<< /Type /Page /Parent {pages} 0 R /MediaBox [0 0 {page.width} {page.height}] "
+        f"/Resources << /Font << {fonts} >> >> /Contents {contents} 0 R /Annots [{annotations}] >>"
+    ).encode()
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += (f"trailer\n<< /Size {len(objects) + 1} /Root {catalog} 0 R /Info {info} 0 R >>\n"
+            f"startxref\n{xref}\n%%EOF\n").encode()
+    return bytes(out)
+
+def daily_chart_points(daily_data, max_points=MAX_CHART_POINTS):
+    """Downsampled (labels, downloads, day ordinals) of a list of {'day', 'downloads'} entries"""
+    series = DailySeries.from_days(daily_data)
+    kept = lttb_indexes(series.counts, max_points)
+    labels = []
+    ordinals = []
+    for i in kept:
+        day = series.day(i)
+        labels.append(f"{MONTH_ABBREVIATIONS[day.month]} {day.day}")
+        ordinals.append(day.toordinal())
+    return labels, [series.counts[i] for i in kept], ordinals
+
+def draw_chart(page, x, y, width, height, labels, values, positions=None):
+    """Vector line chart of values inside the box at (x, y), placed along x by positions"""
+    margins = (56, 8, 8, 22)
+    points, ticks, labelled = layout_chart(values, width, height, margins,
+                                           label_chars=max(map(len, labels), default=0), positions=positions)
+    baseline = y + height - margins[3]
+
+    for value, tick_y in ticks:
+        page.line(x + margins[0], y + tick_y, x + width - margins[2], y + tick_y, '#e6e6e6', 0.5)
+        page.text(x + margins[0] - 6, y + tick_y + 3, f"{value:,}", 8, color='#6e6e73', align='right')
+
+    for i in labelled:
+        page.text(x + points[i][0], baseline + 14, labels[i], 8, color='#6e6e73', align='center')
+
+    placed = [(x + px, y + py) for px, py in points]
+    if len(placed) > 1:
+        page.path([(placed[0][0], baseline)] + placed + [(placed[-1][0], baseline)], fill='#f1eff7')
+    page.path(placed, stroke='#667eea', line_width=1.5)
+
+def section(page, y, title, height, fill='#f8f9fa', title_color='#cb3837'):
+    """Shaded section box with a heading; returns the baseline of its first row"""
+    page.rect(MARGIN, y, CONTENT_WIDTH, height, fill=fill)
+    page.rect(MARGIN, y, 3, height, fill=title_color)
+    page.text(MARGIN + 14, y + 20, title, 12, 'F2', title_color)
+    return y + 38
+
+def info_row(page, y, label, value, font='F1'):
+    page.text(MARGIN + 14, y, label, 9, 'F2', '#555555')
+    page.text(MARGIN + 130, y, value, 9, font, '#333333')
+
+def render_proof_pdf(fields, daily_data=None):
+    """Render a proof from generate_proof.report_fields() as PDF bytes
+
+    daily_data ({'day', 'downloads'} entries) adds a daily downloads chart.
+    """
+    page = PdfPage()
+    center = PAGE_WIDTH / 2
+    y = MARGIN
+
+    page.text(center, y + 20, "NPM Download Statistics", 22, 'F2', '#cb3837', align='center')
+    page.text(center, y + 36, "Official Verification Report", 11, color='#666666', align='center')
+    page.line(MARGIN, y + 46, PAGE_WIDTH - MARGIN, y + 46, '#cb3837', 2)
+    y += 58
+
+    page.rect(MARGIN, y, CONTENT_WIDTH, 76, fill='#6a73d9')
+    page.text(center, y + 20, "TOTAL DOWNLOADS", 10, 'F2', '#ffffff', align='center')
+    page.text(center, y + 52, f"{fields['downloads']:,}", 32, 'F2', '#ffffff', align='center')
+    page.text(center, y + 68, f"{fields['start_date']} to {fields['end_date']}", 10, color='#ffffff', align='center')
+    y += 86
+
+    row = section(page, y, "Package Information", 96)
+    for label, value in [("Package Name:", fields['package_name']), ("Start Date:", fields['data_start']),
+                         ("End Date:", fields['data_end']), ("Total Downloads:", f"{fields['downloads']:,}")]:
+        info_row(page, row, label, value)
+        row += 16
+    y += 106
+
+    if daily_data:
+        labels, values, ordinals = daily_chart_points(daily_data)
+        page.rect(MARGIN, y, CONTENT_WIDTH, CHART_HEIGHT + 28, fill='#ffffff', stroke='#e0e0e0', line_width=0.5)
+        page.text(MARGIN + 14, y + 18, "Daily Downloads", 11, 'F2', '#333333')
+        draw_chart(page, MARGIN + 4, y + 24, CONTENT_WIDTH - 8, CHART_HEIGHT, labels, values, ordinals)
+        y += CHART_HEIGHT + 38
+
+    how_to = wrap_text("How to Verify: Anyone can confirm this data by visiting the API URL below or by "
+                       "using the NPM Registry's official download statistics API.", CONTENT_WIDTH - 28, 9)
+    row = section(page, y, "Verification Information", 86 + 12 * len(how_to), '#e8f5e9', '#2e7d32')
+    info_row(page, row, "Report Generated:", fields['timestamp'])
+    info_row(page, row + 16, "Data Source:", "Official NPM Registry API")
+    info_row(page, row + 32, "Verification Hash:", fields['verification_hash'], 'F3')
+    for i, line in enumerate(how_to):
+        page.text(MARGIN + 14, row + 52 + 12 * i, line, 9, color='#333333')
+    y += 96 + 12 * len(how_to)
+
+    row = section(page, y, "Official Links", 112, '#ffffff')
+    for label, url, size in [("NPM Package", fields['npm_package_url'], 9),
+                             ("API Verification URL", fields['verification_url'], 8),
+                             ("GitHub Repository", fields['github_repo'], 9)]:
+        page.text(MARGIN + 14, row, label, 9, 'F2', '#333333')
+        page.text(MARGIN + 14, row + 12, url, size, 'F3', '#1a0dab')
+        page.link(MARGIN + 14, row + 2, text_width(url, size, 'F3'), size + 2, url)
+        row += 26
+
+    footer = PAGE_HEIGHT - MARGIN
+    page.line(MARGIN, footer - 28, PAGE_WIDTH - MARGIN, footer - 28, '#dddddd', 0.5)
+    page.text(center, footer - 14, f"Generated on {fields['timestamp']}", 9, color='#666666', align='center')
+    page.text(center, footer, "Data source: NPM Registry API  |  OFFICIAL  |  VERIFIABLE", 9,
+              color='#666666', align='center')
+
+    return build_pdf(page, f"NPM Download Statistics Proof - {fields['package_name']}")
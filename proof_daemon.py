@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+
+"""
+Long-running worker for the command-line proof scripts
+Listens on a Unix domain socket and runs generate_proof.py,
+generate_json_proof.py and fetch_npm_downloads.py jobs in this process.
+Repeated invocations therefore skip interpreter startup and imports, and they
+reuse the daemon's keep-alive HTTP connections and open daily store. The
+scripts act as thin clients (daemon_client.py): they send their arguments and
+working directory, and print the output streamed back to them. Jobs run
+concurrently, each on its own connection thread.
+"""
+
+import os
+import sys
+import json
+import time
+import importlib
+import threading
+import traceback
+import socketserver
+
+from daemon_client import SOCKET_PATH, connect, environment_fingerprint, messages, send_message
+from npm_api import get_scheduler
+
+SCRIPTS = ('generate_proof', 'generate_json_proof', 'fetch_npm_downloads')
+
+# The output streams of the job running on the current thread
+job_streams = threading.local()
+
+class StreamWriter:
+    """File-like object that sends everything written to it to the client"""
+
+    def __init__(self, sock, key):
+        self.sock = sock
+        self.key = key
+        self.connected = True
+
+    def write(self, text):
+        if text and self.connected:
+            try:
+                send_message(self.sock, {self.key: text})
+            except OSError:
+                # The client went away; let the job finish anyway
+                self.connected = False
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+class ThreadStream:
+    """Stands in for sys.stdout or sys.stderr and writes to the current job's stream
+
+    Threads that are not running a job write to the stream it replaced.
+    """
+
+    def __init__(self, key, default):
+        self.key = key
+        self.default = default
+
+    def target(self):
+        return getattr(job_streams, self.key, None) or self.default
+
+    def write(self, text):
+        return self.target().write(text)
+
+    def flush(self):
+        self.target().flush()
+
+    def isatty(self):
+        return self.target().isatty()
+
+    def __getattr__(self, name):
+        return getattr(self.target(), name)
+
+def exit_status(code):
+    """Process exit status for a SystemExit code, as the interpreter maps it"""
+    if code is None:
+        return 0
+    return code if isinstance(code, int) else 1
+
+class DaemonHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return
+
+        command = request.get('command')
+        if command == 'status':
+            send_message(self.connection, self.server.status())
+            return
+        if command == 'stop':
+            send_message(self.connection, {'stopping': True})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return
+
+        script = request.get('script')
+        if script not in SCRIPTS:
+            send_message(self.connection, {'err': f"✗ Unknown script: {script}\n"})
+            send_message(self.connection, {'exit': 2})
+            return
+
+        if not self.server.same_environment(request.get('environment')):
+            # Settings such as NPM_API_BASE were read when the daemon started
+            send_message(self.connection, {'environment': 'mismatch'})
+            return
+
+        if not self.server.enter_cwd(request.get('cwd') or self.server.home):
+            # Another directory's jobs are running; the client runs this one itself
+            send_message(self.connection, {'busy': True})
+            return
+
+        started = time.perf_counter()
+        try:
+            send_message(self.connection, {'started': True})
+            status = self.server.run_job(script, request.get('argv', []), StreamWriter(self.connection, 'out'),
+                                         StreamWriter(self.connection, 'err'))
+        except OSError:
+            return
+        finally:
+            self.server.leave_cwd()
+        elapsed = time.perf_counter() - started
+        try:
+            send_message(self.connection, {'exit': status})
+        except OSError:
+            pass
+        if not self.server.quiet:
+            print(f"{script} {' '.join(request.get('argv', []))} -> {status} ({elapsed * 1000:.1f} ms)",
+                  file=self.server.log, flush=True)
+
+class ProofDaemon(socketserver.ThreadingUnixStreamServer):
+    """Runs script jobs sent over a Unix socket, concurrently
+
+    Each job gets its argv through main(argv) and its output through the
+    per-thread sys.stdout and sys.stderr. The working directory is
+    process-wide, so jobs from one directory run together and a job from
+    another directory is turned away as busy until they finish.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path=SOCKET_PATH, quiet=False):
+        self.path = os.path.abspath(path)
+        self.quiet = quiet
+        self.log = sys.stdout
+        self.home = os.getcwd()
+        self.started = time.time()
+        self.jobs = 0
+        self.failures = 0
+        self.busy = 0
+        self.mismatched = 0
+        self.environment = environment_fingerprint()
+        self.running = 0
+        self._cwd = self.home
+        self._lock = threading.Lock()
+        sys.stdout = ThreadStream('stdout', sys.stdout)
+        sys.stderr = ThreadStream('stderr', sys.stderr)
+        # Import every script up front so the first job is as fast as the rest
+        self.modules = {script: importlib.import_module(script) for script in SCRIPTS}
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        super().__init__(self.path, DaemonHandler)
+        os.chmod(self.path, 0o600)
+
+    def same_environment(self, fingerprint):
+        """True if a client's settings match the ones this daemon was started with"""
+        if fingerprint == self.environment:
+            return True
+        with self._lock:
+            self.mismatched += 1
+        return False
+
+    def enter_cwd(self, cwd):
+        """Switch to a job's working directory; False if other jobs need a different one"""
+        with self._lock:
+            if cwd != self._cwd:
+                if self.running:
+                    self.busy += 1
+                    return False
+                try:
+                    os.chdir(cwd)
+                except OSError:
+                    self.busy += 1
+                    return False
+                self._cwd = cwd
+            self.running += 1
+            return True
+
+    def leave_cwd(self):
+        with self._lock:
+            self.running -= 1
+            if not self.running and self._cwd != self.home:
+                os.chdir(self.home)
+                self._cwd = self.home
+
+    def run_job(self, script, argv, out, err):
+        """Run a script's main() as if it had been invoked with argv; returns its exit status"""
+        module = self.modules[script]
+        job_streams.stdout, job_streams.stderr = out, err
+        try:
+            module.main([module.__file__] + list(argv))
+            status = 0
+        except SystemExit as e:
+            if isinstance(e.code, str):
+                print(e.code, file=err)
+            status = exit_status(e.code)
+        except Exception:
+            traceback.print_exc(file=err)
+            status = 1
+        finally:
+            job_streams.stdout = job_streams.stderr = None
+
+        with self._lock:
+            self.jobs += 1
+            if status:
+                self.failures += 1
+        return status
+
+    def status(self):
+        return {
+            'pid': os.getpid(),
+            'socket': self.path,
+            'uptime_s': round(time.time() - self.started, 1),
+            'jobs': self.jobs,
+            'failures': self.failures,
+            'running': self.running,
+            'busy': self.busy,
+            'environment_mismatches': self.mismatched,
+            'upstream': get_scheduler().stats()
+        }
+
+    def server_close(self):
+        super().server_close()
+        sys.stdout, sys.stderr = sys.stdout.default, sys.stderr.default
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+def request_control(path, command):
+    """Send a control command to a running daemon; returns its reply or None"""
+    sock = connect(path)
+    if sock is None:
+        return None
+    with sock:
+        send_message(sock, {'command': command})
+        return next(messages(sock), None)
+
+def main():
+    args = sys.argv[1:]
+    path = SOCKET_PATH
+    if '--socket' in args:
+        flag = args.index('--socket')
+        path = args[flag + 1]
+        del args[flag:flag + 2]
+    quiet = '--quiet' in args
+    if quiet:
+        args.remove('--quiet')
+    command = args[0] if len(args) == 1 and args[0] in ('status', 'stop') else None
+
+    if args and not command:
+        print("Usage: python proof_daemon.py [--socket PATH] [--quiet] [status|stop]")
+        print("\nRuns in the foreground until stopped. While it is running,")
+        print("generate_proof.py, generate_json_proof.py and fetch_npm_downloads.py send their")
+        print("jobs to it and exit with its result; otherwise they run as usual.")
+        print(f"\nSocket: {SOCKET_PATH} (NPM_PROOF_DAEMON_SOCKET); NPM_PROOF_DAEMON=0 disables forwarding.")
+        sys.exit(1)
+
+    if command:
+        reply = request_control(path, command)
+        if reply is None:
+            print(f"✗ No proof daemon listening on {path}")
+            sys.exit(1)
+        if command == 'stop':
+            print(f"✓ Proof daemon on {path} is stopping")
+        else:
+            print(json.dumps(reply, indent=2))
+        return
+
+    if os.path.exists(path):
+        if request_control(path, 'status') is not None:
+            print(f"✗ A proof daemon is already listening on {path}")
+            sys.exit(1)
+        # Left behind by a daemon that did not shut down cleanly
+        os.unlink(path)
+
+    server = ProofDaemon(path, quiet)
+    print(f"Proof daemon listening on {path} (pid {os.getpid()})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    print(f"✓ Served {server.jobs} jobs")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+
+"""
+Long-running HTTP server for proof documents
+Serves /proof/{package}/{start}/{end} as the stylish HTML report or the JSON
+proof. Rendered pages are kept in a bounded in-memory LRU, and identical
+requests arriving together share a single upstream fetch and render.
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from collections import OrderedDict
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from daily_store import last_closed_day
+from downsample import MAX_CHART_POINTS
+from generate_json_proof import generate_proof
+from generate_stylish_proof import (STARS_DEADLINE, calculate_weekly_growth, generate_html_report, start_fetch,
+                                    wait_for)
+from npm_api import fetch_downloads, fetch_github_stars, fetch_range_data, get_scheduler
+from response_cache import CURRENT_DAY_TTL
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+MAX_PAGE_BYTES = int(float(os.environ.get('NPM_PROOF_SERVER_CACHE_MB', '64')) * 1024 * 1024)
+
+CONTENT_TYPES = {
+    'html': 'text/html; charset=utf-8',
+    'json': 'application/json'
+}
+
+class PageCache:
+    """Bounded LRU of rendered pages, sized by their total bytes
+
+    Pages for ranges that are closed never go stale; a page touching the
+    unsettled days expires after `ttl` seconds like the response cache does.
+    """
+
+    def __init__(self, max_bytes=MAX_PAGE_BYTES, ttl=CURRENT_DAY_TTL):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._pages = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._pages.get(key)
+            if entry is not None and entry[1] is not None and time.time() > entry[1]:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._pages.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, body, closed):
+        if len(body) > self.max_bytes:
+            return
+        expires = None if closed else time.time() + self.ttl
+        with self._lock:
+            if key in self._pages:
+                self._remove(key)
+            self._pages[key] = (body, expires)
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._pages)))
+
+    def _remove(self, key):
+        body, _ = self._pages.pop(key)
+        self._size -= len(body)
+
+    def stats(self):
+        with self._lock:
+            return {'pages': len(self._pages), 'bytes': self._size, 'hits': self.hits, 'misses': self.misses}
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one execution"""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.shared = 0
+
+    def do(self, key, fn):
+        """Run fn() once for all callers waiting on key and return its result to each"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = {'done': threading.Event(), 'result': None, 'error': None}
+                leader = True
+            else:
+                self.shared += 1
+                leader = False
+
+        if not leader:
+            call['done'].wait()
+        else:
+            try:
+                call['result'] = fn()
+            except Exception as e:
+                call['error'] = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call['done'].set()
+
+        if call['error'] is not None:
+            raise call['error']
+        return call['result']
+
+class ProofError(Exception):
+    """A request that cannot be answered with a proof"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def parse_proof_path(path):
+    """Split /proof/{package}/{start}/{end} into its parts; scoped names keep their slash"""
+    parts = [unquote(part) for part in path.strip('/').split('/')]
+    if len(parts) < 4 or parts[0] != 'proof':
+        raise ProofError(404, 'expected /proof/{package}/{start}/{end}')
+
+    package_name = '/'.join(parts[1:-2])
+    start_date, end_date = parts[-2], parts[-1]
+    try:
+        start = date.fromisoformat(start_date)
+        end = date.fromisoformat(end_date)
+    except ValueError:
+        raise ProofError(400, 'dates must be YYYY-MM-DD')
+    if start > end:
+        raise ProofError(400, 'start date is after end date')
+    return package_name, start_date, end_date
+
+def fetch_proof_inputs(package_name, start_date, end_date, output_format):
+    """What the renderer of output_format needs for one package and range
+
+    GitHub stars for the HTML report are fetched alongside the download
+    counts and left out if GitHub has not answered within STARS_DEADLINE.
+    """
+    started = time.monotonic()
+    if output_format != 'json':
+        stars_future = start_fetch('fetch_stars', fetch_github_stars, f"https://github.com/Flux159/{package_name}")
+
+    data = fetch_downloads(package_name, start_date, end_date)
+    if not data:
+        raise ProofError(404, f"no download statistics for {package_name}")
+    if output_format == 'json':
+        return {'data': data}
+
+    range_data = fetch_range_data(package_name, start_date, end_date)
+    github_stars = wait_for(stars_future, started + STARS_DEADLINE)
+    weekly_growth = None
+    if range_data and 'downloads' in range_data:
+        weekly_growth = calculate_weekly_growth(range_data['downloads'])
+
+    return {
+        'data': data,
+        'range_data': range_data,
+        'github_stars': github_stars,
+        'stars_missing': not stars_future.done(),
+        'weekly_growth': weekly_growth
+    }
+
+class ProofService:
+    """Render proofs on request, through the page cache and single-flight"""
+
+    def __init__(self, cache=None, max_points=MAX_CHART_POINTS, svg_charts=False):
+        self.cache = cache or PageCache()
+        self.flights = SingleFlight()
+        self.max_points = max_points
+        self.svg_charts = svg_charts
+
+    def page(self, package_name, start_date, end_date, output_format):
+        """(body bytes, cache status) for a proof page"""
+        key = (package_name, start_date, end_date, output_format)
+        body = self.cache.get(key)
+        if body is not None:
+            return body, 'hit'
+        return self.flights.do(key, lambda: self._render(key)), 'miss'
+
+    def _render(self, key):
+        package_name, start_date, end_date, output_format = key
+        inputs = fetch_proof_inputs(package_name, start_date, end_date, output_format)
+
+        if output_format == 'json':
+            proof = generate_proof(package_name, start_date, end_date, inputs['data'])
+            body = json.dumps(proof, indent=2).encode()
+        else:
+            body = generate_html_report(
+                package_name, start_date, end_date, inputs['data'], inputs['range_data'],
+                inputs['github_stars'], inputs['weekly_growth'], self.max_points, self.svg_charts
+            ).encode()
+
+        # A page rendered without stars because GitHub was slow expires like an open range
+        closed = date.fromisoformat(end_date) <= last_closed_day() and not inputs.get('stars_missing')
+        self.cache.put(key, body, closed)
+        return body
+
+    def stats(self):
+        stats = self.cache.stats()
+        stats['shared_flights'] = self.flights.shared
+        stats['upstream_requests'] = get_scheduler().stats()['requests']
+        return stats
+
+class ProofHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status, payload):
+        self._send(status, json.dumps(payload).encode(), CONTENT_TYPES['json'])
+
+    def _output_format(self, query):
+        requested = query.get('format', [''])[0].lower()
+        if requested:
+            return requested
+        if 'application/json' in self.headers.get('Accept', ''):
+            return 'json'
+        return 'html'
+
+    def do_GET(self):
+        started = time.perf_counter()
+        url = urlsplit(self.path)
+        service = self.server.service
+
+        if url.path == '/stats':
+            self._send_json(200, service.stats())
+            return
+
+        status = 200
+        cache_status = '-'
+        try:
+            package_name, start_date, end_date = parse_proof_path(url.path)
+            output_format = self._output_format(parse_qs(url.query))
+            if output_format not in CONTENT_TYPES:
+                raise ProofError(400, 'format must be html or json')
+            body, cache_status = service.page(package_name, start_date, end_date, output_format)
+            self._send(status, body, CONTENT_TYPES[output_format], {'X-Proof-Cache': cache_status})
+        except ProofError as e:
+            status = e.status
+            self._send_json(status, {'error': str(e)})
+        except Exception as e:
+            status = 502
+            self._send_json(status, {'error': f"could not build proof: {e}"})
+
+        if not self.server.quiet:
+            elapsed = (time.perf_counter() - started) * 1000
+            print(f"{self.command} {self.path} {status} {cache_status} {elapsed:.1f}ms", flush=True)
+
+class ProofServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, service=None, quiet=False):
+        super().__init__((host, port), ProofHandler)
+        self.service = service or ProofService()
+        self.quiet = quiet
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve from a background thread"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+def main():
+    args = sys.argv[1:]
+    host = DEFAULT_HOST
+    port = DEFAULT_PORT
+    max_points = MAX_CHART_POINTS
+    if '--host' in args:
+        flag = args.index('--host')
+        host = args[flag + 1]
+        del args[flag:flag + 2]
+    if '--port' in args:
+        flag = args.index('--port')
+        port = int(args[flag + 1])
+        del args[flag:flag + 2]
+    if '--max-points' in args:
+        flag = args.index('--max-points')
+        max_points = int(args[flag + 1])
+        del args[flag:flag + 2]
+    svg_charts = '--svg' in args
+    if svg_charts:
+        args.remove('--svg')
+    quiet = '--quiet' in args
+    if quiet:
+        args.remove('--quiet')
+
+    if args:
+        print("Usage: python proof_server.py [--host HOST] [--port PORT] [--max-points N] [--svg] [--quiet]")
+        print("\nEndpoints:")
+        print("  GET /proof/<package>/<start-date>/<end-date>              stylish HTML proof")
+        print("  GET /proof/<package>/<start-date>/<end-date>?format=json  JSON proof")
+        print("  GET /stats                                                cache and upstream counters")
+        sys.exit(1)
+
+    server = ProofServer(host, port, ProofService(max_points=max_points, svg_charts=svg_charts), quiet)
+    print(f"Proof server listening on {server.url}")
+    print(f"Try: {server.url}/proof/mcp-server-kubernetes/2025-11-27/2025-12-03")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+
+"""
+Rate-limit-aware request scheduling for the NPM and GitHub APIs
+Each host gets a token bucket; throttled responses (429, GitHub's exhausted
+403) and transient failures are retried with jittered exponential backoff,
+honouring Retry-After. Counters record how often that happened.
+"""
+
+import os
+import time
+import random
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+DEFAULT_RATE = float(os.environ.get('NPM_PROOF_RATE_LIMIT', '20'))
+DEFAULT_BURST = 20
+MAX_RETRIES = 5
+NETWORK_RETRIES = 2
+BASE_DELAY = 0.5
+MAX_DELAY = 60.0
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+class TokenBucket:
+    """Allows `rate` requests per second with bursts of up to `capacity`
+
+    A rate of None means unlimited; pauses from Retry-After still apply.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, capacity=DEFAULT_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available; returns the seconds spent waiting"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if self.rate is not None:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if now < self.paused_until:
+                    delay = self.paused_until - now
+                elif self.rate is None:
+                    return waited
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                else:
+                    delay = (1 - self.tokens) / self.rate
+
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds):
+        """Hold every request to this host for the given number of seconds"""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+def retry_after_seconds(headers):
+    """Delay requested by a Retry-After or X-RateLimit-Reset header, if any"""
+    value = headers.get('retry-after')
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                when = parsedate_to_datetime(value)
+                return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                return None
+
+    reset = headers.get('x-ratelimit-reset')
+    if reset and headers.get('x-ratelimit-remaining') == '0':
+        try:
+            return max(0.0, float(reset) - time.time())
+        except ValueError:
+            return None
+
+    return None
+
+def is_throttled(status, headers):
+    """True for 429s and GitHub's 403 once the hourly quota is used up"""
+    if status == 429:
+        return True
+    return status == 403 and headers.get('x-ratelimit-remaining') == '0'
+
+class RequestScheduler:
+    """Runs requests through per-host token buckets with retry and backoff"""
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, max_retries=MAX_RETRIES,
+                 base_delay=BASE_DELAY, max_delay=MAX_DELAY):
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._buckets = {}
+        self._counters = {'requests': 0, 'throttled': 0, 'retries': 0, 'failures': 0, 'wait_seconds': 0.0}
+        self._lock = threading.Lock()
+
+    def bucket(self, host):
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def backoff(self, attempt):
+        """Full-jitter exponential backoff for the given retry attempt"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def execute(self, host, send):
+        """Call send() -> (status, reason, headers, body) under the host's limits
+
+        Throttled and transient responses are retried; the final response is
+        returned as-is so the caller decides how to report it.
+        """
+        bucket = self.bucket(host)
+        attempt = 0
+
+        while True:
+            self._count('wait_seconds', bucket.acquire())
+            self._count('requests')
+
+            try:
+                response = send()
+            except OSError:
+                if attempt >= min(self.max_retries, NETWORK_RETRIES):
+                    self._count('failures')
+                    raise
+                delay = self.backoff(attempt)
+            else:
+                status, _, headers, _ = response
+                throttled = is_throttled(status, headers)
+                if not throttled and status not in RETRY_STATUSES:
+                    return response
+
+                if throttled:
+                    self._count('throttled')
+
+                requested = retry_after_seconds(headers)
+                delay = self.backoff(attempt) if requested is None else requested
+
+                if attempt >= self.max_retries or delay > self.max_delay:
+                    self._count('failures')
+                    return response
+
+                if throttled and requested is not None:
+                    # Everyone talking to this host has to wait, not just this request
+                    bucket.pause(delay)
+
+            attempt += 1
+            self._count('retries')
+            time.sleep(delay)
+
+    def stats(self):
+        """Snapshot of the request, throttle and retry counters"""
+        with self._lock:
+            return dict(self._counters)
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+
+"""
+Persistent on-disk cache for NPM download API responses
+Counts for a closed day never change, so responses whose period ended before
+the settle window are kept forever; anything touching the current day expires
+after a short TTL. Old entries are evicted once the cache exceeds its size limit.
+Entries are keyed by the API base too, so responses from a stub server
+(NPM_API_BASE) are never served to runs against npm.
+GitHub repo metadata is kept separately, with the validators needed to
+revalidate it using conditional requests.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from datetime import datetime, timezone, timedelta
+
+from instrumentation import count
+
+CACHE_DIR = os.environ.get(
+    'NPM_PROOF_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'npm-download-proof')
+)
+CACHE_ENABLED = os.environ.get('NPM_PROOF_CACHE', '1') != '0'
+DEFAULT_NPM_API_BASE = 'https://api.npmjs.org'
+NPM_API_BASE = os.environ.get('NPM_API_BASE') or DEFAULT_NPM_API_BASE
+MAX_CACHE_BYTES = int(float(os.environ.get('NPM_PROOF_CACHE_MAX_MB', '64')) * 1024 * 1024)
+CURRENT_DAY_TTL = 15 * 60
+# Repo metadata younger than this is used without asking GitHub at all
+METADATA_TTL = 10 * 60
+
+# npm publishes each day's counts with a lag, so yesterday can still change
+SETTLE_DAYS = 1
+
+def utc_today():
+    """Current date in UTC, the timezone npm uses for its daily buckets"""
+    return datetime.now(timezone.utc).date()
+
+def is_closed(day):
+    """True if the counts for an ISO day can no longer change"""
+    settled = utc_today() - timedelta(days=SETTLE_DAYS)
+    return datetime.strptime(day, '%Y-%m-%d').date() < settled
+
+def base_directory(api_base=NPM_API_BASE, directory=CACHE_DIR):
+    """Directory for data fetched from api_base
+
+    npm's own API uses the cache directory itself; any other base, such as a
+    stub server, gets a subdirectory of its own.
+    """
+    if api_base.rstrip('/') == DEFAULT_NPM_API_BASE:
+        return directory
+    return os.path.join(directory, 'api-' + hashlib.sha256(api_base.encode()).hexdigest()[:12])
+
+class ResponseCache:
+    """File-per-entry cache keyed by (API base, endpoint, package, period)"""
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_CACHE_BYTES, ttl=CURRENT_DAY_TTL, api_base=NPM_API_BASE):
+        self.directory = directory
+        self.api_base = api_base
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._size = None
+        self._lock = threading.Lock()
+
+    def _path(self, endpoint, package_name, period):
+        key = f"{self.api_base}|{endpoint}|{package_name}|{period}"
+        digest = hashlib.sha256(key.encode()).hexdigest()[:32]
+        return os.path.join(self.directory, f"{endpoint}-{digest}.json")
+
+    def get(self, endpoint, package_name, start_date, end_date):
+        """Return the cached response, or None if missing or expired"""
+        path = self._path(endpoint, package_name, f"{start_date}:{end_date}")
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            count('response_cache_misses')
+            return None
+
+        if not entry.get('immutable') and time.time() - entry.get('stored_at', 0) > self.ttl:
+            count('response_cache_misses')
+            return None
+
+        count('response_cache_hits')
+
+        # Touch the file so eviction drops the least recently used entries first
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry['data']
+
+    def put(self, endpoint, package_name, start_date, end_date, data):
+        """Store a response; closed periods are marked immutable"""
+        path = self._path(endpoint, package_name, f"{start_date}:{end_date}")
+        entry = {
+            'api_base': self.api_base,
+            'endpoint': endpoint,
+            'package': package_name,
+            'period': f"{start_date}:{end_date}",
+            'stored_at': time.time(),
+            'immutable': is_closed(end_date),
+            'data': data
+        }
+        body = json.dumps(entry).encode()
+
+        try:
+            replaced = os.path.getsize(path)
+        except OSError:
+            replaced = 0
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(body) - replaced
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+
+        entries = []
+        for name in names:
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _scan_size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        """Delete least recently used entries until the cache is under 90% of its limit"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+        self._size = total
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self._lock:
+            for _, _, path in self._entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._size = 0
+
+class MetadataCache:
+    """File-per-URL cache of GitHub API responses with their ETag and Last-Modified
+
+    Entries never expire outright: once older than the TTL they are
+    revalidated with a conditional request, and a 304 renews them.
+    """
+
+    def __init__(self, directory=os.path.join(CACHE_DIR, 'github'), ttl=METADATA_TTL):
+        self.directory = directory
+        self.ttl = ttl
+
+    def _path(self, url):
+        digest = hashlib.sha256(url.encode()).hexdigest()[:32]
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def get(self, url):
+        """Return the stored entry ({'data', 'etag', 'last_modified', 'stored_at'}) or None"""
+        try:
+            with open(self._path(url), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get('url') == url else None
+
+    def is_fresh(self, entry):
+        return time.time() - entry.get('stored_at', 0) <= self.ttl
+
+    def put(self, url, data, etag=None, last_modified=None):
+        """Store a response body with the validators GitHub sent for it"""
+        entry = {
+            'url': url,
+            'stored_at': time.time(),
+            'etag': etag,
+            'last_modified': last_modified,
+            'data': data
+        }
+        path = self._path(url)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    def renew(self, url, entry):
+        """Mark an entry current again after GitHub answered 304 Not Modified"""
+        self.put(url, entry['data'], entry.get('etag'), entry.get('last_modified'))
+
+_cache = ResponseCache() if CACHE_ENABLED else None
+_metadata_cache = MetadataCache() if CACHE_ENABLED else None
+
+def get_cache():
+    """Return the process-wide cache, or None when caching is disabled"""
+    return _cache
+
+def get_metadata_cache():
+    """Return the process-wide GitHub metadata cache, or None when caching is disabled"""
+    return _metadata_cache
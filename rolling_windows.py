@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+"""
+Rolling-window download analytics
+Every day of a series gets its trailing 7-, 28- and 90-day totals and the
+week-over-week, month-over-month and year-over-year growth of those totals.
+Each column is one linear pass over the series' prefix sums.
+"""
+
+WINDOWS = (7, 28, 90)
+
+# Comparison -> (window, lag in days). Year over year compares 28-day windows
+# 52 weeks apart so that the weekdays line up.
+COMPARISONS = {
+    'week_over_week': (7, 7),
+    'month_over_month': (28, 28),
+    'year_over_year': (28, 364)
+}
+
+# Rows the reports show: (label, rolling total, growth shown next to it, what it compares against)
+SUMMARY_ROWS = (
+    ('Last 7 Days', 'total_7', 'week_over_week', 'vs previous 7 days'),
+    ('Last 28 Days', 'total_28', 'month_over_month', 'vs previous 28 days'),
+    ('Last 90 Days', 'total_90', None, None),
+    ('Year over Year', None, 'year_over_year', 'last 28 days vs a year earlier')
+)
+
+# Days of history the summary needs for every row, year over year included
+SUMMARY_DAYS = 364 + 28
+
+def rolling_totals(prefix, window):
+    """Total of the `window` days ending on each day; None until a full window exists"""
+    return [None] * min(window - 1, len(prefix) - 1) + [a - b for a, b in zip(prefix[window:], prefix)]
+
+def growth_rates(totals, lag):
+    """Percent change of each total against the total `lag` days earlier
+
+    None where there is no earlier total or it was zero.
+    """
+    return [None] * min(lag, len(totals)) + [
+        ((current - previous) / previous) * 100 if previous else None
+        for current, previous in zip(totals[lag:], totals)
+    ]
+
+class RollingWindows:
+    """Rolling totals and growth rates for every day of a DailySeries
+
+    `totals[window][i]` and `growth[name][i]` describe the window ending on
+    day i, where day i is series.day(i) of the dense series.
+    """
+
+    def __init__(self, series, windows=WINDOWS, comparisons=COMPARISONS):
+        self.series = series.dense()
+        prefix = self.series.prefix
+        needed = set(windows) | {window for window, _ in comparisons.values()}
+        self.totals = {window: rolling_totals(prefix, window) for window in sorted(needed)}
+        self.growth = {
+            name: growth_rates(self.totals[window], lag)
+            for name, (window, lag) in comparisons.items()
+        }
+
+    def __len__(self):
+        return len(self.series)
+
+    def at(self, index):
+        """Every rolling value for the window ending on day `index`, keyed like
+        {'day', 'total_7', ..., 'week_over_week', ...}; None where the series is too short"""
+        values = {'day': self.series.day(index).isoformat()}
+        for window, totals in self.totals.items():
+            values[f"total_{window}"] = totals[index]
+        for name, rates in self.growth.items():
+            values[name] = rates[index]
+        return values
+
+    def latest(self):
+        """Rolling values for the last day of the series, or None for an empty series"""
+        return self.at(len(self) - 1) if len(self) else None
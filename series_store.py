@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+
+"""
+Memory-mapped binary files of per-package daily download series
+Each package gets one file: a 16-byte header with the base date and day count,
+then the counts as packed little-endian uint32. Files are mapped read-only, so
+opening one costs nothing and slices reach the aggregators as memoryviews,
+without copying or parsing.
+"""
+
+import os
+import sys
+import mmap
+import struct
+import threading
+from array import array
+from datetime import date
+from urllib.parse import quote
+
+from daily_series import DailySeries
+from response_cache import base_directory
+
+SERIES_DIR = os.environ.get('NPM_PROOF_SERIES_DIR', os.path.join(base_directory(), 'series'))
+
+MAGIC = b'NPMS'
+VERSION = 1
+# magic, version, reserved, base date ordinal, number of days
+HEADER = struct.Struct('<4sHHII')
+COUNT_SIZE = 4
+
+def series_path(package_name, directory=SERIES_DIR):
+    """File holding a package's series; scoped names are quoted into one path component"""
+    return os.path.join(directory, quote(package_name, safe='') + '.u32')
+
+def write_series(path, base, counts):
+    """Write a gap-free series starting at base (a date), replacing any existing file
+
+    Readers that still map the old file keep a consistent view of it.
+    """
+    values = array('I', counts)
+    if sys.byteorder != 'little':
+        values.byteswap()
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, base.toordinal(), len(values)))
+        f.write(values.tobytes())
+    os.replace(tmp_path, path)
+
+class SeriesFile:
+    """Read-only mapping of one series file
+
+    Answers total() and series() by date ordinal like PackageIndex, and view()
+    hands out zero-copy DailySeries slices.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < HEADER.size:
+                raise ValueError(f"{path} is too short to be a series file")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _, base_ordinal, days = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} series file")
+        if size != HEADER.size + days * COUNT_SIZE:
+            raise ValueError(f"{path} is truncated")
+
+        self.base = base_ordinal
+        body = memoryview(self._mmap)[HEADER.size:]
+        if sys.byteorder == 'little':
+            self.counts = body.cast('I')
+        else:
+            self.counts = array('I', body)
+            self.counts.byteswap()
+
+    def __len__(self):
+        return len(self.counts)
+
+    @property
+    def last(self):
+        """Ordinal of the last day in the file"""
+        return self.base + len(self.counts) - 1
+
+    def _clip(self, start_ord, end_ord):
+        return max(start_ord - self.base, 0), min(end_ord - self.base, len(self.counts) - 1)
+
+    def covers(self, start_ord, end_ord):
+        """True if every day in [start, end] is in the file"""
+        return self.base <= start_ord and end_ord <= self.last
+
+    def total(self, start_ord, end_ord):
+        """Sum of the counts in [start, end]"""
+        lo, hi = self._clip(start_ord, end_ord)
+        return sum(self.counts[lo:hi + 1]) if lo <= hi else 0
+
+    def series(self, start_ord, end_ord):
+        """Days in [start, end] as (ordinal, downloads) pairs"""
+        lo, hi = self._clip(start_ord, end_ord)
+        return [(self.base + i, self.counts[i]) for i in range(lo, hi + 1)]
+
+    def view(self, start_ord, end_ord):
+        """DailySeries over [start, end] backed by the mapping itself"""
+        lo, hi = self._clip(start_ord, end_ord)
+        if lo > hi:
+            return DailySeries(None, self.counts[0:0])
+        return DailySeries(date.fromordinal(self.base + lo), self.counts[lo:hi + 1])
+
+class SeriesStore:
+    """Directory of series files, each mapped once and remapped when rewritten"""
+
+    def __init__(self, directory=SERIES_DIR):
+        self.directory = directory
+        self._files = {}
+        self._lock = threading.Lock()
+
+    def open(self, package_name):
+        """SeriesFile for a package, or None if none has been written"""
+        path = series_path(package_name, self.directory)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+
+        version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._files.get(package_name)
+            if cached is None or cached[0] != version:
+                cached = (version, SeriesFile(path))
+                self._files[package_name] = cached
+            return cached[1]
+
+    def series(self, package_name, start_date, end_date):
+        """Zero-copy DailySeries for [start, end], or None unless the file covers it all"""
+        try:
+            series_file = self.open(package_name)
+        except (OSError, ValueError):
+            return None
+        start_ord = date.fromisoformat(start_date).toordinal()
+        end_ord = date.fromisoformat(end_date).toordinal()
+        if series_file is None or start_ord > end_ord or not series_file.covers(start_ord, end_ord):
+            return None
+        return series_file.view(start_ord, end_ord)
+
+    def export(self, daily_store, package_name):
+        """Write a package's closed days from the daily store; returns the number of days
+
+        Holes in the stored history are fetched first, so the file is gap-free.
+        """
+        first = daily_store.first_day(package_name)
+        last = daily_store.last_day(package_name)
+        if first is None:
+            return 0
+
+        data = daily_store.range_data(package_name, first, last)
+        if 'downloads' not in data:
+            raise ValueError(data.get('error', f"no download data for {package_name}"))
+
+        days = data['downloads']
+        expected = date.fromisoformat(last).toordinal() - date.fromisoformat(first).toordinal() + 1
+        if len(days) != expected:
+            raise ValueError(f"stored history of {package_name} still has gaps")
+
+        write_series(series_path(package_name, self.directory), date.fromisoformat(first),
+                     [d['downloads'] for d in days])
+        return len(days)
+
+_series_store = None
+_series_store_lock = threading.Lock()
+
+def get_series_store():
+    """Return the process-wide series store"""
+    global _series_store
+    with _series_store_lock:
+        if _series_store is None:
+            _series_store = SeriesStore()
+        return _series_store
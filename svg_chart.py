@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+"""
+Server-side line charts for proof documents
+Lays out a download series on a fixed canvas and renders it as inline SVG, so
+a proof opens and prints without loading a charting library or web fonts.
+"""
+
+import math
+from html import escape
+
+WIDTH = 960
+HEIGHT = 380
+# left, top, right, bottom
+MARGINS = (72, 16, 16, 44)
+Y_TICKS = 5
+MAX_X_LABELS = 12
+# Rough advance of a 12px sans-serif character, used to keep x labels apart
+CHAR_WIDTH = 7
+MAX_MARKERS = 60
+
+# Plain colors plus opacity attributes, which every SVG renderer understands
+LINE_COLOR = '#1d1d1f'
+FILL_OPACITY = 0.08
+GRID_COLOR = '#000000'
+GRID_OPACITY = 0.06
+TEXT_COLOR = '#6e6e73'
+FONT_FAMILY = "-apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif"
+
+def nice_ticks(max_value, count=Y_TICKS):
+    """Y-axis ticks from 0 in round integer steps covering max_value"""
+    if max_value <= 0:
+        return [0, 1]
+    raw_step = max_value / count
+    magnitude = 10 ** math.floor(math.log10(raw_step))
+    step = next(m * magnitude for m in (1, 2, 5, 10) if m * magnitude >= raw_step)
+    step = max(1, int(step))
+    top = -(-max_value // step) * step
+    return list(range(0, top + step, step))
+
+def layout_chart(values, width=WIDTH, height=HEIGHT, margins=MARGINS, label_chars=6, positions=None):
+    """Place a series on a width x height canvas, y growing downwards
+
+    positions (e.g. day offsets) place each value along the x axis, so a
+    downsampled series keeps its time scale; without them values are evenly
+    spaced. Returns (points, ticks, labelled) where points are (x, y) per
+    value, ticks are (value, y) for the y axis and labelled are the indexes
+    whose x labels (up to label_chars long) fit without overlapping.
+    """
+    left, top, right, bottom = margins
+    plot_width = width - left - right
+    plot_height = height - top - bottom
+
+    ticks = nice_ticks(max(values) if values else 0)
+    y_max = ticks[-1]
+
+    def y_of(value):
+        return top + plot_height * (1 - value / y_max)
+
+    n = len(values)
+    positions = list(range(n)) if positions is None else positions
+    if n == 1 or positions[-1] == positions[0]:
+        xs = [left + plot_width / 2] * n
+    else:
+        first, extent = positions[0], positions[-1] - positions[0]
+        xs = [left + plot_width * (p - first) / extent for p in positions]
+
+    # Label points at least a label's width apart, left to right
+    fitting = max(1, min(MAX_X_LABELS, int(plot_width // (label_chars * CHAR_WIDTH + 16))))
+    gap = plot_width / fitting
+    labelled = []
+    for i, x in enumerate(xs):
+        if not labelled or x - xs[labelled[-1]] >= gap:
+            labelled.append(i)
+    return (
+        [(x, y_of(value)) for x, value in zip(xs, values)],
+        [(value, y_of(value)) for value in ticks],
+        labelled
+    )
+
+def render_line_chart(labels, values, positions=None, element_id=None, hidden=False):
+    """Render one chart view as an inline <svg> element, points placed at positions"""
+    left, top, right, bottom = MARGINS
+    baseline = HEIGHT - bottom
+    points, ticks, labelled = layout_chart(values, label_chars=max(map(len, labels), default=0), positions=positions)
+
+    attributes = f' id="{element_id}"' if element_id else ''
+    if hidden:
+        attributes += ' style="display: none;"'
+    out = [
+        f'<svg{attributes} viewBox="0 0 {WIDTH} {HEIGHT}" width="100%" height="100%" '
+        f'xmlns="http://www.w3.org/2000/svg" role="img" font-family="{FONT_FAMILY}" '
+        f'font-size="12" fill="{TEXT_COLOR}">'
+    ]
+
+    for value, y in ticks:
+        out.append(f'<line x1="{left}" y1="{y:.1f}" x2="{WIDTH - right}" y2="{y:.1f}" stroke="{GRID_COLOR}" stroke-opacity="{GRID_OPACITY}"/>')
+        out.append(f'<text x="{left - 10}" y="{y + 4:.1f}" text-anchor="end">{value:,}</text>')
+
+    for i in labelled:
+        x = points[i][0]
+        out.append(f'<text x="{x:.1f}" y="{baseline + 24}" text-anchor="middle">{escape(labels[i])}</text>')
+
+    if points:
+        path = ' '.join(f'{x:.1f},{y:.1f}' for x, y in points)
+        first_x, last_x = points[0][0], points[-1][0]
+        out.append(f'<polygon points="{first_x:.1f},{baseline} {path} {last_x:.1f},{baseline}" '
+                   f'fill="{LINE_COLOR}" fill-opacity="{FILL_OPACITY}" stroke="none"/>')
+        out.append(f'<polyline points="{path}" fill="none" stroke="{LINE_COLOR}" stroke-width="2.5" '
+                   f'stroke-linejoin="round"/>')
+
+        # Markers on short series; every point keeps a hover tooltip
+        if len(points) <= MAX_MARKERS:
+            marker = f'r="4" fill="{LINE_COLOR}" stroke="#fff" stroke-width="2"'
+        else:
+            marker = 'r="3" fill="#ffffff" fill-opacity="0"'
+        for (x, y), label, value in zip(points, labels, values):
+            out.append(f'<circle cx="{x:.1f}" cy="{y:.1f}" {marker}>'
+                       f'<title>{escape(label)}: {value:,} downloads</title></circle>')
+
+    out.append('</svg>')
+    return ''.join(out)
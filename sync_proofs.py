@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+"""
+Incremental daily sync for scheduled proof refreshes
+Each package's last stored day is kept in the local daily store, so a run only
+fetches the days after it, refreshes the package's memory-mapped series file
+and regenerates the trailing-window proofs from the store. A nightly refresh
+costs about one request per package, however long the stored history is.
+"""
+
+import sys
+from datetime import timedelta
+
+import generate_proof
+import generate_json_proof
+import generate_stylish_proof
+from instrumentation import profile_from_argv, span
+from npm_api import get_scheduler, get_store, parse_package_names, prefetch_packages
+from response_cache import utc_today
+from series_store import get_series_store
+
+DEFAULT_WINDOW_DAYS = 30
+
+# Output format -> generate_package_proof(package, start, end)
+PROOF_GENERATORS = {
+    'stylish': generate_stylish_proof.generate_package_proof,
+    'html': generate_proof.generate_package_proof,
+    'pdf': lambda package_name, start, end: generate_proof.generate_package_proof(package_name, start, end, True),
+    'json': generate_json_proof.generate_package_proof
+}
+
+def trailing_window(days, end=None):
+    """(start, end) ISO dates of the last `days` days ending yesterday (UTC)"""
+    end = end or utc_today() - timedelta(days=1)
+    return (end - timedelta(days=days - 1)).isoformat(), end.isoformat()
+
+def store_state(package_name, start_date, end_date):
+    """(last stored day, stored days in the window) for one package"""
+    store = get_store()
+    return store.last_day(package_name), store.stored_days(package_name, start_date, end_date)
+
+def sync_package(package_name, start_date, end_date):
+    """Fetch the days of the window the store is missing; returns an error message or None"""
+    try:
+        data = get_store().range_data(package_name, start_date, end_date)
+    except Exception as e:
+        return str(e)
+    if 'downloads' not in data:
+        return data.get('error', 'no download data returned')
+    return None
+
+def main():
+    profile_from_argv()
+    args = sys.argv[1:]
+    window_days = DEFAULT_WINDOW_DAYS
+    output_format = 'stylish'
+    if '--days' in args:
+        flag = args.index('--days')
+        window_days = int(args[flag + 1])
+        del args[flag:flag + 2]
+    if '--format' in args:
+        flag = args.index('--format')
+        output_format = args[flag + 1].lower()
+        del args[flag:flag + 2]
+
+    if len(args) < 1 or output_format not in PROOF_GENERATORS:
+        print("Usage: python sync_proofs.py <package-name>[,<package-name>...] [--days N] [--format stylish|html|pdf|json] [--profile]")
+        print("\nExamples:")
+        print("  # Nightly refresh of the last 30 days' stylish proofs")
+        print("  python sync_proofs.py mcp-server-kubernetes")
+        print("\n  # JSON proofs for the last 90 days of several packages")
+        print("  python sync_proofs.py mcp-server-kubernetes,express --days 90 --format json")
+        print("\nOnly the days after each package's last stored day are fetched; the")
+        print("proofs are then rebuilt from the local store.")
+        sys.exit(1)
+
+    package_names = parse_package_names(args[0])
+    start_date, end_date = trailing_window(window_days)
+
+    print(f"Syncing {len(package_names)} packages for {start_date} to {end_date}...\n")
+
+    before = {name: store_state(name, start_date, end_date) for name in package_names}
+    requests_before = get_scheduler().stats()['requests']
+    prefetch_packages(package_names, start_date, end_date)
+
+    synced = []
+    failed = []
+    for package_name in package_names:
+        with span('sync_package', package=package_name):
+            error = sync_package(package_name, start_date, end_date)
+        if error:
+            failed.append(package_name)
+            print(f"✗ {package_name}: {error}")
+            continue
+        synced.append(package_name)
+        last_before, stored_before = before[package_name]
+        last_after, stored_after = store_state(package_name, start_date, end_date)
+        since = f"after {last_before}" if last_before else "first sync"
+        print(f"✓ {package_name}: {stored_after - stored_before} new days stored ({since}), "
+              f"last stored day {last_after}")
+
+    sync_requests = get_scheduler().stats()['requests'] - requests_before
+    print(f"\n✓ Sync finished with {sync_requests} API requests")
+
+    # Refresh the memory-mapped series files that report generators read in place
+    series_store = get_series_store()
+    exported_days = 0
+    for package_name in synced:
+        try:
+            with span('export_series', package=package_name):
+                exported_days += series_store.export(get_store(), package_name)
+        except (OSError, ValueError) as e:
+            print(f"⚠ {package_name}: could not write series file: {e}")
+    print(f"✓ Series files hold {exported_days} days in {series_store.directory}\n")
+
+    generate = PROOF_GENERATORS[output_format]
+    for package_name in synced:
+        with span('proof', package=package_name):
+            generated = generate(package_name, start_date, end_date)
+        if not generated:
+            failed.append(package_name)
+        print()
+
+    if failed:
+        print(f"✗ Failed for {len(failed)} packages: {', '.join(failed)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
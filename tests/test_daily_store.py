@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+"""Totals answered from the daily store, and what it asks upstream for"""
+
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from daily_store import DailyStore
+from response_cache import utc_today
+
+def day_count(package_name, day):
+    return len(package_name) * 10 + day.toordinal() % 7
+
+class FakeRange:
+    """fetch_range stand-in that records each request"""
+
+    def __init__(self):
+        self.requests = []
+
+    def __call__(self, package_name, start_date, end_date):
+        self.requests.append((package_name, start_date, end_date))
+        start = date.fromisoformat(start_date)
+        days = (date.fromisoformat(end_date) - start).days + 1
+        downloads = []
+        for i in range(days):
+            day = start + timedelta(days=i)
+            downloads.append({'downloads': day_count(package_name, day), 'day': day.isoformat()})
+        return {'start': start_date, 'end': end_date, 'package': package_name, 'downloads': downloads}
+
+def expected_total(package_name, start_date, end_date):
+    start = date.fromisoformat(start_date)
+    days = (date.fromisoformat(end_date) - start).days + 1
+    return sum(day_count(package_name, start + timedelta(days=i)) for i in range(days))
+
+class DailyStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'daily.sqlite3')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def open_store(self):
+        fetch = FakeRange()
+        store = DailyStore(fetch, path=self.path)
+        self.addCleanup(store.close)
+        return store, fetch
+
+    def test_closed_days_are_fetched_once(self):
+        store, fetch = self.open_store()
+        data = store.point_data('express', '2020-01-01', '2020-03-31')
+        self.assertEqual(data['downloads'], expected_total('express', '2020-01-01', '2020-03-31'))
+        self.assertEqual(len(fetch.requests), 1)
+
+        # Any window inside what is stored is a lookup, in this process or the next
+        self.assertEqual(store.point_data('express', '2020-02-10', '2020-02-20')['downloads'],
+                         expected_total('express', '2020-02-10', '2020-02-20'))
+        reopened, refetch = self.open_store()
+        self.assertEqual(reopened.point_data('express', '2020-01-01', '2020-03-31'), data)
+        self.assertEqual(len(fetch.requests), 1)
+        self.assertEqual(refetch.requests, [])
+
+    def test_only_missing_days_are_requested(self):
+        store, fetch = self.open_store()
+        store.point_data('express', '2020-01-01', '2020-01-31')
+        store.point_data('express', '2020-01-01', '2020-02-29')
+
+        self.assertEqual(fetch.requests, [
+            ('express', '2020-01-01', '2020-01-31'),
+            ('express', '2020-02-01', '2020-02-29'),
+        ])
+
+    def test_packages_are_kept_apart(self):
+        store, fetch = self.open_store()
+        store.point_data('express', '2020-01-01', '2020-01-31')
+        react = store.point_data('react', '2020-01-01', '2020-01-31')
+
+        self.assertEqual(react['downloads'], expected_total('react', '2020-01-01', '2020-01-31'))
+        self.assertEqual(len(fetch.requests), 2)
+
+    def test_range_data_lists_every_day(self):
+        store, _ = self.open_store()
+        data = store.range_data('express', '2020-01-30', '2020-02-02')
+
+        self.assertEqual([d['day'] for d in data['downloads']],
+                         ['2020-01-30', '2020-01-31', '2020-02-01', '2020-02-02'])
+
+    def test_unsettled_days_are_reused_by_the_next_process(self):
+        end = utc_today().isoformat()
+        start = (utc_today() - timedelta(days=30)).isoformat()
+        store, fetch = self.open_store()
+        total = store.point_data('express', start, end)['downloads']
+        self.assertEqual(len(fetch.requests), 1)
+
+        reopened, refetch = self.open_store()
+        self.assertEqual(reopened.point_data('express', start, end)['downloads'], total)
+        self.assertEqual(refetch.requests, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+"""LTTB downsampling of chart series and where the kept points are drawn"""
+
+import os
+import sys
+import math
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from downsample import downsample, lttb_indexes
+from svg_chart import layout_chart
+
+def daily_values(days):
+    # Weekly cycle with slow growth and one release spike
+    values = [1000 + i * 3 + int(400 * math.sin(i * 2 * math.pi / 7)) for i in range(days)]
+    values[days // 3] = 50000
+    return values
+
+class LttbIndexesTest(unittest.TestCase):
+    def test_keeps_exactly_threshold_points_in_order(self):
+        values = daily_values(1095)
+        kept = lttb_indexes(values, 365)
+
+        self.assertEqual(len(kept), 365)
+        self.assertEqual(kept, sorted(set(kept)))
+
+    def test_keeps_first_last_and_peak(self):
+        values = daily_values(1095)
+        for threshold in [3, 10, 52, 365]:
+            kept = lttb_indexes(values, threshold)
+            self.assertEqual(kept[0], 0)
+            self.assertEqual(kept[-1], len(values) - 1)
+            self.assertIn(values.index(max(values)), kept)
+
+    def test_peak_at_either_end(self):
+        for values in [[100] + [1] * 50, [1] * 50 + [100]]:
+            kept = lttb_indexes(values, 10)
+            self.assertEqual(len(kept), 10)
+            self.assertIn(values.index(100), kept)
+
+    def test_short_series_pass_through(self):
+        self.assertEqual(lttb_indexes([5, 3, 8], 3), [0, 1, 2])
+        self.assertEqual(lttb_indexes([5, 3, 8], 365), [0, 1, 2])
+        self.assertEqual(lttb_indexes(list(range(500)), 0), list(range(500)))
+
+    def test_thresholds_below_three(self):
+        self.assertEqual(lttb_indexes(list(range(10)), 2), [0, 9])
+        self.assertEqual(lttb_indexes(list(range(10)), 1), [0])
+
+class DownsampleTest(unittest.TestCase):
+    def test_entries_keep_their_fields(self):
+        entries = [{'day': f"d{i}", 'downloads': v} for i, v in enumerate(daily_values(400))]
+        reduced = downsample(entries, 100)
+
+        self.assertEqual(len(reduced), 100)
+        self.assertTrue(all(entry in entries for entry in reduced))
+        self.assertEqual(reduced[0], entries[0])
+        self.assertEqual(reduced[-1], entries[-1])
+
+    def test_disabled_or_short_returns_the_same_list(self):
+        entries = [{'downloads': v} for v in range(10)]
+        self.assertIs(downsample(entries, 0), entries)
+        self.assertIs(downsample(entries, 10), entries)
+
+class LayoutPositionsTest(unittest.TestCase):
+    def test_points_are_placed_by_position(self):
+        values = daily_values(1095)
+        kept = lttb_indexes(values, 100)
+        points, _, _ = layout_chart([values[i] for i in kept], 1000, 300, (0, 0, 0, 0), positions=kept)
+
+        for (x, _), offset in zip(points, kept):
+            self.assertAlmostEqual(x, 1000 * offset / 1094)
+
+    def test_without_positions_points_are_evenly_spaced(self):
+        points, _, _ = layout_chart([1, 2, 3, 4, 5], 400, 300, (0, 0, 0, 0))
+        self.assertEqual([x for x, _ in points], [0, 100, 200, 300, 400])
+
+if __name__ == '__main__':
+    unittest.main()
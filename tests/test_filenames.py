@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+
+"""Package names turned into proof and series file names"""
+
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from generate_proof import proof_filename
+from npm_api import filename_part
+from series_store import series_path
+
+class FilenamePartTest(unittest.TestCase):
+    def test_plain_names_are_unchanged(self):
+        self.assertEqual(filename_part('mcp-server-kubernetes'), 'mcp-server-kubernetes')
+        self.assertEqual(filename_part('lodash.merge'), 'lodash.merge')
+
+    def test_scope_slash_is_quoted(self):
+        self.assertEqual(filename_part('@types/node'), '@types%2Fnode')
+
+    def test_result_is_one_path_component(self):
+        for name in ['@types/node', '@scope/a/b', '../escape', 'a\\b']:
+            part = filename_part(name)
+            self.assertNotIn('/', part)
+            self.assertEqual(os.path.basename(part), part)
+
+    def test_distinct_names_stay_distinct(self):
+        self.assertNotEqual(filename_part('@types/node'), filename_part('@types%2Fnode'))
+
+class ProofFilenameTest(unittest.TestCase):
+    def test_scoped_package(self):
+        name = proof_filename('@types/node', '2025-01-01', '2025-01-31', 'json')
+        self.assertEqual(name, 'npm_downloads_proof_@types%2Fnode_2025-01-01_to_2025-01-31.json')
+        self.assertEqual(os.path.dirname(name), '')
+
+    def test_default_extension_is_html(self):
+        self.assertTrue(proof_filename('express', '2025-01-01', '2025-01-31').endswith('.html'))
+
+class SeriesPathTest(unittest.TestCase):
+    def test_scoped_package_stays_in_the_directory(self):
+        self.assertEqual(os.path.dirname(series_path('@types/node', '/series')), '/series')
+
+if __name__ == '__main__':
+    unittest.main()
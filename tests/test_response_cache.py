@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+"""Keying and size accounting of the on-disk response cache"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from response_cache import DEFAULT_NPM_API_BASE, ResponseCache, base_directory
+
+STUB = 'http://127.0.0.1:8099'
+CLOSED = ('2020-01-01', '2020-01-31')
+
+class ResponseCacheKeyTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_entries_are_not_shared_between_api_bases(self):
+        npm = ResponseCache(self.directory, api_base=DEFAULT_NPM_API_BASE)
+        stub = ResponseCache(self.directory, api_base=STUB)
+
+        stub.put('point', 'express', *CLOSED, {'downloads': 1})
+        self.assertIsNone(npm.get('point', 'express', *CLOSED))
+        self.assertEqual(stub.get('point', 'express', *CLOSED), {'downloads': 1})
+
+        npm.put('point', 'express', *CLOSED, {'downloads': 2})
+        self.assertEqual(npm.get('point', 'express', *CLOSED), {'downloads': 2})
+        self.assertEqual(stub.get('point', 'express', *CLOSED), {'downloads': 1})
+
+    def test_key_covers_endpoint_package_and_period(self):
+        cache = ResponseCache(self.directory)
+        cache.put('point', 'express', *CLOSED, {'downloads': 1})
+
+        self.assertIsNone(cache.get('range', 'express', *CLOSED))
+        self.assertIsNone(cache.get('point', 'react', *CLOSED))
+        self.assertIsNone(cache.get('point', 'express', '2020-01-01', '2020-01-30'))
+
+    def test_overwriting_an_entry_counts_its_size_once(self):
+        cache = ResponseCache(self.directory)
+        cache.put('point', 'express', *CLOSED, {'downloads': 1})
+        for downloads in range(100, 110):
+            cache.put('point', 'express', *CLOSED, {'downloads': downloads})
+
+        self.assertEqual(cache._size, cache._scan_size())
+        self.assertEqual(len(os.listdir(self.directory)), 1)
+
+    def test_overwrites_do_not_evict_other_entries(self):
+        cache = ResponseCache(self.directory)
+        cache.put('point', 'react', *CLOSED, {'downloads': 1})
+        cache.put('point', 'express', *CLOSED, {'downloads': 1})
+        cache.max_bytes = cache._scan_size() + 64
+
+        for downloads in range(200):
+            cache.put('point', 'express', *CLOSED, {'downloads': downloads})
+
+        self.assertEqual(cache.get('point', 'react', *CLOSED), {'downloads': 1})
+
+class BaseDirectoryTest(unittest.TestCase):
+    def test_npm_uses_the_cache_directory_itself(self):
+        self.assertEqual(base_directory(DEFAULT_NPM_API_BASE, '/cache'), '/cache')
+        self.assertEqual(base_directory(DEFAULT_NPM_API_BASE + '/', '/cache'), '/cache')
+
+    def test_other_bases_get_a_subdirectory_each(self):
+        stub = base_directory(STUB, '/cache')
+        other = base_directory('http://127.0.0.1:8100', '/cache')
+
+        self.assertEqual(os.path.dirname(stub), '/cache')
+        self.assertTrue(os.path.basename(stub).startswith('api-'))
+        self.assertNotEqual(stub, other)
+        self.assertEqual(stub, base_directory(STUB, '/cache'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+"""JSON proofs from generate_json_proof read back by verify_proofs"""
+
+import os
+import sys
+import json
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from generate_json_proof import generate_proof
+from verify_proofs import read_proof, signature_hash
+
+DATA = {'downloads': 12345, 'start': '2025-11-27', 'end': '2025-12-03', 'package': 'mcp-server-kubernetes'}
+
+class ReadProofTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'proof.json')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, proof):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(proof, f)
+
+    def proof(self, package_name='mcp-server-kubernetes', data=DATA):
+        return generate_proof(package_name, data['start'], data['end'], dict(data, package=package_name))
+
+    def resign(self, proof):
+        statistics = proof['statistics']
+        proof['verification']['signature_hash'] = signature_hash(
+            proof['package']['name'], statistics['start_date'], statistics['end_date'],
+            statistics['total_downloads'], proof['generated_at'])
+
+    def test_generated_proof_round_trips(self):
+        proof = self.proof()
+        self.write(proof)
+
+        self.assertEqual(read_proof(self.path), (
+            'mcp-server-kubernetes', '2025-11-27', '2025-12-03', 12345, proof['generated_at']))
+
+    def test_scoped_package_round_trips(self):
+        self.write(self.proof('@types/node'))
+        self.assertEqual(read_proof(self.path)[0], '@types/node')
+
+    def test_signature_matches_generate_proof(self):
+        proof = self.proof()
+        self.assertEqual(proof['verification']['signature_hash'], signature_hash(
+            'mcp-server-kubernetes', '2025-11-27', '2025-12-03', 12345, proof['generated_at']))
+
+    def test_tampered_fields_break_the_signature(self):
+        for section, field, value in [
+            ('statistics', 'total_downloads', 99999),
+            ('statistics', 'end_date', '2025-12-04'),
+            ('package', 'name', 'express'),
+            (None, 'generated_at', '2030-01-01T00:00:00'),
+        ]:
+            proof = self.proof()
+            (proof[section] if section else proof)[field] = value
+            self.write(proof)
+            with self.subTest(field=field):
+                with self.assertRaisesRegex(ValueError, 'signature_hash'):
+                    read_proof(self.path)
+
+    def test_resigned_proof_must_still_agree_with_the_api_response(self):
+        proof = self.proof()
+        proof['statistics']['total_downloads'] = 99999
+        self.resign(proof)
+        self.write(proof)
+
+        with self.assertRaisesRegex(ValueError, 'api_response'):
+            read_proof(self.path)
+
+    def test_invalid_fields_are_rejected(self):
+        for field, value, message in [
+            ('total_downloads', '12345', 'whole number'),
+            ('generated_at', 'yesterday', 'generated_at'),
+        ]:
+            proof = self.proof()
+            if field == 'generated_at':
+                proof['generated_at'] = value
+            else:
+                proof['statistics'][field] = value
+                proof['verification']['api_response']['downloads'] = value
+            self.resign(proof)
+            self.write(proof)
+            with self.subTest(field=field):
+                with self.assertRaisesRegex(ValueError, message):
+                    read_proof(self.path)
+
+    def test_unreadable_files_raise_value_error(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('{"metadata": ')
+        with self.assertRaisesRegex(ValueError, 'not a readable proof'):
+            read_proof(self.path)
+
+    def test_other_json_files_are_skipped(self):
+        self.write({'name': 'package.json'})
+        self.assertIsNone(read_proof(self.path))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+
+"""
+Re-verify previously generated JSON proofs
+Streams through proof files and checks each one twice. First, its
+signature_hash is recomputed and its fields are compared with each other.
+Second, its download total is compared with npm's daily counts. Proofs are
+grouped by package, so each package costs one range fetch however many proofs
+it has, and packages are fetched concurrently.
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+from datetime import date, datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+from instrumentation import profile_from_argv, span
+from npm_api import fetch_batch_series, get_scheduler, parse_period
+from response_cache import SETTLE_DAYS
+
+PROOF_TYPE = 'npm_download_statistics_proof'
+MAX_CONCURRENCY = 8
+
+def signature_hash(package_name, start_date, end_date, downloads, timestamp):
+    """The signature generate_json_proof.generate_proof computes"""
+    signature_data = {
+        "package": package_name,
+        "start_date": start_date,
+        "end_date": end_date,
+        "downloads": downloads,
+        "timestamp": timestamp
+    }
+    return hashlib.sha256(json.dumps(signature_data, sort_keys=True).encode()).hexdigest()
+
+def proof_files(paths):
+    """Every .json file under the given files and directories, in a stable order"""
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith('.json'):
+                    yield os.path.join(root, name)
+
+def read_proof(path):
+    """(package, start, end, downloads, generated_at) of a proof file whose fields agree
+
+    Returns None for JSON files that are not download proofs. Raises
+    ValueError naming the first problem: unreadable JSON, a signature that
+    does not match, fields that contradict each other, or an invalid period
+    or generated_at.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            proof = json.load(f)
+        if not isinstance(proof, dict) or proof.get('metadata', {}).get('report_type') != PROOF_TYPE:
+            return None
+        package_name = proof['package']['name']
+        statistics = proof['statistics']
+        verification = proof['verification']
+        generated_at = proof['generated_at']
+        start_date, end_date = statistics['start_date'], statistics['end_date']
+        downloads = statistics['total_downloads']
+        response = verification['api_response']
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"not a readable proof ({type(e).__name__}: {e})")
+
+    if verification.get('signature_hash') != signature_hash(package_name, start_date, end_date, downloads,
+                                                           generated_at):
+        raise ValueError("signature_hash does not match the proof's contents")
+    if (response.get('downloads'), response.get('start'), response.get('end')) != (downloads, start_date, end_date):
+        raise ValueError("api_response disagrees with the statistics")
+    if verification.get('api_url', '').rsplit('/downloads/point/', 1)[-1] != f"{start_date}:{end_date}/{package_name}":
+        raise ValueError("api_url does not match the package and period")
+    if not isinstance(downloads, int) or isinstance(downloads, bool):
+        raise ValueError("total_downloads is not a whole number")
+    parse_period(start_date, end_date)
+    try:
+        datetime.fromisoformat(generated_at)
+    except (TypeError, ValueError):
+        raise ValueError(f"generated_at is not an ISO timestamp: {generated_at!r}")
+
+    return package_name, start_date, end_date, downloads, generated_at
+
+def settled_when_generated(end_date, generated_at):
+    """True if npm's counts for the period were final when the proof was generated"""
+    generated_day = datetime.fromisoformat(generated_at).date()
+    return date.fromisoformat(end_date) < generated_day - timedelta(days=SETTLE_DAYS)
+
+def verify_package(package_name, records):
+    """Compare every (path, start, end, downloads, generated_at) record of one package with npm
+
+    Returns [(path, status, detail)] with status 'ok', 'mismatch', 'changed'
+    (counts were still settling when the proof was made) or 'error'.
+    """
+    with span('verify_package', package=package_name, proofs=len(records)):
+        index, error = fetch_batch_series(package_name, [(path, start, end) for path, start, end, _, _ in records])
+
+        results = []
+        for path, start_date, end_date, downloads, generated_at in records:
+            if error or index is None:
+                results.append((path, 'error', error or "invalid period"))
+                continue
+            # read_proof already checked the period
+            start, end = parse_period(start_date, end_date)
+            actual = index.total(start.toordinal(), end.toordinal())
+            if actual == downloads:
+                results.append((path, 'ok', None))
+            elif settled_when_generated(end_date, generated_at):
+                results.append((path, 'mismatch', f"proof says {downloads:,}, npm now reports {actual:,}"))
+            else:
+                results.append((path, 'changed', f"{downloads:,} -> {actual:,}, period was still settling"))
+        return results
+
+def usage():
+    print("Usage: python verify_proofs.py <proof-file-or-directory>... [--concurrency N] [--offline] [--profile]")
+    print("\nExamples:")
+    print("  # Re-check every JSON proof in a directory (searched recursively)")
+    print("  python verify_proofs.py proofs/")
+    print("\n  # Only recompute signatures, without contacting npm")
+    print("  python verify_proofs.py proofs/ --offline")
+    print("\nEach proof's signature_hash is recomputed and its total compared with npm's daily")
+    print("counts: one range fetch per package, at most --concurrency packages at a time (default 8).")
+    sys.exit(1)
+
+def main():
+    profile_from_argv()
+    args = sys.argv[1:]
+    max_concurrency = MAX_CONCURRENCY
+    if '--concurrency' in args:
+        flag = args.index('--concurrency')
+        value = args[flag + 1] if flag + 1 < len(args) else ''
+        if not value.isdigit() or int(value) < 1:
+            print(f"Error: --concurrency needs a positive whole number, got '{value}'\n")
+            usage()
+        max_concurrency = int(value)
+        del args[flag:flag + 2]
+    offline = '--offline' in args
+    if offline:
+        args.remove('--offline')
+
+    if not args:
+        usage()
+
+    started = time.perf_counter()
+    by_package = {}
+    invalid = []
+    scanned = 0
+    with span('read_proofs'):
+        for path in proof_files(args):
+            scanned += 1
+            try:
+                record = read_proof(path)
+            except ValueError as e:
+                invalid.append((path, str(e)))
+                continue
+            if record is None:
+                continue
+            package_name, start_date, end_date, downloads, generated_at = record
+            by_package.setdefault(package_name, []).append((path, start_date, end_date, downloads, generated_at))
+
+    checked = sum(len(records) for records in by_package.values())
+    print(f"Read {scanned} JSON files: {checked} proofs with valid signatures from {len(by_package)} packages, "
+          f"{len(invalid)} invalid")
+
+    results = []
+    if not offline and by_package:
+        requests_before = get_scheduler().stats()['requests']
+        workers = max(1, min(max_concurrency, len(by_package)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for package_results in executor.map(lambda item: verify_package(*item), by_package.items()):
+                results.extend(package_results)
+        print(f"Checked against npm with {get_scheduler().stats()['requests'] - requests_before} API requests")
+
+    elapsed = time.perf_counter() - started
+    counts = {status: 0 for status in ('ok', 'mismatch', 'changed', 'error')}
+    for path, status, detail in results:
+        counts[status] += 1
+        if status != 'ok':
+            marker = '⚠' if status == 'changed' else '✗'
+            print(f"{marker} {path}: {detail}")
+    for path, problem in invalid:
+        print(f"✗ {path}: {problem}")
+
+    print()
+    print("=" * 70)
+    if offline:
+        print(f"✓ {checked} signatures verified offline, {len(invalid)} invalid ({elapsed:.2f}s)")
+    else:
+        print(f"✓ {counts['ok']} proofs match npm, {counts['mismatch']} mismatches, {counts['changed']} changed "
+              f"while settling, {counts['error']} could not be checked, {len(invalid)} invalid "
+              f"({elapsed:.2f}s)")
+    print("=" * 70)
+
+    if invalid or counts['mismatch'] or counts['error']:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()